@@ -1,13 +1,61 @@
-import spacy
-import pandas as pd
-from sentence_transformers import SentenceTransformer, util
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from shared.entity_matcher import contains_all_facts
+from shared.model_registry import DEFAULT_MODEL_NAME, registry, spacy_model_key
+
+
+def _as_list(texts) -> list:
+    """
+    Accept a single text or a list of texts and always return a list.
+    """
+    if isinstance(texts, str):
+        return [texts]
+    return list(texts)
 
 
 class TestFactualAccuracy:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, device: str = None, embedding_cache=None,
+                 entity_cache=None, spacy_model: str = "en_core_web_sm", similarity_backend=None):
+        self.spacy_model = spacy_model
+        # None compares entities with the sentence-transformer; any object with similarity_matrix(left, right),
+        # e.g. Example_2's LexicalBackend, can replace it
+        self.similarity_backend = similarity_backend
+        self._nlp = None
+        self.model_name = model_name
+        self.device = device
+        # Optional caches with the EmbeddingCache.encode / EntityCache.extract interface, e.g. Example_2's
+        self.embedding_cache = embedding_cache
+        self.entity_cache = entity_cache
+
+    @property
+    def nlp(self):
+        """
+        The spaCy pipeline, loaded the first time it is needed.
+        """
+        if self._nlp is None:
+            # Imported here so importing this module (e.g. for autodoc) stays fast
+            import spacy
+            self._nlp = spacy.load(self.spacy_model)
+        return self._nlp
+
+    @property
+    def model(self):
+        """
+        The sentence embedding model, shared process-wide through the model registry.
+        """
+        return registry.get(self.model_name, self.device)
+
+    def warm_up(self):
+        """
+        Load the embedding model ahead of scoring.
+        """
+        registry.warm_up(self.model_name, self.device)
+
+    def release_model(self) -> bool:
+        """
+        Release the embedding model held for this scorer's model name and device.
+        Returns:
+        - bool: True if a model was released, otherwise False.
+        """
+        return registry.release(self.model_name, self.device)
 
     def extract_named_entities(self, text: str):
         """
@@ -17,8 +65,7 @@ class TestFactualAccuracy:
         Returns:
         - list: List of named entities.
         """
-        doc = self.nlp(text)
-        named_entities = [ent.text for ent in doc.ents]
+        named_entities = list(self._entity_texts(text))
         return named_entities
 
     def check_factual_accuracy(self, output_entities: list, ground_truth_entities: list) -> bool:
@@ -33,11 +80,7 @@ class TestFactualAccuracy:
         if not ground_truth_entities:
             return False
 
-        for fact in ground_truth_entities:
-            if not any(fact in entity for entity in output_entities):
-                return False
-
-        return True
+        return contains_all_facts(output_entities, ground_truth_entities)
 
     def unique_entities(self, text: str) -> set:
         """
@@ -47,10 +90,20 @@ class TestFactualAccuracy:
         Returns:
         - set: Unique set of named entities.
         """
-        doc = self.nlp(text)
-        named_entities = set(ent.text for ent in doc.ents)
+        named_entities = set(self._entity_texts(text))
         return named_entities
 
+    def _entity_texts(self, text: str) -> list:
+        """
+        Run NER over the text, reusing the entity cache when one is configured.
+        """
+        def run_ner(batch):
+            return [[ent.text for ent in doc.ents] for doc in self.nlp.pipe(batch)]
+
+        if self.entity_cache is None:
+            return run_ner([text])[0]
+        return self.entity_cache.extract(spacy_model_key(self.nlp), [text], run_ner)[0]
+
     def get_unique_entities(self, output_entities: list, ground_truth_entities: list) -> list:
         """
         Return a unique list of entities found in both output_entities and ground_truth_entities.
@@ -96,20 +149,26 @@ class TestFactualAccuracy:
         Returns:
         - float: Cosine similarity between the two sets of entities as a percentage.
         """
-        model = SentenceTransformer('paraphrase-MiniLM-L6-v2')  # You can choose a different model
-
-        # Encode the entities into embeddings
-        output_embeddings = model.encode(output_entities, convert_to_tensor=True)
-        ground_truth_embeddings = model.encode(ground_truth_entities, convert_to_tensor=True)
+        output_entities = _as_list(output_entities)
+        ground_truth_entities = _as_list(ground_truth_entities)
 
         # Ensure both output and ground truth have the same number of vectors
-        assert len(output_embeddings) == len(ground_truth_embeddings), "Mismatch in the number of vectors."
+        assert len(output_entities) == len(ground_truth_entities), "Mismatch in the number of vectors."
+
+        if self.similarity_backend is not None:
+            similarity_scores = self.similarity_backend.similarity_matrix(output_entities, ground_truth_entities)
+        else:
+            # Encode the entities into unit-length embeddings, reusing cached vectors where possible
+            output_embeddings = registry.encode(output_entities, self.model_name, self.device, normalize=True,
+                                                cache=self.embedding_cache)
+            ground_truth_embeddings = registry.encode(ground_truth_entities, self.model_name, self.device,
+                                                      normalize=True, cache=self.embedding_cache)
 
-        # Calculate cosine similarity for each pair of vectors
-        similarity_scores = util.pytorch_cos_sim(output_embeddings, ground_truth_embeddings)
+            # Calculate cosine similarity for each pair of vectors
+            similarity_scores = output_embeddings @ ground_truth_embeddings.T
 
         # Take the average similarity score across all pairs
-        average_similarity = similarity_scores.mean().item()
+        average_similarity = float(similarity_scores.mean())
 
         # Convert similarity score to percentage rounded to two decimal places
         similarity_percentage = round(average_similarity * 100, 2)
@@ -0,0 +1,205 @@
+"""
+Benchmark harness for the factual-accuracy scoring pipeline.
+
+Runs the scorer over synthetic Ground_Truth/Output corpora and reports rows/sec, per-call latency
+percentiles for each scoring stage, model load time and peak RSS. Results can be saved as a named
+baseline and later runs compared against it, failing when throughput regresses.
+
+Usage::
+
+    python benchmarks/bench_factual_accuracy.py --rows 100 10000 100000
+    python benchmarks/bench_factual_accuracy.py --rows 100 10000 --save-baseline main
+    python benchmarks/bench_factual_accuracy.py --rows 100 10000 --compare main --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+import pandas as pd
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+# The shared package imported by the scorer lives at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+ENTITIES = ["Omni", "Audience Explorer", "Omnicom", "Apple", "Steve Jobs", "Cupertino", "California",
+            "United States", "Microsoft", "Seattle", "Google", "London", "Paris", "Tim Cook", "Monday",
+            "January", "Amazon", "Berlin", "Satya Nadella", "Tokyo"]
+WORDS = ["the", "platform", "shares", "an", "audience", "with", "partners", "for", "activation", "and",
+         "hosts", "recorded", "sessions", "team", "company", "was", "founded", "in", "reports", "growth"]
+
+
+def make_corpus(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a deterministic synthetic corpus of Ground_Truth/Output pairs.
+    About half of the outputs copy their ground truth with small edits, the rest are unrelated,
+    and ground truths repeat the way they do in real evaluation sets.
+    """
+    rng = random.Random(seed)
+
+    def sentence():
+        words = rng.choices(WORDS, k=rng.randint(8, 20))
+        for _ in range(rng.randint(1, 4)):
+            words.insert(rng.randrange(len(words)), rng.choice(ENTITIES))
+        return " ".join(words).capitalize() + "."
+
+    pool = [" ".join(sentence() for _ in range(rng.randint(1, 3))) for _ in range(max(1, rows // 5))]
+    ground_truths, outputs = [], []
+    for _ in range(rows):
+        ground_truth = rng.choice(pool)
+        if rng.random() < 0.5:
+            output = ground_truth.replace(rng.choice(ENTITIES), rng.choice(ENTITIES))
+        else:
+            output = " ".join(sentence() for _ in range(rng.randint(1, 3)))
+        ground_truths.append(ground_truth)
+        outputs.append(output)
+    return pd.DataFrame({"Ground_Truth": ground_truths, "Output": outputs})
+
+
+def percentiles(samples: list) -> dict:
+    """
+    Summarise latency samples, in milliseconds.
+    """
+    values = np.asarray(samples, dtype=np.float64) * 1000
+    return {'p50_ms': float(np.percentile(values, 50)), 'p90_ms': float(np.percentile(values, 90)),
+            'p99_ms': float(np.percentile(values, 99)), 'calls': len(samples)}
+
+
+def time_calls(fn, arguments: list) -> dict:
+    """
+    Call fn once per argument tuple and report latency percentiles.
+    """
+    samples = []
+    for args in arguments:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process so far, in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run(rows_list: list, sample_calls: int, file_max_rows: int) -> dict:
+    """
+    Run every benchmark and return the report.
+    """
+    from factual_accuracy import TestFactualAccuracy
+
+    report = {'python': platform.python_version(), 'machine': platform.machine(), 'sizes': {}}
+
+    # Building the scorer loads nothing; both models are loaded lazily on first use, so time that instead
+    scorer = TestFactualAccuracy()
+    start = time.perf_counter()
+    scorer.nlp
+    report['spacy_load_s'] = time.perf_counter() - start
+    # The spaCy pipeline is already loaded, so warm_up() only pays for the embedding model
+    start = time.perf_counter()
+    scorer.warm_up()
+    report['embedding_model_load_s'] = time.perf_counter() - start
+
+    for rows in rows_list:
+        df = make_corpus(rows)
+        sample = df.head(sample_calls)
+        entity_pairs = [(scorer.extract_named_entities(output), scorer.extract_named_entities(ground_truth))
+                        for ground_truth, output in zip(sample['Ground_Truth'], sample['Output'])]
+        result = {
+            'extract_named_entities': time_calls(scorer.extract_named_entities, [(text,) for text in sample['Output']]),
+            'check_factual_accuracy': time_calls(scorer.check_factual_accuracy, entity_pairs),
+            'calculate_overlap_pct': time_calls(scorer.calculate_overlap_pct,
+                                                list(zip(sample['Ground_Truth'], sample['Output'])))
+        }
+
+        scorer.metrics.reset()
+        start = time.perf_counter()
+        scorer.score_dataframe(df)
+        elapsed = time.perf_counter() - start
+        result['score_dataframe'] = {'seconds': elapsed, 'rows_per_sec': rows / elapsed,
+                                     'stages': scorer.metrics.summary()['stages']}
+
+        if rows <= file_max_rows:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'corpus.xlsx')
+                df.to_excel(path, index=False)
+                start = time.perf_counter()
+                scorer.extract_data_from_file(path, os.path.join(directory, 'results.parquet'))
+                elapsed = time.perf_counter() - start
+            result['extract_data_from_file'] = {'seconds': elapsed, 'rows_per_sec': rows / elapsed}
+
+        result['peak_rss_mb'] = peak_rss_mb()
+        report['sizes'][str(rows)] = result
+        print(f"{rows:>8} rows: {result['score_dataframe']['rows_per_sec']:,.0f} rows/sec, "
+              f"peak RSS {result['peak_rss_mb']:,.0f} MB")
+    return report
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """
+    List throughput regressions larger than tolerance (a fraction) against the baseline.
+    """
+    regressions = []
+    for rows, result in report['sizes'].items():
+        previous = baseline['sizes'].get(rows)
+        if previous is None:
+            continue
+        for stage in ('score_dataframe', 'extract_data_from_file'):
+            if stage not in result or stage not in previous:
+                continue
+            now, before = result[stage]['rows_per_sec'], previous[stage]['rows_per_sec']
+            if now < before * (1 - tolerance):
+                regressions.append(f"{stage} at {rows} rows: {now:,.0f} rows/sec vs baseline {before:,.0f}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 10_000, 100_000],
+                        help="Corpus sizes to benchmark.")
+    parser.add_argument('--sample-calls', type=int, default=200,
+                        help="Number of single calls timed per stage for latency percentiles.")
+    parser.add_argument('--file-max-rows', type=int, default=10_000,
+                        help="Largest corpus also benchmarked end to end through an Excel file.")
+    parser.add_argument('--output', help="Write the JSON report to this path.")
+    parser.add_argument('--save-baseline', metavar='NAME', help="Save the report as a named baseline.")
+    parser.add_argument('--compare', metavar='NAME', help="Compare against a saved baseline.")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed throughput drop against the baseline, as a fraction.")
+    args = parser.parse_args(argv)
+
+    report = run(args.rows, args.sample_calls, args.file_max_rows)
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(os.path.join(BASELINE_DIR, f"{args.save_baseline}.json"), 'w') as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json")) as handle:
+            baseline = json.load(handle)
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
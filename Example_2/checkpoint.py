@@ -0,0 +1,151 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from typing import Iterator, Optional
+from lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+
+# Bump when the shard or manifest layout changes, so older checkpoints are not resumed
+CHECKPOINT_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+
+
+def file_fingerprint(path) -> dict:
+    """
+    Identify the content of an input file, so a checkpoint is only resumed on the same data.
+    Returns:
+    - dict: Size in bytes and hex SHA-256 digest of the file.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return {'size': os.path.getsize(path), 'sha256': digest.hexdigest()}
+
+
+def _write_atomic(path: str, write_fn):
+    # Write to a temporary file and rename it, so a crash never leaves a half-written file behind
+    temporary = f"{path}.tmp"
+    write_fn(temporary)
+    os.replace(temporary, path)
+
+
+class Checkpoint:
+    """
+    Completed shards of an evaluation run, saved in a directory so the run can resume after a crash.
+
+    Each shard is pickled to its own file and then recorded in manifest.json, together with the input
+    file's fingerprint, the shard size, the model versions and whether shards hold the input columns.
+    Both are written atomically, so the manifest only ever lists shards that are fully on disk. A run
+    that differs in any of these starts the checkpoint afresh. Shards are pickles: only resume
+    checkpoints you wrote.
+    """
+
+    def __init__(self, directory, input_path, shard_size: int, versions: Optional[dict] = None,
+                 with_input: bool = False):
+        """
+        Parameters:
+        - directory (str): Checkpoint directory; created if missing.
+        - input_path (str): The file being scored.
+        - shard_size (int): Number of rows per shard.
+        - versions (dict): Model versions of the run, e.g. from TestFactualAccuracy.model_versions().
+        - with_input (bool): Shards hold the input columns next to the results, not the results alone.
+        """
+        self.directory = str(directory)
+        self.shard_size = shard_size
+        self.with_input = with_input
+        os.makedirs(self.directory, exist_ok=True)
+        run = {'format': CHECKPOINT_FORMAT, 'input': file_fingerprint(input_path), 'shard_size': shard_size,
+               'versions': versions or {}, 'with_input': with_input}
+        # Compare in JSON form, as stored (tuples come back as lists)
+        self.run = json.loads(json.dumps(run))
+        self.shards = []
+        self.complete = False
+
+        manifest = self._read_manifest()
+        if manifest is not None and manifest.get('run') == self.run:
+            self.shards = manifest['shards']
+            self.complete = manifest['complete']
+        else:
+            self.reset()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    @property
+    def completed_shards(self) -> int:
+        """
+        Number of shards already saved; the run resumes with the shard at this position.
+        """
+        return len(self.shards)
+
+    @property
+    def rows_done(self) -> int:
+        """
+        Number of rows covered by the saved shards.
+        """
+        return sum(shard['rows'] for shard in self.shards)
+
+    def save_shard(self, index: int, df: pd.DataFrame):
+        """
+        Save the next completed shard and record it in the manifest.
+        Parameters:
+        - index (int): Position of the shard; must follow the last saved one.
+        - df (DataFrame): The shard's rows.
+        """
+        if index != len(self.shards):
+            raise ValueError(f"Shard {index} saved out of order; expected shard {len(self.shards)}")
+        name = f"shard-{index:06d}.pkl"
+        _write_atomic(os.path.join(self.directory, name), df.to_pickle)
+        self.shards.append({'file': name, 'rows': len(df)})
+        self._write_manifest()
+
+    def load_shard(self, index: int) -> pd.DataFrame:
+        """
+        Load a saved shard.
+        """
+        return pd.read_pickle(os.path.join(self.directory, self.shards[index]['file']))
+
+    def iter_shards(self) -> Iterator[pd.DataFrame]:
+        """
+        Load the saved shards one at a time, in order.
+        """
+        for index in range(len(self.shards)):
+            yield self.load_shard(index)
+
+    def mark_complete(self):
+        """
+        Record that every shard of the run has been saved.
+        """
+        self.complete = True
+        self._write_manifest()
+
+    def reset(self):
+        """
+        Delete every saved shard and start an empty manifest for this run.
+        """
+        for name in os.listdir(self.directory):
+            if name.startswith("shard-"):
+                os.remove(os.path.join(self.directory, name))
+        self.shards = []
+        self.complete = False
+        self._write_manifest()
+
+    def _read_manifest(self) -> Optional[dict]:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_manifest(self):
+        manifest = {'run': self.run, 'shards': self.shards, 'complete': self.complete}
+
+        def write(path):
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(manifest, file, indent=2)
+
+        _write_atomic(self.manifest_path, write)
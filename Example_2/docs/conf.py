@@ -5,6 +5,8 @@
 import os
 import sys
 sys.path.insert(0, os.path.abspath('..'))
+# The shared package used by this project lives at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join('..', '..')))
 # -- Project information -----------------------------------------------------
 # https://www.sphinx-doc.org/en/master/usage/configuration.html#project-information
 
@@ -18,6 +20,10 @@ release = '0.1'
 
 extensions = ['sphinx.ext.autodoc']
 
+# The modules import numpy at module level, and test_factual also imports pandas and pytest; spaCy,
+# scikit-learn and sentence-transformers are loaded lazily, so they need no mock
+autodoc_mock_imports = ['numpy', 'pandas', 'pytest']
+
 templates_path = ['_templates']
 exclude_patterns = ['_build', 'Thumbs.db', '.DS_Store']
 
@@ -0,0 +1,97 @@
+import hashlib
+from typing import Callable, List, Optional
+import numpy as np
+from sqlite_lru import SQLiteLRUCache
+
+
+def normalise_text(text: str) -> str:
+    """
+    Normalise text before hashing so whitespace-only differences share one cache entry.
+    Parameters:
+    - text (str): The input text.
+    Returns:
+    - str: Text with surrounding whitespace removed and inner whitespace collapsed.
+    """
+    return " ".join(text.split())
+
+
+class EmbeddingCache(SQLiteLRUCache):
+    """
+    Content-addressed cache of sentence embeddings.
+
+    Vectors are keyed by a hash of the model name and the normalised text and stored as float32.
+    A bounded in-memory LRU sits in front of an optional SQLite file, which is itself bounded to
+    max_entries by evicting the least recently used rows.
+    """
+
+    table = 'embeddings'
+    value_column = 'vector'
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """
+        Build the cache key for a text embedded with the given model.
+        Returns:
+        - str: Hex SHA-256 digest of the model name and normalised text.
+        """
+        return hashlib.sha256(f"{model_name}\0{normalise_text(text)}".encode("utf-8")).hexdigest()
+
+    def get_many(self, model_name: str, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up the embeddings of several texts.
+        Returns:
+        - list: One float32 vector per text, or None where the text is not cached.
+        """
+        return self.get_keys([self.make_key(model_name, text) for text in texts])
+
+    def put_many(self, model_name: str, texts: List[str], vectors: np.ndarray):
+        """
+        Store the embeddings of several texts.
+        Parameters:
+        - model_name (str): Name of the model that produced the vectors.
+        - texts (list): The embedded texts.
+        - vectors (ndarray): One vector per text.
+        """
+        self.put_keys([self.make_key(model_name, text) for text in texts], np.asarray(vectors, dtype=np.float32))
+
+    def encode(self, model_name: str, texts: List[str], encode_fn: Callable[[List[str]], np.ndarray],
+               normalize: bool = False) -> np.ndarray:
+        """
+        Return embeddings for texts, calling encode_fn only for texts that are not cached.
+        Parameters:
+        - model_name (str): Name of the model, part of the cache key.
+        - texts (list): Texts to embed.
+        - encode_fn (callable): Encodes a list of texts into a 2-D array of raw (unnormalised) vectors.
+        - normalize (bool): Scale the returned vectors to unit length.
+        Returns:
+        - ndarray: float32 array with one row per text.
+        """
+        cached = self.get_many(model_name, texts)
+        missing_texts = list(dict.fromkeys(text for text, vector in zip(texts, cached) if vector is None))
+
+        if missing_texts:
+            new_vectors = np.asarray(encode_fn(missing_texts), dtype=np.float32)
+            self.put_many(model_name, missing_texts, new_vectors)
+            computed = dict(zip(missing_texts, new_vectors))
+            cached = [vector if vector is not None else computed[text] for text, vector in zip(texts, cached)]
+
+        if not cached:
+            return np.empty((0, 0), dtype=np.float32)
+        embeddings = np.vstack(cached)
+        if normalize:
+            embeddings = normalize_rows(embeddings)
+        return embeddings
+
+    def _serialise(self, vector: np.ndarray) -> bytes:
+        return vector.tobytes()
+
+    def _deserialise(self, blob: bytes) -> np.ndarray:
+        return np.frombuffer(blob, dtype=np.float32)
+
+
+def normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Scale each row to unit length; all-zero rows are left as zeros.
+    """
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.where(norms == 0, 1, norms)
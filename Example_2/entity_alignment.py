@@ -0,0 +1,83 @@
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+import numpy as np
+from lazy_import import lazy_import
+
+# SciPy (installed with scikit-learn) is only needed once rows are actually aligned
+scipy_optimize = lazy_import("scipy.optimize")
+
+# Up to this many distinct entities, one similarity matrix over all of them is computed and rows
+# index into it; above it, each row gets its own small matrix product
+FULL_MATRIX_MAX_ENTITIES = 4096
+
+
+class EntityAlignment(NamedTuple):
+    """
+    Best-match alignment of one row's ground truth entities to its output entities.
+    """
+    matches: List[Tuple[str, str, float]]
+    recall: float
+    precision: float
+
+
+def optimal_match(similarity: np.ndarray, threshold: float) -> List[Tuple[int, int, float]]:
+    """
+    One-to-one matching that maximises the total similarity of the matched pairs.
+    Unlike taking the most similar pair first, one strong pair does not block two slightly weaker ones.
+    Parameters:
+    - similarity (ndarray): Matrix of shape (ground truth entities, output entities).
+    - threshold (float): Pairs less similar than this are never matched.
+    Returns:
+    - list: (ground truth index, output index, similarity) for each matched pair, most similar first.
+    """
+    if not similarity.size:
+        return []
+    # Pairs below the threshold weigh nothing, so the solver only uses them to fill rows left unmatched
+    weights = np.where(similarity >= threshold, similarity, 0.0)
+    rows, columns = scipy_optimize.linear_sum_assignment(weights, maximize=True)
+    scores = similarity[rows, columns]
+    keep = scores >= threshold
+    rows, columns, scores = rows[keep], columns[keep], scores[keep]
+    order = np.argsort(-scores, kind='stable')
+    return list(zip(rows[order].tolist(), columns[order].tolist(), scores[order].tolist()))
+
+
+def align_columns(output_column: List[Optional[Iterable[str]]], ground_truth_column: List[Optional[Iterable[str]]],
+                  embed_fn: Callable[[List[str]], np.ndarray], threshold: float = 0.8) -> List[EntityAlignment]:
+    """
+    Align the entities of every row, embedding each distinct entity of the whole column once.
+    Parameters:
+    - output_column (list): Output entities per row; None means no entities.
+    - ground_truth_column (list): Ground truth entities per row; None means no entities.
+    - embed_fn (callable): Returns one unit-length embedding per text, e.g. the scorer's normalised encoder.
+    - threshold (float): Minimum cosine similarity for two entities to count as the same fact.
+    Returns:
+    - list: One EntityAlignment per row. Recall is nan for rows without ground truth entities and precision is nan for rows without output entities.
+    """
+    output_rows = [sorted(entities) if entities else [] for entities in output_column]
+    ground_truth_rows = [sorted(entities) if entities else [] for entities in ground_truth_column]
+
+    entities = list(dict.fromkeys(entity for row in ground_truth_rows + output_rows for entity in row))
+    position = {entity: i for i, entity in enumerate(entities)}
+    embeddings = np.asarray(embed_fn(entities), dtype=np.float32) if entities else np.empty((0, 0), np.float32)
+    full_matrix = embeddings @ embeddings.T if len(entities) <= FULL_MATRIX_MAX_ENTITIES else None
+
+    alignments = []
+    for output_entities, ground_truth_entities in zip(output_rows, ground_truth_rows):
+        if not output_entities or not ground_truth_entities:
+            alignments.append(EntityAlignment([], float('nan') if not ground_truth_entities else 0.0,
+                                              float('nan') if not output_entities else 0.0))
+            continue
+
+        ground_truth_ids = [position[entity] for entity in ground_truth_entities]
+        output_ids = [position[entity] for entity in output_entities]
+        if full_matrix is not None:
+            similarity = full_matrix[np.ix_(ground_truth_ids, output_ids)]
+        else:
+            similarity = embeddings[ground_truth_ids] @ embeddings[output_ids].T
+
+        matches = optimal_match(similarity, threshold)
+        matched = sum(score for _, _, score in matches)
+        alignments.append(EntityAlignment(
+            [(ground_truth_entities[row], output_entities[column], round(score, 4)) for row, column, score in matches],
+            round(matched / len(ground_truth_entities), 4), round(matched / len(output_entities), 4)))
+    return alignments
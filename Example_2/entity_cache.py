@@ -0,0 +1,79 @@
+import hashlib
+import json
+from typing import Callable, List, Optional
+from sqlite_lru import SQLiteLRUCache
+
+
+class EntityCache(SQLiteLRUCache):
+    """
+    Cache of named-entity extraction results.
+
+    Entries are keyed by the spaCy model identifier and a hash of the exact text, and hold the
+    entity texts in document order. A bounded in-memory LRU sits in front of an optional SQLite
+    file so results are shared across rows and across runs.
+    """
+
+    table = 'entities'
+    value_column = 'entities'
+    value_type = 'TEXT'
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1_000_000, memory_entries: int = 100_000):
+        """
+        Parameters:
+        - path (str): SQLite file to persist results in. None keeps the cache in memory only.
+        - max_entries (int): Maximum number of results kept on disk.
+        - memory_entries (int): Maximum number of results kept in the in-memory LRU.
+        """
+        super().__init__(path, max_entries=max_entries, memory_entries=memory_entries)
+
+    @staticmethod
+    def make_key(model_key: str, text: str) -> str:
+        """
+        Build the cache key for a text processed by the given spaCy model.
+        Returns:
+        - str: Hex SHA-256 digest of the model identifier and text.
+        """
+        return hashlib.sha256(f"{model_key}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, model_key: str, texts: List[str]) -> List[Optional[List[str]]]:
+        """
+        Look up the cached entities of several texts.
+        Returns:
+        - list: One list of entity texts per input text, or None where the text is not cached.
+        """
+        return self.get_keys([self.make_key(model_key, text) for text in texts])
+
+    def put_many(self, model_key: str, texts: List[str], entity_lists: List[List[str]]):
+        """
+        Store the entities extracted from several texts.
+        """
+        self.put_keys([self.make_key(model_key, text) for text in texts],
+                      [list(entities) for entities in entity_lists])
+
+    def extract(self, model_key: str, texts: List[str],
+                extract_fn: Callable[[List[str]], List[List[str]]]) -> List[List[str]]:
+        """
+        Return the entities of every text, calling extract_fn only for texts that are not cached.
+        Parameters:
+        - model_key (str): Identifier of the spaCy model and of any settings that change its entities,
+        e.g. TestFactualAccuracy._entity_key.
+        - texts (list): Texts to process.
+        - extract_fn (callable): Runs NER over a list of texts and returns their entity texts.
+        Returns:
+        - list: One list of entity texts per input text, aligned with texts.
+        """
+        cached = self.get_many(model_key, texts)
+        missing_texts = list(dict.fromkeys(text for text, entities in zip(texts, cached) if entities is None))
+
+        if missing_texts:
+            new_entities = extract_fn(missing_texts)
+            self.put_many(model_key, missing_texts, new_entities)
+            computed = dict(zip(missing_texts, new_entities))
+            cached = [entities if entities is not None else computed[text] for text, entities in zip(texts, cached)]
+        return cached
+
+    def _serialise(self, entities: List[str]) -> str:
+        return json.dumps(entities)
+
+    def _deserialise(self, payload: str) -> List[str]:
+        return json.loads(payload)
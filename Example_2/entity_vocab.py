@@ -0,0 +1,185 @@
+from typing import Iterable, List, Optional
+import numpy as np
+
+
+def _sorted_member(keys: np.ndarray, other: np.ndarray) -> np.ndarray:
+    """
+    For each of the sorted keys, whether it occurs in the sorted array other.
+    Binary search instead of np.isin, which would sort both arrays again.
+    """
+    if not len(other):
+        return np.zeros(len(keys), dtype=bool)
+    positions = np.minimum(np.searchsorted(other, keys), len(other) - 1)
+    return other[positions] == keys
+
+
+class RaggedIds:
+    """
+    CSR-style ragged array of entity IDs: row i holds ids[offsets[i]:offsets[i + 1]], sorted and unique.
+
+    Set operations work on all rows at once. Each (row, id) pair is packed into one int64 key,
+    row * width + id, so row-wise union, difference and intersection become single sorted-array
+    operations over the whole column instead of one Python set operation per row.
+    """
+
+    __slots__ = ('ids', 'offsets')
+
+    def __init__(self, ids: np.ndarray, offsets: np.ndarray):
+        """
+        Parameters:
+        - ids (ndarray): Entity IDs of every row, concatenated; int32.
+        - offsets (ndarray): Start of each row in ids plus the total length; int64, one longer than the row count.
+        """
+        self.ids = ids
+        self.offsets = offsets
+
+    @classmethod
+    def from_keys(cls, keys: np.ndarray, n_rows: int, width: int) -> 'RaggedIds':
+        """
+        Build a ragged array from sorted, unique row * width + id keys.
+        """
+        rows = keys // width
+        offsets = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=offsets[1:])
+        return cls((keys - rows * width).astype(np.int32), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def lengths(self) -> np.ndarray:
+        """
+        Number of entities in each row.
+        """
+        return np.diff(self.offsets)
+
+    def row(self, index: int) -> np.ndarray:
+        """
+        Entity IDs of one row.
+        """
+        return self.ids[self.offsets[index]:self.offsets[index + 1]]
+
+    def keys(self, width: int) -> np.ndarray:
+        """
+        The row * width + id key of every entry, sorted because rows and their IDs are.
+        """
+        rows = np.repeat(np.arange(len(self), dtype=np.int64), self.lengths())
+        return rows * width + self.ids
+
+    def take(self, rows) -> 'RaggedIds':
+        """
+        Select rows by position (or boolean mask), gathering their IDs without a Python loop.
+        """
+        rows = np.asarray(rows)
+        rows = np.flatnonzero(rows) if rows.dtype == bool else rows.astype(np.int64)
+        lengths = self.lengths()[rows]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        positions = np.repeat(self.offsets[rows] - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return RaggedIds(self.ids[positions], offsets)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory held by the ID and offset arrays.
+        """
+        return self.ids.nbytes + self.offsets.nbytes
+
+    def union(self, other: 'RaggedIds') -> 'RaggedIds':
+        """
+        Row-wise union with another ragged array of the same length.
+        """
+        width = self._width(other)
+        keys, other_keys = self.keys(width), other.keys(width)
+        keys = np.concatenate((keys, other_keys[~_sorted_member(other_keys, keys)]))
+        keys.sort(kind='stable')
+        return RaggedIds.from_keys(keys, len(self), width)
+
+    def difference(self, other: 'RaggedIds') -> 'RaggedIds':
+        """
+        Row-wise difference: the IDs of each row that are not in the same row of other.
+        """
+        width = self._width(other)
+        keys = self.keys(width)
+        keys = keys[~_sorted_member(keys, other.keys(width))]
+        return RaggedIds.from_keys(keys, len(self), width)
+
+    def intersection(self, other: 'RaggedIds') -> 'RaggedIds':
+        """
+        Row-wise intersection with another ragged array of the same length.
+        """
+        width = self._width(other)
+        keys = self.keys(width)
+        keys = keys[_sorted_member(keys, other.keys(width))]
+        return RaggedIds.from_keys(keys, len(self), width)
+
+    def _width(self, other: 'RaggedIds') -> int:
+        if len(self) != len(other):
+            raise ValueError(f"Row counts differ: {len(self)} and {len(other)}.")
+        return int(max(self.ids.max(initial=-1), other.ids.max(initial=-1))) + 1 or 1
+
+
+class EntityVocabulary:
+    """
+    Table that interns entity strings to integer IDs.
+
+    Each distinct entity string is stored once, however many rows mention it, and rows are kept as
+    RaggedIds of compact int32 IDs. A vocabulary only grows, so the scorer makes one per comparison
+    (one chunk or request) and it is freed together with the results that use it.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self.strings: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def intern(self, text: str) -> int:
+        """
+        Return the ID of an entity string, assigning the next free ID the first time it is seen.
+        """
+        entity_id = self._ids.get(text)
+        if entity_id is None:
+            entity_id = self._ids[text] = len(self.strings)
+            self.strings.append(text)
+        return entity_id
+
+    def encode(self, column: Iterable[Optional[Iterable[str]]]) -> RaggedIds:
+        """
+        Intern a column of entity collections.
+        Parameters:
+        - column (iterable): One collection of entity strings (or None, meaning no entities) per row.
+        Returns:
+        - RaggedIds: The sorted, de-duplicated IDs of each row.
+        """
+        column = [entities if entities else () for entities in column]
+        texts = [text for entities in column for text in entities]
+        for text in dict.fromkeys(texts):
+            if text not in self._ids:
+                self._ids[text] = len(self.strings)
+                self.strings.append(text)
+
+        lengths = np.fromiter(map(len, column), dtype=np.int64, count=len(column))
+        ids = np.fromiter(map(self._ids.__getitem__, texts), dtype=np.int64, count=len(texts))
+        width = max(len(self.strings), 1)
+        # Sorting the packed keys sorts IDs within each row; unique also drops duplicates inside a row
+        keys = np.unique(np.repeat(np.arange(len(column), dtype=np.int64), lengths) * width + ids)
+        return RaggedIds.from_keys(keys, len(column), width)
+
+    def decode(self, ragged: RaggedIds, rows: Optional[Iterable[int]] = None) -> List[Optional[set]]:
+        """
+        Turn rows of a ragged array back into sets of entity strings.
+        Parameters:
+        - ragged (RaggedIds): IDs to decode.
+        - rows (iterable): Row indices to decode; every row when None. Other rows are left as None.
+        Returns:
+        - list: One set (or None for rows not asked for) per row of ragged.
+        """
+        texts = list(map(self.strings.__getitem__, ragged.ids.tolist()))
+        bounds = ragged.offsets.tolist()
+        if rows is None:
+            return [set(texts[start:end]) for start, end in zip(bounds, bounds[1:])]
+        decoded = [None] * len(ragged)
+        for row in rows:
+            decoded[row] = set(texts[bounds[row]:bounds[row + 1]])
+        return decoded
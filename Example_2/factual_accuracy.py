@@ -1,15 +1,153 @@
-import spacy
-import pandas as pd
+from __future__ import annotations
+import logging
+import numpy as np
 from typing import List, Any
-from sentence_transformers import SentenceTransformer, util
+from checkpoint import Checkpoint
+from embedding_cache import EmbeddingCache
+from entity_alignment import EntityAlignment, align_columns
+from entity_cache import EntityCache
+from shared.entity_matcher import contains_all_facts, contains_all_facts_batch, fact_coverage_batch
+from entity_vocab import EntityVocabulary
+from instrumentation import Metrics, profile
+from lazy_import import lazy_import
+from long_document import DEFAULT_CHUNK_CHARS, LONG_DOCUMENT_CHARS, Entity, extract_entities_chunked
+from shared.model_registry import DEFAULT_MODEL_NAME, long_text_model_key, registry, spacy_model_key
+from parallel import score_dataframe_parallel
+from reference_index import ReferenceIndex
+from result_io import is_missing, iter_chunks, open_chunk_writer, write_results
+from result_schema import ResultTable
+from run_manifest import RunManifest, row_hash
+from similarity_backends import SimilarityBackend, require_batch_independent
 """
 These are the import statements
 
 """
 
+# spaCy and pandas are imported on first use, keeping module import (autodoc, test collection) fast
+spacy = lazy_import("spacy")
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+RESULT_COLUMNS = ["Ground_Truth_Entities", "Output_Entities", "All_Unique_Entities", "Unique_In_Output",
+                  "Unique_in_Ground_Truth", "Result", "Overlap_PCT"]
+
+
+def _as_text(value) -> str:
+    """
+    Turn a spreadsheet cell into text for spaCy; missing values become an empty string.
+    """
+    if is_missing(value):
+        return ""
+    return str(value)
+
+
+def _as_list(texts) -> list:
+    """
+    Accept a single text or a list of texts and always return a list.
+    """
+    if isinstance(texts, str):
+        return [texts]
+    return list(texts)
+
+
 class TestFactualAccuracy:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, device: str | None = None,
+                 embedding_cache: EmbeddingCache | None = None, entity_cache: EntityCache | None = None,
+                 metrics: Metrics | None = None, spacy_model: str = "en_core_web_sm",
+                 similarity_backend: SimilarityBackend | None = None, long_document_chars: int = LONG_DOCUMENT_CHARS,
+                 long_text_embeddings: bool = False):
+        self.spacy_model = spacy_model
+        # Texts longer than this go through chunked NER (extract_entity_spans) instead of one spaCy call
+        self.long_document_chars = long_document_chars
+        # None scores overlap with the sentence-transformer through _encode and the embedding cache
+        self.similarity_backend = similarity_backend
+        # Embed texts beyond the model's sequence window by pooling chunk embeddings instead of truncating them
+        self.long_text_embeddings = long_text_embeddings
+        self._nlp = None
+        self.model_name = model_name
+        self.device = device
+        self.embedding_cache = embedding_cache
+        self.entity_cache = entity_cache
+        self.metrics = metrics if metrics is not None else Metrics()
+
+    @property
+    def nlp(self):
+        """
+        The spaCy pipeline, loaded the first time it is needed.
+        """
+        if self._nlp is None:
+            self._nlp = spacy.load(self.spacy_model)
+        return self._nlp
+
+    def config(self) -> dict:
+        """
+        Describe how this scorer was built, so worker processes can build an equivalent one.
+        Returns:
+        - dict: Picklable settings accepted by from_config.
+        """
+        return {
+            'model_name': self.model_name,
+            'device': self.device,
+            'embedding_cache': None if self.embedding_cache is None else self.embedding_cache.config(),
+            'entity_cache': None if self.entity_cache is None else self.entity_cache.config(),
+            'spacy_model': self.spacy_model,
+            # Sent as settings rather than the object: a backend holding a model or an open cache does not pickle
+            'similarity_backend': None if self.similarity_backend is None else self.similarity_backend.config(),
+            'long_document_chars': self.long_document_chars,
+            'long_text_embeddings': self.long_text_embeddings
+        }
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """
+        Build a scorer from the settings returned by config().
+        Caches backed by a file are reopened on the same file; in-memory caches start empty.
+        """
+        embedding_cache = config.get('embedding_cache')
+        entity_cache = config.get('entity_cache')
+        similarity_backend = config.get('similarity_backend')
+        return cls(model_name=config['model_name'], device=config['device'],
+                   embedding_cache=None if embedding_cache is None else EmbeddingCache(**embedding_cache),
+                   entity_cache=None if entity_cache is None else EntityCache(**entity_cache),
+                   spacy_model=config.get('spacy_model', "en_core_web_sm"),
+                   similarity_backend=(None if similarity_backend is None
+                                       else SimilarityBackend.from_config(similarity_backend)),
+                   long_document_chars=config.get('long_document_chars', LONG_DOCUMENT_CHARS),
+                   long_text_embeddings=config.get('long_text_embeddings', False))
+
+    @property
+    def model(self):
+        """
+        The sentence embedding model, shared process-wide through the model registry.
+        """
+        return registry.get(self.model_name, self.device)
+
+    def warm_up(self):
+        """
+        Load the models scoring uses ahead of time so the first row does not pay for them.
+        The spaCy pipeline is always loaded; the embedding model only when no similarity_backend replaces it.
+        """
+        self.nlp
+        if self.similarity_backend is None:
+            registry.warm_up(self.model_name, self.device)
+
+    def release_model(self) -> bool:
+        """
+        Release the embedding model held for this scorer's model name and device.
+        Returns:
+        - bool: True if a model was released, otherwise False.
+        """
+        return registry.release(self.model_name, self.device)
+
+    def _encode(self, texts: list, batch_size: int = 64, normalize: bool = False) -> np.ndarray:
+        """
+        Encode texts with the shared model, skipping texts already held in the embedding cache.
+        """
+        self.metrics.count('texts_encoded', len(texts))
+        with self.metrics.stage('embedding'):
+            return registry.encode(texts, self.model_name, self.device, batch_size=batch_size, normalize=normalize,
+                                   cache=self.embedding_cache, long_texts=self.long_text_embeddings)
 
     def extract_named_entities(self, text: str):
         """
@@ -19,14 +157,90 @@ class TestFactualAccuracy:
         Returns:
         - list: List of named entities.
         """
-        doc = self.nlp(text)
-        named_entities = set(ent.text for ent in doc.ents)
+        if self.entity_cache is not None or len(text) > self.long_document_chars:
+            named_entities = set(self._entity_texts([text])[0])
+        else:
+            self.metrics.count('texts_parsed')
+            with self.metrics.stage('ner'):
+                doc = self.nlp(text, disable=self._ner_disabled_components())
+                named_entities = set(ent.text for ent in doc.ents)
 
         if not named_entities:
             return None
 
         return named_entities
 
+    def extract_named_entities_batch(self, texts, batch_size: int = 256, n_process: int = 1) -> list:
+        """
+        Fetch named entities for many texts at once by streaming them through nlp.pipe.
+        Parameters:
+        - texts (iterable): The input texts, e.g. a DataFrame column. Missing values are treated as empty text.
+        - batch_size (int): Number of texts spaCy processes per batch.
+        - n_process (int): Number of worker processes spaCy uses. -1 uses all cores.
+        Returns:
+        - list: One entry per input text: a set of named entities or None, as extract_named_entities returns.
+        """
+        texts = [_as_text(text) for text in texts]
+        entity_texts = self._entity_texts(texts, batch_size=batch_size, n_process=n_process)
+        return [set(entities) or None for entities in entity_texts]
+
+    def _entity_texts(self, texts: List[str], batch_size: int = 256, n_process: int = 1) -> List[List[str]]:
+        """
+        Run NER over texts and return the entity texts of each, in document order.
+        Each distinct text is parsed once; with an entity cache, previously seen texts skip spaCy entirely.
+        """
+        def run_ner(batch):
+            self.metrics.count('texts_parsed', len(batch))
+            with self.metrics.stage('ner'):
+                # Long documents are chunked one at a time; the rest stream through nlp.pipe together
+                short_texts = [text for text in batch if len(text) <= self.long_document_chars]
+                docs = iter(self.nlp.pipe(short_texts, batch_size=batch_size, n_process=n_process,
+                                          disable=self._ner_disabled_components()))
+                return [[ent.text for ent in next(docs).ents] if len(text) <= self.long_document_chars
+                        else [entity.text for entity in self.extract_entity_spans(text)] for text in batch]
+
+        if self.entity_cache is not None:
+            return self.entity_cache.extract(self._entity_key(), texts, run_ner)
+
+        # Duplicate texts (e.g. a repeated ground truth) are parsed only once
+        unique_texts = list(dict.fromkeys(texts))
+        parsed = dict(zip(unique_texts, run_ner(unique_texts)))
+        return [parsed[text] for text in texts]
+
+    def extract_entity_spans(self, text: str, max_chunk_chars: int = DEFAULT_CHUNK_CHARS) -> List[Entity]:
+        """
+        Fetch named entities with their character offsets, from a document of any length.
+        The text is split on paragraph and sentence boundaries into chunks of at most max_chunk_chars that are
+        streamed through NER, so memory stays flat and spaCy's max_length does not apply.
+        Parameters:
+        - text (str): The input text.
+        - max_chunk_chars (int): Largest chunk handed to spaCy.
+        Returns:
+        - list: Entity tuples (text, start, end, label) in document order, each occurrence once.
+        """
+        return extract_entities_chunked(self.nlp, _as_text(text), max_chars=max_chunk_chars,
+                                        disable=self._ner_disabled_components())
+
+    def _ner_disabled_components(self) -> list:
+        """
+        Names of the pipeline components that named entity recognition does not depend on.
+        Every component that sets doc.ents (ner, entity_ruler, a span_ruler with annotate_ents) is kept,
+        along with the components they listen to (a shared tok2vec or transformer) and those assigning
+        the attributes they require (e.g. an attribute_ruler before a lemma-based entity_ruler).
+        """
+        nlp = self.nlp
+        needed = {name for name, component in nlp.pipeline
+                  if "doc.ents" in nlp.get_pipe_meta(name).assigns or getattr(component, "annotate_ents", False)}
+        changed = True
+        while changed:
+            required = {attribute for name in needed for attribute in nlp.get_pipe_meta(name).requires}
+            supporting = {name for name, component in nlp.pipeline
+                          if set(getattr(component, "listening_components", [])) & needed
+                          or set(nlp.get_pipe_meta(name).assigns) & required}
+            changed = not supporting <= needed
+            needed |= supporting
+        return [name for name in nlp.pipe_names if name not in needed]
+
     def check_factual_accuracy(self, output_entities: list, ground_truth_entities: list) -> bool:
         """
         Check if the given ground_truth_entities are present in the output_entities.
@@ -39,11 +253,56 @@ class TestFactualAccuracy:
         if not ground_truth_entities or output_entities is None:
             return False
 
-        for fact in ground_truth_entities:
-            if not any(fact in entity for entity in output_entities):
-                return False
+        return contains_all_facts(output_entities, ground_truth_entities)
 
-        return True
+    def check_factual_accuracy_batch(self, output_column: list, ground_truth_column: list) -> np.ndarray:
+        """
+        Run check_factual_accuracy for every row of two aligned entity columns in one pass.
+        A single automaton is built over all ground truth facts and each distinct output entity is scanned once.
+        Parameters:
+        - output_column (list): Named entities from the output, one collection (or None) per row.
+        - ground_truth_column (list): Ground truth named entities, one collection (or None) per row.
+        Returns:
+        - ndarray: One bool per row, identical to check_factual_accuracy on that row.
+        """
+        matches = contains_all_facts_batch(output_column, ground_truth_column)
+        return np.array([bool(ground_truth_entities) and output_entities is not None and match
+                         for output_entities, ground_truth_entities, match
+                         in zip(output_column, ground_truth_column, matches)], dtype=bool)
+
+    def align_entities(self, output_entities: list, ground_truth_entities: list,
+                       threshold: float = 0.8) -> EntityAlignment:
+        """
+        Match ground truth entities to output entities by embedding similarity instead of exact substrings.
+        Parameters:
+        - output_entities (list): List of named entities from the output.
+        - ground_truth_entities (list): List of ground truth named entities.
+        - threshold (float): Minimum cosine similarity for two entities to count as the same fact.
+        Returns:
+        - EntityAlignment: Matched (ground truth, output, similarity) pairs with soft recall and precision.
+        """
+        return self.align_entities_batch([output_entities], [ground_truth_entities], threshold)[0]
+
+    def align_entities_batch(self, output_column: list, ground_truth_column: list, threshold: float = 0.8,
+                             batch_size: int = 64) -> List[EntityAlignment]:
+        """
+        Run align_entities for every row of two aligned entity columns.
+        Every distinct entity of the columns is embedded once; each row's output x ground truth similarity
+        matrix is then a lookup into the precomputed similarities, followed by the thresholded
+        one-to-one match of highest total similarity, so "U.S." can match "United States".
+        Parameters:
+        - output_column (list): Named entities from the output, one collection (or None) per row.
+        - ground_truth_column (list): Ground truth named entities, one collection (or None) per row.
+        - threshold (float): Minimum cosine similarity for two entities to count as the same fact.
+        - batch_size (int): Number of entities encoded per forward pass.
+        Returns:
+        - list: One EntityAlignment per row.
+        """
+        def embed(entities):
+            return self._encode(entities, batch_size=batch_size, normalize=True)
+
+        with self.metrics.stage('alignment'):
+            return align_columns(list(output_column), list(ground_truth_column), embed, threshold)
 
     def get_unique_entities(self, output_entities: list, ground_truth_entities: list) -> None | set[Any]:
         """
@@ -113,6 +372,77 @@ class TestFactualAccuracy:
             return "No_Unique_entities in Ground_truth"
         return unique_set_in_ground_truth
 
+    def compare_entity_columns(self, output_column: list, ground_truth_column: list, decode: bool = True,
+                               vocab: EntityVocabulary | None = None) -> dict:
+        """
+        Compare the output and ground truth entities of every row at once.
+        Entities are interned in a vocabulary and the row-wise union and differences are computed over all
+        rows as integer arrays, with no Python set arithmetic per row. A new vocabulary is made for each call
+        unless one is given, so it holds only the entities of these columns and does not grow across chunks or runs.
+        Parameters:
+        - output_column (list): Named entities from the output, one set (or None) per row.
+        - ground_truth_column (list): Ground truth named entities, one set (or None) per row.
+        - decode (bool): Return the legacy column values instead of the integer-ID arrays.
+        - vocab (EntityVocabulary): Vocabulary to intern the entities in; a new one when None.
+        Returns:
+        - dict: With decode, 'All_Unique_Entities', 'Unique_In_Output' and 'Unique_in_Ground_Truth' lists
+        holding exactly what the get_unique_* methods return, sentinel strings included. Without decode,
+        RaggedIds 'output_ids', 'ground_truth_ids', 'all_unique', 'only_in_output' and 'only_in_ground_truth'
+        plus bool arrays 'output_present', 'ground_truth_present' and 'equal', and the 'vocab' that decodes
+        the IDs.
+        """
+        output_column, ground_truth_column = list(output_column), list(ground_truth_column)
+        vocab = EntityVocabulary() if vocab is None else vocab
+        output_ids = vocab.encode(output_column)
+        ground_truth_ids = vocab.encode(ground_truth_column)
+        only_in_output = output_ids.difference(ground_truth_ids)
+        only_in_ground_truth = ground_truth_ids.difference(output_ids)
+        comparison = {
+            'output_ids': output_ids,
+            'ground_truth_ids': ground_truth_ids,
+            'all_unique': output_ids.union(ground_truth_ids),
+            'only_in_output': only_in_output,
+            'only_in_ground_truth': only_in_ground_truth,
+            'output_present': np.fromiter((entities is not None for entities in output_column), dtype=bool,
+                                          count=len(output_column)),
+            'ground_truth_present': np.fromiter((entities is not None for entities in ground_truth_column),
+                                                dtype=bool, count=len(ground_truth_column)),
+            'equal': (only_in_output.lengths() == 0) & (only_in_ground_truth.lengths() == 0),
+            'vocab': vocab
+        }
+        if not decode:
+            return comparison
+
+        # Only rows with entities on both sides need a computed set; every other row gets a sentinel or an input
+        both_present = comparison['output_present'] & comparison['ground_truth_present']
+        differing = np.flatnonzero(both_present & ~comparison['equal']).tolist()
+        union = vocab.decode(comparison['all_unique'], np.flatnonzero(both_present).tolist())
+        output_unique = vocab.decode(only_in_output, differing)
+        ground_truth_unique = vocab.decode(only_in_ground_truth, differing)
+        equal = comparison['equal'].tolist()
+
+        all_unique, unique_in_output, unique_in_ground_truth = [], [], []
+        for i, (output_entities, ground_truth_entities) in enumerate(zip(output_column, ground_truth_column)):
+            if output_entities is None:
+                all_unique.append(None if ground_truth_entities is None else set(ground_truth_entities))
+                unique_in_output.append("no_named_entities in Output")
+                unique_in_ground_truth.append(ground_truth_entities)
+            elif ground_truth_entities is None:
+                all_unique.append(set(output_entities))
+                unique_in_output.append(output_entities)
+                unique_in_ground_truth.append("no_named_entities in Ground_truth")
+            elif equal[i]:
+                all_unique.append(union[i])
+                unique_in_output.append("all_attested")
+                unique_in_ground_truth.append("all_attested")
+            else:
+                all_unique.append(union[i])
+                unique_in_output.append(output_unique[i] or "No_Unique_Entities in Output")
+                unique_in_ground_truth.append(ground_truth_unique[i] or "No_Unique_entities in Ground_truth")
+
+        return {'All_Unique_Entities': all_unique, 'Unique_In_Output': unique_in_output,
+                'Unique_in_Ground_Truth': unique_in_ground_truth}
+
     def calculate_overlap_pct(self, output_entities: list, ground_truth_entities: list) -> float:
         """
         Calculate the overlap percentage between output_entities and ground_truth_entities.
@@ -122,75 +452,573 @@ class TestFactualAccuracy:
         Returns:
         - float: Overlap percentage between the two sets of entities.
         """
-        model = SentenceTransformer('paraphrase-MiniLM-L6-v2')  # You can choose a different model
-
-        # Encode the entities into embeddings
-        output_embeddings = model.encode(output_entities, convert_to_tensor=True)
-        ground_truth_embeddings = model.encode(ground_truth_entities, convert_to_tensor=True)
+        output_entities = _as_list(output_entities)
+        ground_truth_entities = _as_list(ground_truth_entities)
 
         # Ensure both output and ground truth have the same number of vectors
-        assert len(output_embeddings) == len(ground_truth_embeddings), "Mismatch in the number of vectors."
+        assert len(output_entities) == len(ground_truth_entities), "Mismatch in the number of vectors."
 
-        # Calculate cosine similarity for each pair of vectors
-        similarity_scores = util.pytorch_cos_sim(output_embeddings, ground_truth_embeddings)
+        if self.similarity_backend is not None:
+            with self.metrics.stage('similarity'):
+                similarity_scores, rescored = self.similarity_backend.similarity_matrix_rescored(
+                    output_entities, ground_truth_entities)
+                average_similarity = float(similarity_scores.mean())
+            if rescored is not None:
+                self.metrics.count('cascade_rows_scored')
+                self.metrics.count('cascade_rows_rescored', int(rescored))
+        else:
+            # Encode the entities into unit-length embeddings
+            output_embeddings = self._encode(output_entities, normalize=True)
+            ground_truth_embeddings = self._encode(ground_truth_entities, normalize=True)
 
-        # Take the average similarity score across all pairs
-        average_similarity = similarity_scores.mean().item()
+            # Calculate cosine similarity for each pair of vectors and average it
+            with self.metrics.stage('similarity'):
+                similarity_scores = output_embeddings @ ground_truth_embeddings.T
+                average_similarity = float(similarity_scores.mean())
 
         # Convert similarity score to percentage rounded to two decimal places
         overlap_pct = round(average_similarity * 100, 2)
 
         return overlap_pct
 
+    def calculate_overlap_pct_batch(self, ground_truths, outputs, batch_size: int = 64) -> np.ndarray:
+        """
+        Calculate the overlap percentage of every Ground_Truth/Output pair in one encode pass.
+        Each distinct text is encoded once, in large batches, and the paired cosine similarity of all
+        rows is computed as a single vectorised operation. A configured similarity_backend (e.g. a lexical
+        or cascade backend) replaces the sentence-transformer.
+        Parameters:
+        - ground_truths (iterable): Ground truth texts, one per row.
+        - outputs (iterable): Output texts, aligned with ground_truths.
+        - batch_size (int): Number of texts encoded per forward pass.
+        Returns:
+        - ndarray: Overlap percentage per row, rounded to two decimal places.
+        """
+        return self._overlap_pct_batch(ground_truths, outputs, batch_size)[0]
+
+    def _overlap_pct_batch(self, ground_truths, outputs, batch_size: int = 64) -> tuple:
+        """
+        calculate_overlap_pct_batch, also returning which rows a cascade backend rescored.
+        Returns:
+        - tuple: (overlap percentage per row, boolean rescored mask or None for a single-stage backend).
+        """
+        ground_truths = [_as_text(text) for text in ground_truths]
+        outputs = [_as_text(text) for text in outputs]
+        assert len(ground_truths) == len(outputs), "Mismatch in the number of rows."
+        if not ground_truths:
+            return np.empty(0, dtype=np.float64), None
+
+        if self.similarity_backend is not None:
+            similarity, rescored = self._backend_score_pairs(ground_truths, outputs)
+            return np.round(similarity * 100, 2), rescored
+
+        # Encode each distinct text once; duplicated ground truths are common
+        unique_texts = list(dict.fromkeys(ground_truths + outputs))
+        embeddings = self._encode(unique_texts, batch_size=batch_size, normalize=True)
+        position = {text: i for i, text in enumerate(unique_texts)}
+        ground_truth_embeddings = embeddings[[position[text] for text in ground_truths]]
+        output_embeddings = embeddings[[position[text] for text in outputs]]
+
+        # Row-wise dot product of unit vectors is the paired cosine similarity
+        with self.metrics.stage('similarity'):
+            similarity = np.einsum('ij,ij->i', ground_truth_embeddings, output_embeddings).astype(np.float64)
+        return np.round(similarity * 100, 2), None
+
+    def _backend_score_pairs(self, ground_truths: list, outputs: list) -> tuple:
+        """
+        Score pairs with the similarity_backend, counting the rows a cascade backend rescored.
+        The counts go to self.metrics, so score_dataframe_parallel adds up those of its workers.
+        Returns:
+        - tuple: (similarity per pair, boolean rescored mask or None for a single-stage backend).
+        """
+        with self.metrics.stage('similarity'):
+            similarity, rescored = self.similarity_backend.score_pairs_rescored(ground_truths, outputs)
+        if rescored is not None:
+            self.metrics.count('cascade_rows_scored', len(rescored))
+            self.metrics.count('cascade_rows_rescored', int(rescored.sum()))
+        return similarity, rescored
+
     # Get file data into dataframe
     def read_data_from_file(self, file_path):
         try:
-            df = pd.read_excel(file_path)
+            with self.metrics.stage('read'):
+                df = pd.read_excel(file_path)
             return df
         except FileNotFoundError:
             print(f"File Not Found: {file_path}.")
             return None
 
-    def extract_data_from_file(self, file_path):
-        df = self.read_data_from_file(file_path)
-        if df is None:
-            print("No data found in the specified file. Exiting.")
-            return None
+    def score_dataframe(self, df: pd.DataFrame, batch_size: int = 256, n_process: int = 1,
+                        encode_batch_size: int = 64, align_threshold: float | None = None) -> pd.DataFrame:
+        """
+        Score every Ground_Truth/Output pair of the DataFrame.
+        Parameters:
+        - df (DataFrame): Data with 'Ground_Truth' and 'Output' columns.
+        - batch_size (int): Number of texts spaCy processes per batch.
+        - n_process (int): Number of worker processes spaCy uses for NER.
+        - encode_batch_size (int): Number of texts the embedding model encodes per forward pass.
+        - align_threshold (float): Also align entities by embedding similarity at this threshold, adding
+        'Soft_Recall' and 'Soft_Precision' columns. None skips alignment.
+        Returns:
+        - DataFrame: One result row per input row, sharing the input's index. With a CascadeBackend, an
+        'Overlap_Rescored' column marks the rows whose Overlap_PCT comes from the accurate backend.
+        """
+        # Run NER over whole columns instead of one document at a time
+        ground_truth_column = self.extract_named_entities_batch(df['Ground_Truth'], batch_size, n_process)
+        output_column = self.extract_named_entities_batch(df['Output'], batch_size, n_process)
 
         # Define a function to process each row
-        def process_row(row):
-            ground_truth_entities = self.extract_named_entities(row['Ground_Truth'])
-            output_entities = self.extract_named_entities(row['Output'])
+        def process_row(ground_truth_entities, output_entities):
             all_unique_entities = self.get_unique_entities(ground_truth_entities, output_entities)
             unique_in_output = self.get_unique_entities_in_output(output_entities, ground_truth_entities)
             unique_in_ground_truth = self.get_unique_entities_in_ground_truth(ground_truth_entities, output_entities)
-            result = self.check_factual_accuracy(output_entities, ground_truth_entities)
-            overlap_pct = self.calculate_overlap_pct(row['Ground_Truth'], row['Output'])
 
-            return pd.Series({
+            return {
                 'Ground_Truth_Entities': ground_truth_entities,
                 'Output_Entities': output_entities,
                 'All_Unique_Entities': all_unique_entities,
                 'Unique_In_Output': unique_in_output,
-                'Unique_in_Ground_Truth': unique_in_ground_truth,
-                'Result': result,
-                'Overlap_PCT': overlap_pct
-            })
+                'Unique_in_Ground_Truth': unique_in_ground_truth
+            }
+
+        # The legacy columns hold Python sets, and building them row by row is as fast as decoding
+        # them from the integer-ID comparison; compare_entity_columns(decode=False) skips them entirely
+        with self.metrics.stage('set_comparisons'):
+            rows = [process_row(*values) for values in zip(ground_truth_column, output_column)]
+            # object dtype keeps None as None; pandas would otherwise infer strings and turn it into NaN
+            result_df = pd.DataFrame(rows, index=df.index, columns=RESULT_COLUMNS, dtype=object)
+            result_df['Result'] = self.check_factual_accuracy_batch(output_column, ground_truth_column)
+        self.metrics.count('rows_scored', len(rows))
+
+        # Score semantic overlap for all rows in one batched encode pass
+        overlap_pct, rescored = self._overlap_pct_batch(df['Ground_Truth'], df['Output'], batch_size=encode_batch_size)
+        result_df['Overlap_PCT'] = overlap_pct
+        if rescored is not None:
+            # A cascade's two backends score on different scales
+            result_df['Overlap_Rescored'] = rescored
+
+        if align_threshold is not None:
+            alignments = self.align_entities_batch(output_column, ground_truth_column, align_threshold,
+                                                   batch_size=encode_batch_size)
+            result_df['Soft_Recall'] = [alignment.recall for alignment in alignments]
+            result_df['Soft_Precision'] = [alignment.precision for alignment in alignments]
+        return result_df
+
+    def score_table(self, df: pd.DataFrame, batch_size: int = 256, n_process: int = 1,
+                    encode_batch_size: int = 64) -> ResultTable:
+        """
+        Score every Ground_Truth/Output pair into a compact columnar ResultTable.
+        Same results as score_dataframe, but entities are interned integer IDs, the unique-entity outcomes are
+        EntityStatus codes and Result/Overlap_PCT are plain arrays, so no per-row sets or strings are built.
+        Parameters:
+        - df (DataFrame): Data with 'Ground_Truth' and 'Output' columns.
+        - batch_size (int): Number of texts spaCy processes per batch.
+        - n_process (int): Number of worker processes spaCy uses for NER.
+        - encode_batch_size (int): Number of texts the embedding model encodes per forward pass.
+        Returns:
+        - ResultTable: One result per input row; to_frame() gives the legacy DataFrame.
+        """
+        ground_truth_column = self.extract_named_entities_batch(df['Ground_Truth'], batch_size, n_process)
+        output_column = self.extract_named_entities_batch(df['Output'], batch_size, n_process)
+
+        with self.metrics.stage('set_comparisons'):
+            comparison = self.compare_entity_columns(output_column, ground_truth_column, decode=False)
+            result = self.check_factual_accuracy_batch(output_column, ground_truth_column)
+        self.metrics.count('rows_scored', len(df))
+
+        overlap_pct = self.calculate_overlap_pct_batch(df['Ground_Truth'], df['Output'], batch_size=encode_batch_size)
+        return ResultTable.from_comparison(comparison, result, overlap_pct, index=df.index)
+
+    def score_multi_reference(self, references, outputs, batch_size: int = 256, n_process: int = 1,
+                              encode_batch_size: int = 64) -> pd.DataFrame:
+        """
+        Score each output against several acceptable reference answers.
+        All references and outputs are embedded once; the similarity of every (reference, output) pair is
+        one vectorised row-wise product, reduced per row to max, mean and best reference. Entity coverage
+        is measured against the union of the references' entities.
+        Parameters:
+        - references (iterable): One list of reference texts per row (a single string counts as one reference,
+        a missing cell as none).
+        - outputs (iterable): Output texts, aligned with references.
+        - batch_size (int): Number of texts spaCy processes per batch.
+        - n_process (int): Number of worker processes spaCy uses for NER.
+        - encode_batch_size (int): Number of texts the embedding model encodes per forward pass.
+        Returns:
+        - DataFrame: Per row 'Reference_Count', 'Max_Overlap_PCT', 'Mean_Overlap_PCT', 'Best_Reference'
+        (position in the row's references, -1 if none), 'Reference_Entities', 'Output_Entities',
+        'Entity_Coverage' and 'Result' (every reference entity attested).
+        """
+        # A DataFrame column keeps its row labels in the result
+        index = outputs.index if hasattr(outputs, 'iloc') else None
+        reference_rows = [[] if is_missing(row) else [_as_text(text) for text in _as_list(row)] for row in references]
+        outputs = [_as_text(text) for text in outputs]
+        assert len(reference_rows) == len(outputs), "Mismatch in the number of rows."
+
+        counts = np.array([len(row) for row in reference_rows], dtype=np.int64)
+        starts = np.zeros(len(counts), dtype=np.int64)
+        np.cumsum(counts[:-1], out=starts[1:])
+        flat_references = [text for row in reference_rows for text in row]
+        row_of_reference = np.repeat(np.arange(len(counts)), counts)
+        paired_outputs = [outputs[row] for row in row_of_reference.tolist()]
+
+        # Similarity of every reference with its row's output, all rows at once
+        if not flat_references:
+            similarity = np.empty(0, dtype=np.float64)
+        elif self.similarity_backend is not None:
+            similarity = self._backend_score_pairs(flat_references, paired_outputs)[0]
+        else:
+            unique_texts = list(dict.fromkeys(flat_references + outputs))
+            embeddings = self._encode(unique_texts, batch_size=encode_batch_size, normalize=True)
+            position = {text: i for i, text in enumerate(unique_texts)}
+            with self.metrics.stage('similarity'):
+                similarity = np.einsum('ij,ij->i', embeddings[[position[text] for text in flat_references]],
+                                       embeddings[[position[text] for text in paired_outputs]]).astype(np.float64)
+
+        # Per-row reductions over the contiguous segment of each row's references
+        with self.metrics.stage('similarity'):
+            has_references = counts > 0
+            max_similarity = np.full(len(counts), np.nan)
+            mean_similarity = np.full(len(counts), np.nan)
+            best_reference = np.full(len(counts), -1, dtype=np.int64)
+            if len(flat_references):
+                segment_starts = starts[has_references]
+                max_similarity[has_references] = np.maximum.reduceat(similarity, segment_starts)
+                mean_similarity[has_references] = np.add.reduceat(similarity, segment_starts) / counts[has_references]
+                # Sorting by row, then by descending similarity, puts each row's best reference first
+                order = np.lexsort((-similarity, row_of_reference))
+                best_reference[has_references] = order[segment_starts] - segment_starts
+
+        # Entities of every distinct reference and output in one NER pass
+        unique_texts = list(dict.fromkeys(flat_references + outputs))
+        entity_sets = dict(zip(unique_texts, self.extract_named_entities_batch(unique_texts, batch_size, n_process)))
+        reference_entities = []
+        for row in reference_rows:
+            union = set().union(*(entity_sets[text] or () for text in row))
+            reference_entities.append(union or None)
+        output_entities = [entity_sets[text] for text in outputs]
+
+        with self.metrics.stage('set_comparisons'):
+            coverage = fact_coverage_batch(output_entities, reference_entities)
+            result = self.check_factual_accuracy_batch(output_entities, reference_entities)
+        self.metrics.count('rows_scored', len(outputs))
+
+        return pd.DataFrame({
+            'Reference_Count': counts,
+            'Max_Overlap_PCT': np.round(max_similarity * 100, 2),
+            'Mean_Overlap_PCT': np.round(mean_similarity * 100, 2),
+            'Best_Reference': best_reference,
+            'Reference_Entities': reference_entities,
+            'Output_Entities': output_entities,
+            'Entity_Coverage': coverage,
+            'Result': result
+        }, index=index)
+
+    def build_reference_index(self, references, directory, ann: str | None = None,
+                              batch_size: int = 64) -> ReferenceIndex:
+        """
+        Embed a corpus of references once into an on-disk index for nearest_references.
+        Parameters:
+        - references (iterable): Reference texts, e.g. every Ground_Truth of a corpus; positions become ids.
+        - directory (str): Where to write the index.
+        - ann (str): 'hnsw' to also build an approximate-search graph (needs hnswlib); None for exact search.
+        - batch_size (int): Number of texts encoded per forward pass.
+        Returns:
+        - ReferenceIndex: The memory-mapped index.
+        """
+        def embed(texts):
+            return self._encode(texts, batch_size=batch_size, normalize=True)
+
+        with self.metrics.stage('index'):
+            return ReferenceIndex.build(directory, [_as_text(text) for text in references], embed,
+                                        self._embedding_key(), batch_size=max(batch_size, 1024), ann=ann)
+
+    def nearest_references(self, outputs, index: ReferenceIndex, k: int = 5, batch_size: int = 64,
+                           exact: bool = False) -> pd.DataFrame:
+        """
+        Find the references in a whole corpus most similar to each output, not only the one on its row.
+        Outputs are embedded in one batched pass and searched together; the sentence-transformer is always
+        used, since the index holds its embeddings.
+        Parameters:
+        - outputs (iterable): Output texts.
+        - index (ReferenceIndex): Index built with the same embedding model, e.g. by build_reference_index.
+        - k (int): Number of references per output.
+        - batch_size (int): Number of texts encoded per forward pass.
+        - exact (bool): Scan every reference even if the index has an HNSW graph.
+        Returns:
+        - DataFrame: Per row 'Reference_Ids' and 'Reference_Similarity' (percentages), most similar first, and
+        the text and similarity of the nearest reference as 'Nearest_Reference' and 'Nearest_Similarity'.
+        """
+        if index.model != self._embedding_key():
+            raise ValueError(f"Reference index was built with {index.model}, not {self._embedding_key()}")
+        row_index = outputs.index if hasattr(outputs, 'iloc') else None
+        outputs = [_as_text(text) for text in outputs]
+
+        if outputs:
+            queries = self._encode(outputs, batch_size=batch_size, normalize=True)
+        else:
+            queries = np.empty((0, index.dim), dtype=np.float32)
+        with self.metrics.stage('search'):
+            scores, ids = index.search(queries, k=k, exact=exact)
+        similarity = np.round(scores.astype(np.float64) * 100, 2)
+
+        has_match = ids.shape[1] > 0
+        nearest_texts = index.texts(ids[:, 0]) if has_match else [None] * len(outputs)
+        return pd.DataFrame({
+            'Reference_Ids': ids.tolist(),
+            'Reference_Similarity': similarity.tolist(),
+            'Nearest_Reference': nearest_texts,
+            'Nearest_Similarity': similarity[:, 0] if has_match else np.full(len(outputs), np.nan)
+        }, index=row_index)
+
+    def model_versions(self) -> dict:
+        """
+        Identify the models that determine the scores, so stored results are only reused with the same models.
+        Returns:
+        - dict: spaCy pipeline (name and version), embedding model name, similarity backend with its settings,
+        and the long-document NER threshold.
+        """
+        backend = 'transformer' if self.similarity_backend is None else repr(self.similarity_backend)
+        return {'spacy': spacy_model_key(self.nlp), 'embedding': self._embedding_key(), 'similarity_backend': backend,
+                'long_document_chars': self.long_document_chars}
 
-        # Apply the processing function to each row
-        result_df = df.apply(process_row, axis=1)
+    def _embedding_key(self) -> str:
+        """
+        Name of the embeddings _encode produces: the model name, marked when long texts are chunk-pooled.
+        """
+        return long_text_model_key(self.model_name) if self.long_text_embeddings else self.model_name
+
+    def _entity_key(self) -> str:
+        """
+        Namespace of the entities _entity_texts produces: the spaCy pipeline, and the long-document
+        threshold and chunk size, since texts beyond the threshold are parsed in chunks.
+        """
+        return f"{spacy_model_key(self.nlp)}|long={self.long_document_chars}|chunk={DEFAULT_CHUNK_CHARS}"
+
+    def score_dataframe_incremental(self, df: pd.DataFrame, manifest: RunManifest, batch_size: int = 256,
+                                    n_process: int = 1, n_workers: int = 1) -> pd.DataFrame:
+        """
+        Score the DataFrame, reusing the results of previous runs for rows whose text has not changed.
+        Rows are matched by a hash of their Ground_Truth and Output text; only new or edited rows go through
+        NER and similarity, and their results are added to the manifest for the next run. If the manifest
+        was built with different models it is cleared first. The similarity backend must be batch independent,
+        since the changed rows are scored without the others.
+        Parameters:
+        - df (DataFrame): Data with 'Ground_Truth' and 'Output' columns.
+        - manifest (RunManifest): Results of previous runs.
+        - batch_size (int): Number of texts spaCy processes per batch.
+        - n_process (int): Number of worker processes spaCy uses for NER.
+        - n_workers (int): Number of processes scoring the changed rows in parallel; 1 scores in this process.
+        Returns:
+        - DataFrame: One result row per input row, sharing the input's index, with the same columns as
+        score_dataframe returns, including 'Overlap_Rescored' with a CascadeBackend.
+        """
+        require_batch_independent(self.similarity_backend, 'score_dataframe_incremental')
+        versions = self.model_versions()
+        if not manifest.is_compatible(versions):
+            manifest.reset(versions)
+
+        hashes = [row_hash(_as_text(ground_truth), _as_text(output))
+                  for ground_truth, output in zip(df['Ground_Truth'], df['Output'])]
+        results = manifest.lookup(hashes)
+
+        # One representative position per changed text pair; duplicated rows are scored once
+        changed = {key: i for i, (key, result) in enumerate(zip(hashes, results)) if result is None}
+        if changed:
+            changed_rows = df.iloc[list(changed.values())]
+            if n_workers == 1:
+                scored = self.score_dataframe(changed_rows, batch_size=batch_size, n_process=n_process)
+            else:
+                scored = self.score_dataframe_parallel(changed_rows, n_workers=n_workers, batch_size=batch_size)
+            computed = dict(zip(changed, scored.to_dict('records')))
+            manifest.record(list(computed), list(computed.values()))
+            results = [computed[key] if result is None else result for key, result in zip(hashes, results)]
+
+        self.metrics.count('rows_reused', len(hashes) - sum(1 for key in hashes if key in changed))
+        # Stored results keep score_dataframe's column order, and one manifest holds one backend's columns
+        columns = list(results[0]) if results else RESULT_COLUMNS
+        result_df = pd.DataFrame(results, index=df.index, columns=columns, dtype=object)
+        dtypes = {'Result': bool, 'Overlap_PCT': np.float64}
+        if 'Overlap_Rescored' in columns:
+            dtypes['Overlap_Rescored'] = bool
+        return result_df.astype(dtypes)
+
+    def score_dataframe_parallel(self, df: pd.DataFrame, n_workers: int | None = None, shard_size: int = 1000,
+                                 batch_size: int = 256, encode_batch_size: int = 64) -> pd.DataFrame:
+        """
+        Score the DataFrame on a pool of worker processes.
+        Each worker loads its own spaCy pipeline and embedding model once and scores whole shards;
+        results come back in the original row order and match score_dataframe. The similarity backend
+        must be batch independent, since each shard is scored without the others.
+        Parameters:
+        - df (DataFrame): Data with 'Ground_Truth' and 'Output' columns.
+        - n_workers (int): Number of worker processes. None uses every CPU.
+        - shard_size (int): Number of rows sent to a worker at a time.
+        - batch_size (int): Number of texts spaCy processes per batch.
+        - encode_batch_size (int): Number of texts the embedding model encodes per forward pass.
+        Returns:
+        - DataFrame: One result row per input row, sharing the input's index.
+        """
+        return score_dataframe_parallel(self, df, n_workers=n_workers, shard_size=shard_size,
+                                        batch_size=batch_size, encode_batch_size=encode_batch_size)
+
+    def extract_data_from_file(self, file_path, output_path=None, batch_size: int = 256, n_process: int = 1,
+                               n_workers: int = 1, metrics_path=None, profiler: str | None = None,
+                               profile_path=None, manifest_path=None, checkpoint_dir=None,
+                               shard_size: int = 10_000):
+        """
+        Read a file, score every row and optionally save the results.
+        Parameters:
+        - file_path (str): Excel file with 'Ground_Truth' and 'Output' columns.
+        - output_path (str): Where to save the results (.parquet, .arrow/.feather, .csv or .xlsx). None skips writing.
+        - batch_size (int): Number of texts spaCy processes per batch.
+        - n_process (int): Number of worker processes spaCy uses for NER.
+        - n_workers (int): Number of processes scoring shards in parallel; 1 scores in this process.
+        - metrics_path (str): Also write the per-stage timings and counters of the run to this JSON file; they
+        are printed at the end of the run either way.
+        - profiler (str): 'cprofile' or 'pyinstrument' to profile the run; None disables profiling.
+        - profile_path (str): Where the profiler saves its output; printed when not given.
+        - manifest_path (str): Run manifest (SQLite) of earlier runs; unchanged rows reuse their stored results.
+        - checkpoint_dir (str): Save each scored shard here as it completes; a rerun resumes after the last saved shard.
+        - shard_size (int): Number of rows per checkpointed shard.
+        Returns:
+        - DataFrame: The result columns, or None if the file could not be read.
+        """
+        if checkpoint_dir is not None:
+            require_batch_independent(self.similarity_backend, 'extract_data_from_file with checkpoint_dir')
+        self.metrics.reset()
+        with profile(profiler, profile_path):
+            df = self.read_data_from_file(file_path)
+            if df is None:
+                print("No data found in the specified file. Exiting.")
+                return None
 
-        # Concatenate the result with the original DataFrame
-        df = pd.concat([df, result_df], axis=1)
+            manifest = None if manifest_path is None else RunManifest(manifest_path)
+            try:
+                if checkpoint_dir is not None:
+                    checkpoint = Checkpoint(checkpoint_dir, file_path, shard_size, self.model_versions())
+                    shards = (df.iloc[start:start + shard_size] for start in range(0, len(df), shard_size))
+                    result_df = pd.concat(list(self._score_checkpointed(shards, checkpoint, manifest, batch_size,
+                                                                        n_process, n_workers)))
+                else:
+                    result_df = self._score_chunk(df, manifest, batch_size, n_process, n_workers)
+            finally:
+                if manifest is not None:
+                    manifest.close()
 
-        # Save the modified dataframe to a new CSV file
-        df.to_excel(r"C:\Users\VishalChaurasiya(Ann\Downloads\L_D_Fluency_Validation_Results (2).xlsx", index=False)
+            # Concatenate the result with the original DataFrame
+            df = pd.concat([df, result_df], axis=1)
+
+            # Save the modified dataframe; entity sets become native list columns in Parquet/Arrow
+            if output_path is not None:
+                with self.metrics.stage('write'):
+                    write_results(df, output_path)
+
+        self._report_metrics(metrics_path)
 
         # Return the desired columns
-        return df[
-            ["Ground_Truth_Entities", "Output_Entities", "All_Unique_Entities", "Unique_In_Output",
-             "Unique_in_Ground_Truth",
-             "Result", "Similarity_PCT"]]
+        return df[RESULT_COLUMNS]
+
+    def evaluate_streaming(self, input_path, output_path, chunk_size: int = 10_000, batch_size: int = 256,
+                           n_process: int = 1, metrics_path=None, profiler: str | None = None,
+                           profile_path=None, manifest_path=None, checkpoint_dir=None) -> int:
+        """
+        Score a file that may not fit in memory, one chunk at a time.
+        Each chunk is read (CSV, Parquet or Excel), scored and appended to the output before the next one
+        is read, so peak memory depends on chunk_size rather than file size.
+        Parameters:
+        - input_path (str): File with 'Ground_Truth' and 'Output' columns.
+        - output_path (str): Destination .parquet, .arrow/.feather, .csv or .xlsx file for input and result columns.
+        - chunk_size (int): Number of rows read and scored at a time.
+        - batch_size (int): Number of texts spaCy processes per batch.
+        - n_process (int): Number of worker processes spaCy uses for NER.
+        - metrics_path (str): Also write the per-stage timings and counters of the run to this JSON file; they
+        are printed at the end of the run either way.
+        - profiler (str): 'cprofile' or 'pyinstrument' to profile the run; None disables profiling.
+        - profile_path (str): Where the profiler saves its output; printed when not given.
+        - manifest_path (str): Run manifest (SQLite) of earlier runs; unchanged rows reuse their stored results.
+        - checkpoint_dir (str): Save each scored chunk here as it completes; a rerun rewrites the saved chunks
+        to the output and resumes after the last one.
+        Returns:
+        - int: Number of rows written.
+        """
+        require_batch_independent(self.similarity_backend, 'evaluate_streaming')
+        self.metrics.reset()
+        manifest = None if manifest_path is None else RunManifest(manifest_path)
+        try:
+            with profile(profiler, profile_path), open_chunk_writer(output_path) as writer:
+                chunks = self._timed_chunks(iter_chunks(input_path, chunk_size))
+                if checkpoint_dir is not None:
+                    checkpoint = Checkpoint(checkpoint_dir, input_path, chunk_size, self.model_versions(),
+                                            with_input=True)
+                    scored = self._score_checkpointed(chunks, checkpoint, manifest, batch_size, n_process)
+                else:
+                    scored = (pd.concat([chunk, self._score_chunk(chunk, manifest, batch_size, n_process)], axis=1)
+                              for chunk in chunks)
+                for result_df in scored:
+                    with self.metrics.stage('write'):
+                        writer.write(result_df)
+        finally:
+            if manifest is not None:
+                manifest.close()
+
+        self._report_metrics(metrics_path)
+        return writer.rows_written
+
+    def _score_chunk(self, df: pd.DataFrame, manifest: RunManifest | None, batch_size: int, n_process: int,
+                     n_workers: int = 1) -> pd.DataFrame:
+        """
+        Score one frame, reusing stored results when a run manifest is given.
+        """
+        if manifest is not None:
+            return self.score_dataframe_incremental(df, manifest, batch_size=batch_size, n_process=n_process,
+                                                    n_workers=n_workers)
+        if n_workers == 1:
+            return self.score_dataframe(df, batch_size=batch_size, n_process=n_process)
+        return self.score_dataframe_parallel(df, n_workers=n_workers, batch_size=batch_size)
+
+    def _score_checkpointed(self, chunks, checkpoint: Checkpoint, manifest: RunManifest | None, batch_size: int,
+                            n_process: int, n_workers: int = 1):
+        """
+        Yield the results of each chunk, loading shards the checkpoint already holds and scoring and saving the rest.
+        Chunks before the resume point are still read, so the input stays in step, but are not scored.
+        Saved shards include the input columns when the checkpoint was opened with with_input.
+        """
+        resumed = checkpoint.completed_shards
+        if resumed:
+            logger.info("Resuming from checkpoint: %d shards (%d rows) already scored.", resumed, checkpoint.rows_done)
+        for index, chunk in enumerate(chunks):
+            if index < resumed:
+                self.metrics.count('rows_resumed', len(chunk))
+                yield checkpoint.load_shard(index)
+                continue
+
+            result_df = self._score_chunk(chunk, manifest, batch_size, n_process, n_workers)
+            if checkpoint.with_input:
+                result_df = pd.concat([chunk, result_df], axis=1)
+            with self.metrics.stage('checkpoint'):
+                checkpoint.save_shard(index, result_df)
+            yield result_df
+        checkpoint.mark_complete()
+
+    def _timed_chunks(self, chunks):
+        """
+        Yield chunks from a reader, timing each read under the 'read' stage.
+        """
+        chunks = iter(chunks)
+        while True:
+            with self.metrics.stage('read'):
+                chunk = next(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    def _report_metrics(self, metrics_path=None):
+        """
+        Print the per-stage summary of the run, as the profiler prints its report, and optionally save it as JSON.
+        """
+        print(f"Per-stage timings:\n{self.metrics.report()}")
+        if metrics_path is not None:
+            self.metrics.dump_json(metrics_path)
 
     def zast_comment(self):
         '''
@@ -0,0 +1,162 @@
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional
+
+
+class Metrics:
+    """
+    Per-stage timers and counters for a scoring run.
+
+    Stages are timed with the stage() context manager; counters record how much work each stage did
+    (texts parsed, texts embedded, rows compared, ...). Snapshots from worker processes can be merged in.
+    Stages may nest (e.g. 'embedding' inside 'alignment'): each stage keeps its total time, which includes
+    its nested stages, and its self time, which does not, so self times add up without double counting.
+    """
+
+    def __init__(self):
+        self._stages = {}
+        self.counters = Counter()
+        self._lock = threading.Lock()
+        # Per-thread stack with the time spent in nested stages of each open stage
+        self._local = threading.local()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time the enclosed block and add it to the named stage.
+        Parameters:
+        - name (str): Stage name, e.g. 'ner', 'embedding', 'similarity', 'set_comparisons', 'read', 'write'.
+        """
+        stack = self._local.__dict__.setdefault('stack', [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self._record(name, 1, elapsed, elapsed - nested)
+
+    def count(self, name: str, amount: int = 1):
+        """
+        Increase a counter.
+        """
+        with self._lock:
+            self.counters[name] += amount
+
+    def snapshot(self) -> dict:
+        """
+        Return the raw timings and counters in a picklable form that merge() accepts.
+        """
+        with self._lock:
+            return {'stages': {name: list(values) for name, values in self._stages.items()},
+                    'counters': dict(self.counters)}
+
+    def merge(self, snapshot: dict):
+        """
+        Add the timings and counters of another snapshot, e.g. from a worker process.
+        """
+        for name, (calls, total, longest, self_total) in snapshot['stages'].items():
+            self._record(name, calls, total, self_total, longest)
+        with self._lock:
+            self.counters.update(snapshot['counters'])
+
+    def reset(self):
+        """
+        Forget every timing and counter.
+        """
+        with self._lock:
+            self._stages.clear()
+            self.counters.clear()
+
+    def summary(self) -> dict:
+        """
+        Summarise the run.
+        Returns:
+        - dict: For each stage its calls, total and self seconds, mean and max milliseconds; plus the counters.
+        """
+        with self._lock:
+            stages = {
+                name: {'calls': calls, 'total_s': round(total, 6), 'self_s': round(self_total, 6),
+                       'mean_ms': round(total / calls * 1000, 3), 'max_ms': round(longest * 1000, 3)}
+                for name, (calls, total, longest, self_total) in self._stages.items()
+            }
+            return {'stages': stages, 'counters': dict(self.counters)}
+
+    def report(self) -> str:
+        """
+        Format the summary as a plain-text table, stage with the most self time first.
+        """
+        summary = self.summary()
+        lines = [f"{'stage':<18}{'calls':>8}{'total s':>12}{'self s':>12}{'mean ms':>12}{'max ms':>12}"]
+        for name, stage in sorted(summary['stages'].items(), key=lambda item: -item[1]['self_s']):
+            lines.append(f"{name:<18}{stage['calls']:>8}{stage['total_s']:>12.3f}{stage['self_s']:>12.3f}"
+                         f"{stage['mean_ms']:>12.3f}{stage['max_ms']:>12.3f}")
+        for name, value in sorted(summary['counters'].items()):
+            lines.append(f"{name:<18}{value:>8}")
+        return "\n".join(lines)
+
+    def dump_json(self, path):
+        """
+        Write the summary to a JSON file.
+        """
+        with open(path, 'w') as handle:
+            json.dump(self.summary(), handle, indent=2)
+
+    def _record(self, name: str, calls: int, total: float, self_total: float, longest: Optional[float] = None):
+        with self._lock:
+            stage = self._stages.setdefault(name, [0, 0.0, 0.0, 0.0])
+            stage[0] += calls
+            stage[1] += total
+            stage[2] = max(stage[2], total if longest is None else longest)
+            stage[3] += self_total
+
+
+@contextmanager
+def profile(profiler: Optional[str] = None, output_path: Optional[str] = None):
+    """
+    Profile the enclosed block.
+    Parameters:
+    - profiler (str): 'cprofile', 'pyinstrument', or None to do nothing.
+    - output_path (str): Where to save the profile (pstats for cProfile, HTML for pyinstrument); printed if None.
+    """
+    if profiler is None:
+        yield
+        return
+
+    if profiler == 'cprofile':
+        import cProfile
+        import pstats
+
+        profile_run = cProfile.Profile()
+        profile_run.enable()
+        try:
+            yield
+        finally:
+            profile_run.disable()
+            if output_path is not None:
+                profile_run.dump_stats(output_path)
+            else:
+                pstats.Stats(profile_run).sort_stats('cumulative').print_stats(25)
+    elif profiler == 'pyinstrument':
+        # Optional dependency, only needed when this profiler is requested
+        from pyinstrument import Profiler
+
+        profile_run = Profiler()
+        profile_run.start()
+        try:
+            yield
+        finally:
+            profile_run.stop()
+            if output_path is not None:
+                with open(output_path, 'w') as handle:
+                    handle.write(profile_run.output_html())
+            else:
+                print(profile_run.output_text())
+    else:
+        raise ValueError(f"Unknown profiler: {profiler}")
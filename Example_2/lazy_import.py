@@ -0,0 +1,34 @@
+import importlib
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is only imported when one of its attributes is first used.
+
+    Lets heavy dependencies (spaCy, pandas, scikit-learn) stay out of module import time, so importing
+    the scorer for autodoc, test collection or a CLI that never scores anything stays fast.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Return a lazily imported module, e.g. ``pd = lazy_import("pandas")``.
+    Parameters:
+    - name (str): Absolute module name.
+    Returns:
+    - LazyModule: Proxy that imports the module on first attribute access.
+    """
+    return LazyModule(name)
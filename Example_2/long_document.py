@@ -0,0 +1,102 @@
+import re
+from typing import Iterator, List, NamedTuple, Tuple
+
+# Texts longer than this are split into chunks before NER
+LONG_DOCUMENT_CHARS = 100_000
+DEFAULT_CHUNK_CHARS = 20_000
+# Chunks cut inside a sentence overlap the next chunk by this much, so an entity on the cut is seen whole
+DEFAULT_OVERLAP_CHARS = 200
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*\s+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class Entity(NamedTuple):
+    """
+    A named entity with its character offsets in the full document.
+    """
+    text: str
+    start: int
+    end: int
+    label: str
+
+
+def _last_boundary(pattern, text: str, start: int, end: int) -> int:
+    """
+    Position just after the last match of pattern in text[start:end], or -1 if there is none.
+    """
+    boundary = -1
+    for match in pattern.finditer(text, start, end):
+        boundary = match.end()
+    return boundary if boundary > start else -1
+
+
+def iter_chunk_spans(text: str, max_chars: int = DEFAULT_CHUNK_CHARS,
+                     overlap: int = DEFAULT_OVERLAP_CHARS) -> Iterator[Tuple[int, int, int]]:
+    """
+    Split text into chunks of at most max_chars, preferring paragraph, then sentence, then word boundaries.
+    Parameters:
+    - text (str): The document.
+    - max_chars (int): Largest chunk length.
+    - overlap (int): Characters shared with the next chunk when a chunk has to be cut inside a sentence.
+    Returns:
+    - iterator: (start, end, owned_end) per chunk. Entities starting before owned_end belong to this chunk; later ones are left to the next chunk, which also covers them.
+    """
+    overlap = min(overlap, max_chars // 2)
+    position = 0
+    while position < len(text):
+        limit = position + max_chars
+        if limit >= len(text):
+            yield position, len(text), len(text)
+            return
+
+        end = _last_boundary(_PARAGRAPH_BREAK, text, position, limit)
+        if end == -1:
+            end = _last_boundary(_SENTENCE_END, text, position, limit)
+        if end != -1:
+            yield position, end, end
+            position = end
+            continue
+
+        # No paragraph or sentence end in reach: cut at a space (or anywhere) and overlap the next chunk
+        end = _last_boundary(_WHITESPACE, text, position + overlap + 1, limit)
+        if end == -1:
+            end = limit
+        # Start the next chunk on a word boundary inside the overlap, not in the middle of a word
+        word_start = _WHITESPACE.search(text, end - overlap, end)
+        next_position = word_start.end() if word_start and word_start.end() < end else end - overlap
+        yield position, end, next_position
+        position = next_position
+
+
+def extract_entities_chunked(nlp, text: str, max_chars: int = DEFAULT_CHUNK_CHARS,
+                             overlap: int = DEFAULT_OVERLAP_CHARS, batch_size: int = 16,
+                             disable: List[str] = ()) -> List[Entity]:
+    """
+    Run NER over a document of any length, one bounded chunk at a time.
+    Chunks are streamed through nlp.pipe and only the entities are kept, so peak memory depends on
+    max_chars rather than on the document length, and spaCy's max_length is never exceeded.
+    Parameters:
+    - nlp (Language): The spaCy pipeline.
+    - text (str): The document.
+    - max_chars (int): Largest chunk passed to spaCy.
+    - overlap (int): Characters shared by chunks that had to be cut inside a sentence.
+    - batch_size (int): Number of chunks spaCy processes per batch.
+    - disable (list): Pipeline components to skip.
+    Returns:
+    - list: Entity tuples with offsets into text, in document order, without duplicates.
+    """
+    chunks = ((text[start:end], (start, owned_end)) for start, end, owned_end in iter_chunk_spans(text, max_chars,
+                                                                                                  overlap))
+    entities = []
+    seen = set()
+    for doc, (offset, owned_end) in nlp.pipe(chunks, as_tuples=True, batch_size=batch_size, disable=disable):
+        for ent in doc.ents:
+            start = offset + ent.start_char
+            key = (start, offset + ent.end_char, ent.label_)
+            if start >= owned_end or key in seen:
+                continue
+            seen.add(key)
+            entities.append(Entity(ent.text, key[0], key[1], key[2]))
+    return entities
@@ -0,0 +1,67 @@
+from __future__ import annotations
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from lazy_import import lazy_import
+from similarity_backends import require_batch_independent
+
+pd = lazy_import("pandas")
+
+# Scorer owned by the current worker process, created once by _init_worker
+_worker_scorer = None
+
+
+def _init_worker(config: dict):
+    """
+    Build this worker's scorer and load its models once per process, not per shard.
+    The embedding model is only loaded when the scorer uses it (no similarity_backend configured).
+    """
+    global _worker_scorer
+    from factual_accuracy import TestFactualAccuracy
+
+    _worker_scorer = TestFactualAccuracy.from_config(config)
+    _worker_scorer.warm_up()
+
+
+def _score_shard(shard: pd.DataFrame, options: dict):
+    # Send this shard's timings back with the result so the parent can report the whole run
+    _worker_scorer.metrics.reset()
+    result_df = _worker_scorer.score_dataframe(shard, **options)
+    return result_df, _worker_scorer.metrics.snapshot()
+
+
+def score_dataframe_parallel(scorer, df: pd.DataFrame, n_workers: Optional[int] = None, shard_size: int = 1000,
+                             batch_size: int = 256, encode_batch_size: int = 64) -> pd.DataFrame:
+    """
+    Score a DataFrame on several processes and reassemble the results in the original row order.
+    Every worker scores its shards exactly like score_dataframe does, so the output matches the serial path
+    as long as the scorer's similarity backend is batch independent; a backend that is not, such as an
+    unfitted LexicalBackend('tfidf'), is refused.
+    Parameters:
+    - scorer (TestFactualAccuracy): Scorer whose configuration the workers copy.
+    - df (DataFrame): Data with 'Ground_Truth' and 'Output' columns.
+    - n_workers (int): Number of worker processes. None uses every CPU.
+    - shard_size (int): Number of rows sent to a worker at a time.
+    - batch_size (int): Number of texts spaCy processes per batch inside a worker.
+    - encode_batch_size (int): Number of texts the embedding model encodes per forward pass.
+    Returns:
+    - DataFrame: One result row per input row, sharing the input's index.
+    """
+    require_batch_independent(scorer.similarity_backend, 'score_dataframe_parallel')
+    n_workers = n_workers or os.cpu_count() or 1
+    shards = [df.iloc[start:start + shard_size] for start in range(0, len(df), shard_size)]
+    if not shards:
+        return scorer.score_dataframe(df, batch_size=batch_size, encode_batch_size=encode_batch_size)
+
+    options = {'batch_size': batch_size, 'n_process': 1, 'encode_batch_size': encode_batch_size}
+    # spawn keeps workers independent of any torch or spaCy state already loaded in the parent
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(n_workers, len(shards)), mp_context=context,
+                             initializer=_init_worker, initargs=(scorer.config(),)) as executor:
+        # map yields results in submission order, whichever worker finishes first
+        results = []
+        for result_df, snapshot in executor.map(_score_shard, shards, [options] * len(shards)):
+            results.append(result_df)
+            scorer.metrics.merge(snapshot)
+    return pd.concat(results)
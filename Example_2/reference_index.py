@@ -0,0 +1,212 @@
+from __future__ import annotations
+import json
+import os
+from typing import Callable, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Bump when the files of an index change layout, so older indexes are rebuilt rather than misread
+INDEX_FORMAT = 1
+EMBEDDINGS_NAME = "embeddings.npy"
+OFFSETS_NAME = "offsets.npy"
+TEXTS_NAME = "references.jsonl"
+HNSW_NAME = "hnsw.bin"
+META_NAME = "meta.json"
+# Rows of the embedding matrix multiplied per block, bounding the memory of an exact search
+DEFAULT_BLOCK_ROWS = 16_384
+# Queries scored together per block; with DEFAULT_BLOCK_ROWS this is a 64 MB float32 score matrix
+QUERY_BATCH_ROWS = 1024
+
+
+def _merge_top_k(scores: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep the k highest scores of each row, unordered, with their ids.
+    """
+    if scores.shape[1] <= k:
+        return scores, ids
+    keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(scores, keep, axis=1), np.take_along_axis(ids, keep, axis=1)
+
+
+def blocked_top_k(matrix: np.ndarray, queries: np.ndarray, k: int,
+                  block_rows: int = DEFAULT_BLOCK_ROWS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact top-k inner-product search that reads the matrix one block of rows at a time.
+    Works on a memory-mapped matrix without loading it: only one block is paged in at a time.
+    Parameters:
+    - matrix (ndarray): Reference vectors, one per row (may be a np.memmap).
+    - queries (ndarray): Query vectors, one per row.
+    - k (int): Number of neighbours per query.
+    - block_rows (int): Matrix rows multiplied per block.
+    Returns:
+    - tuple: (scores, ids), both of shape (len(queries), min(k, len(matrix))), most similar first.
+    """
+    queries = np.asarray(queries, dtype=np.float32)
+    k = min(k, len(matrix))
+    best_scores = np.empty((len(queries), 0), dtype=np.float32)
+    best_ids = np.empty((len(queries), 0), dtype=np.int64)
+    if k == 0:
+        return best_scores, best_ids
+
+    for start in range(0, len(matrix), block_rows):
+        block = np.asarray(matrix[start:start + block_rows], dtype=np.float32)
+        scores = queries @ block.T
+        ids = np.broadcast_to(np.arange(start, start + len(block), dtype=np.int64), scores.shape)
+        scores, ids = _merge_top_k(scores, ids, k)
+        best_scores, best_ids = _merge_top_k(np.hstack((best_scores, scores)), np.hstack((best_ids, ids)), k)
+
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    return np.take_along_axis(best_scores, order, axis=1), np.take_along_axis(best_ids, order, axis=1)
+
+
+class ReferenceIndex:
+    """
+    Prebuilt index of reference (ground truth) embeddings for corpus-wide nearest-reference lookup.
+
+    A directory holds the unit-length float32 embeddings as a .npy matrix, the reference texts as
+    JSON lines with an offset table, and meta.json naming the embedding model. Opening an index
+    memory-maps the matrix and the offsets, so load time does not grow with the corpus; rows are
+    paged in by the searches that touch them. An optional HNSW graph (hnswlib) gives approximate
+    search without scanning the matrix.
+    """
+
+    def __init__(self, directory, use_ann: bool = True):
+        """
+        Parameters:
+        - directory (str): Directory written by ReferenceIndex.build.
+        - use_ann (bool): Load the HNSW graph if the index has one; False always searches exactly.
+        """
+        self.directory = str(directory)
+        with open(os.path.join(self.directory, META_NAME), encoding="utf-8") as file:
+            self.meta = json.load(file)
+        if self.meta.get('format') != INDEX_FORMAT:
+            raise ValueError(f"Unsupported reference index format in {self.directory}; rebuild the index")
+
+        self.embeddings = np.load(os.path.join(self.directory, EMBEDDINGS_NAME), mmap_mode='r')
+        self._offsets = np.load(os.path.join(self.directory, OFFSETS_NAME), mmap_mode='r')
+        self._ann = None
+        if use_ann and self.meta.get('ann') == 'hnsw':
+            import hnswlib
+            self._ann = hnswlib.Index(space='ip', dim=self.dim)
+            self._ann.load_index(os.path.join(self.directory, HNSW_NAME), max_elements=len(self))
+
+    @classmethod
+    def build(cls, directory, references: Sequence[str], embed_fn: Callable[[List[str]], np.ndarray], model: str,
+              batch_size: int = 1024, ann: Optional[str] = None, hnsw_m: int = 16,
+              ef_construction: int = 200) -> 'ReferenceIndex':
+        """
+        Embed every reference once and write the index to a directory.
+        References are embedded and written batch by batch straight into the memory-mapped matrix.
+        Parameters:
+        - directory (str): Where to write the index; created if missing.
+        - references (sequence): Reference texts; their positions are the ids returned by searches.
+        - embed_fn (callable): Returns one unit-length embedding per text.
+        - model (str): Name of the embedding model, checked by queries.
+        - batch_size (int): Number of references embedded at a time.
+        - ann (str): 'hnsw' to also build an HNSW graph with hnswlib; None for exact search only.
+        - hnsw_m (int): Links per node of the HNSW graph.
+        - ef_construction (int): Candidate list size while building the HNSW graph.
+        Returns:
+        - ReferenceIndex: The index, opened from the written files.
+        """
+        if ann not in (None, 'hnsw'):
+            raise ValueError(f"Unknown ANN structure: {ann}")
+        directory = str(directory)
+        os.makedirs(directory, exist_ok=True)
+        references = ["" if text is None else str(text) for text in references]
+
+        embeddings = None
+        graph = None
+        offsets = np.empty(len(references) + 1, dtype=np.int64)
+        offsets[0] = 0
+        with open(os.path.join(directory, TEXTS_NAME), "wb") as texts_file:
+            for start in range(0, len(references), batch_size):
+                batch = references[start:start + batch_size]
+                vectors = np.asarray(embed_fn(batch), dtype=np.float32)
+                if embeddings is None:
+                    embeddings = np.lib.format.open_memmap(os.path.join(directory, EMBEDDINGS_NAME), mode='w+',
+                                                           dtype=np.float32, shape=(len(references),
+                                                                                    vectors.shape[1]))
+                    if ann == 'hnsw':
+                        import hnswlib
+                        graph = hnswlib.Index(space='ip', dim=vectors.shape[1])
+                        graph.init_index(max_elements=len(references), ef_construction=ef_construction, M=hnsw_m)
+                embeddings[start:start + len(batch)] = vectors
+                if graph is not None:
+                    graph.add_items(vectors, np.arange(start, start + len(batch)))
+
+                for position, text in enumerate(batch, start + 1):
+                    line = (json.dumps(text) + "\n").encode("utf-8")
+                    texts_file.write(line)
+                    offsets[position] = offsets[position - 1] + len(line)
+
+        if embeddings is None:
+            embeddings = np.lib.format.open_memmap(os.path.join(directory, EMBEDDINGS_NAME), mode='w+',
+                                                   dtype=np.float32, shape=(0, 0))
+        dim = embeddings.shape[1]
+        embeddings.flush()
+        del embeddings
+        np.save(os.path.join(directory, OFFSETS_NAME), offsets)
+        if graph is not None:
+            graph.save_index(os.path.join(directory, HNSW_NAME))
+
+        meta = {'format': INDEX_FORMAT, 'model': model, 'count': len(references), 'dim': dim,
+                'ann': ann if graph is not None else None}
+        with open(os.path.join(directory, META_NAME), "w", encoding="utf-8") as file:
+            json.dump(meta, file, indent=2)
+        return cls(directory)
+
+    def __len__(self) -> int:
+        return self.meta['count']
+
+    @property
+    def dim(self) -> int:
+        """
+        Length of the embedding vectors.
+        """
+        return self.meta['dim']
+
+    @property
+    def model(self) -> str:
+        """
+        Name of the embedding model the references were embedded with.
+        """
+        return self.meta['model']
+
+    def search(self, queries: np.ndarray, k: int = 5, exact: bool = False, ef: int = 64,
+               block_rows: int = DEFAULT_BLOCK_ROWS) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k references most similar to each query.
+        Parameters:
+        - queries (ndarray): Unit-length query embeddings, one per row, from the index's model.
+        - k (int): Number of references per query.
+        - exact (bool): Scan the whole matrix even if an HNSW graph is loaded.
+        - ef (int): HNSW search breadth; raised to k when smaller.
+        - block_rows (int): Matrix rows multiplied per block in an exact search.
+        Returns:
+        - tuple: (scores, ids) of shape (len(queries), min(k, len(index))), cosine similarity, most similar first.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = min(k, len(self))
+        if k == 0 or not len(queries):
+            return np.empty((len(queries), 0), dtype=np.float32), np.empty((len(queries), 0), dtype=np.int64)
+
+        if self._ann is not None and not exact:
+            self._ann.set_ef(max(ef, k))
+            ids, distances = self._ann.knn_query(queries, k=k)
+            # hnswlib's inner-product distance is 1 - similarity
+            return (1 - distances).astype(np.float32), ids.astype(np.int64)
+
+        results = [blocked_top_k(self.embeddings, queries[start:start + QUERY_BATCH_ROWS], k, block_rows)
+                   for start in range(0, len(queries), QUERY_BATCH_ROWS)]
+        return np.vstack([scores for scores, _ in results]), np.vstack([ids for _, ids in results])
+
+    def texts(self, ids) -> List[str]:
+        """
+        Read reference texts by id, seeking to each one rather than loading the whole file.
+        """
+        texts = []
+        with open(os.path.join(self.directory, TEXTS_NAME), "rb") as file:
+            for reference_id in np.asarray(ids, dtype=np.int64).ravel().tolist():
+                file.seek(int(self._offsets[reference_id]))
+                texts.append(json.loads(file.readline()))
+        return texts
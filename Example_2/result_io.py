@@ -0,0 +1,311 @@
+from __future__ import annotations
+import json
+import os
+from typing import Iterator, List
+from lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+
+CSV_SUFFIXES = ('.csv',)
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+EXCEL_SUFFIXES = ('.xlsx', '.xlsm')
+ARROW_SUFFIXES = ('.arrow', '.feather')
+
+# Result columns holding entity collections, written as native list<string> columns
+ENTITY_COLUMNS = ("Ground_Truth_Entities", "Output_Entities", "All_Unique_Entities", "Unique_In_Output",
+                  "Unique_in_Ground_Truth")
+# Entity columns that may hold a sentinel string instead of entities; the sentinel goes to '<column>_Status'
+STATUS_COLUMNS = ("Unique_In_Output", "Unique_in_Ground_Truth")
+
+
+def _suffix(file_path) -> str:
+    return os.path.splitext(str(file_path))[1].lower()
+
+
+def iter_chunks(file_path, chunk_size: int = 10_000) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV, Parquet or Excel file as a sequence of DataFrames of at most chunk_size rows.
+    Only one chunk is held in memory at a time. Chunks carry a running index, so row labels
+    match what reading the whole file at once would give.
+    Parameters:
+    - file_path (str): Path of the input file.
+    - chunk_size (int): Maximum number of rows per chunk.
+    Returns:
+    - iterator: DataFrames in file order.
+    """
+    suffix = _suffix(file_path)
+    if suffix in CSV_SUFFIXES:
+        yield from pd.read_csv(file_path, chunksize=chunk_size)
+    elif suffix in PARQUET_SUFFIXES:
+        yield from _iter_parquet(file_path, chunk_size)
+    elif suffix in EXCEL_SUFFIXES:
+        yield from _iter_excel(file_path, chunk_size)
+    else:
+        raise ValueError(f"Unsupported input format: {file_path}")
+
+
+def _iter_parquet(file_path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    import pyarrow.parquet as pq
+
+    start = 0
+    for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size):
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+
+
+def _iter_excel(file_path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    # read_only mode streams rows from the sheet XML instead of building every cell object up front
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        start = 0
+        buffer: List[tuple] = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) == chunk_size:
+                yield pd.DataFrame(buffer, columns=header, index=pd.RangeIndex(start, start + len(buffer)))
+                start += len(buffer)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=header, index=pd.RangeIndex(start, start + len(buffer)))
+    finally:
+        workbook.close()
+
+
+def to_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert result columns to types columnar formats store natively.
+    Entity sets become sorted lists (None stays None). Sentinel strings such as "all_attested" are moved
+    to a '<column>_Status' column, leaving the entity column null for that row.
+    Parameters:
+    - df (DataFrame): Frame that may contain result columns.
+    Returns:
+    - DataFrame: A converted copy; other columns are unchanged.
+    """
+    df = df.copy()
+    for column in ENTITY_COLUMNS:
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if column in STATUS_COLUMNS:
+            df[f"{column}_Status"] = values.map(lambda value: value if isinstance(value, str) else None)
+        df[column] = values.map(_entity_list)
+    return df
+
+
+def _entity_list(value):
+    # Missing entities may arrive as None, NaN or pd.NA, e.g. from a column pandas inferred as strings
+    if isinstance(value, str) or is_missing(value):
+        return None
+    return sorted(value)
+
+
+def _text_cells(df: pd.DataFrame) -> pd.DataFrame:
+    # Formats without a list type (CSV, Excel) get entity lists as JSON arrays
+    df = to_columnar(df)
+    for column in ENTITY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].map(lambda value: None if value is None else json.dumps(value))
+    return df
+
+
+def _arrow_table(df: pd.DataFrame, schema=None):
+    import pyarrow as pa
+
+    df = to_columnar(df)
+    if schema is None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        fields = []
+        for field in table.schema:
+            if field.name in ENTITY_COLUMNS:
+                field = field.with_type(pa.list_(pa.string()))
+            elif pa.types.is_null(field.type):
+                # Columns that are all-null in the first chunk would otherwise be typed as null
+                field = field.with_type(pa.string())
+            fields.append(field)
+        schema = pa.schema(fields)
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+class CsvChunkWriter:
+    """
+    Append DataFrame chunks to a CSV file, writing the header once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows_written = 0
+
+    def write(self, df: pd.DataFrame):
+        """
+        Append one chunk.
+        """
+        _text_cells(df).to_csv(self.path, mode='w' if self.rows_written == 0 else 'a', header=self.rows_written == 0,
+                               index=False)
+        self.rows_written += len(df)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ParquetChunkWriter:
+    """
+    Append DataFrame chunks to a Parquet file as row groups; the schema is fixed by the first chunk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows_written = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, df: pd.DataFrame):
+        """
+        Append one chunk as a new row group.
+        """
+        import pyarrow.parquet as pq
+
+        table = _arrow_table(df, self._schema)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        self._writer.write_table(table)
+        self.rows_written += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ArrowChunkWriter:
+    """
+    Append DataFrame chunks to an Arrow IPC (Feather v2) file as record batches.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows_written = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, df: pd.DataFrame):
+        """
+        Append one chunk as record batches.
+        """
+        import pyarrow as pa
+
+        table = _arrow_table(df, self._schema)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = pa.ipc.new_file(self.path, self._schema)
+        self._writer.write_table(table)
+        self.rows_written += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ExcelChunkWriter:
+    """
+    Append DataFrame chunks to an Excel workbook using openpyxl's write-only mode.
+    Excel is much slower than the columnar formats and is meant as an opt-in export.
+    """
+
+    def __init__(self, path):
+        from openpyxl import Workbook
+
+        self.path = path
+        self.rows_written = 0
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet()
+        self._header = None
+
+    def write(self, df: pd.DataFrame):
+        """
+        Append one chunk of rows to the sheet.
+        """
+        df = _text_cells(df)
+        if self._header is None:
+            self._header = list(df.columns)
+            self._sheet.append(self._header)
+        for row in df.itertuples(index=False, name=None):
+            self._sheet.append([None if is_missing(value) else value for value in row])
+        self.rows_written += len(df)
+
+    def close(self):
+        if self._workbook is not None:
+            self._workbook.save(self.path)
+            self._workbook = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def is_missing(value) -> bool:
+    """
+    True for an empty spreadsheet cell: None, NaN or pd.NA.
+    """
+    return value is None or (isinstance(value, float) and value != value) or value is pd.NA
+
+
+def open_chunk_writer(path):
+    """
+    Create an incremental writer for the output path, chosen by its extension.
+    Parameters:
+    - path (str): Output file ending in .parquet, .arrow/.feather, .csv or .xlsx.
+    Returns:
+    - ParquetChunkWriter | ArrowChunkWriter | CsvChunkWriter | ExcelChunkWriter: Writer with write(df) and close().
+    """
+    suffix = _suffix(path)
+    if suffix in PARQUET_SUFFIXES:
+        return ParquetChunkWriter(path)
+    if suffix in ARROW_SUFFIXES:
+        return ArrowChunkWriter(path)
+    if suffix in CSV_SUFFIXES:
+        return CsvChunkWriter(path)
+    if suffix in EXCEL_SUFFIXES:
+        return ExcelChunkWriter(path)
+    raise ValueError(f"Unsupported output format: {path}")
+
+
+def write_results(df: pd.DataFrame, path) -> int:
+    """
+    Write a complete result frame to the output path in the format given by its extension.
+    Returns:
+    - int: Number of rows written.
+    """
+    with open_chunk_writer(path) as writer:
+        writer.write(df)
+        return writer.rows_written
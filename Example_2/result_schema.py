@@ -0,0 +1,228 @@
+from __future__ import annotations
+import enum
+from typing import Iterator, List, Optional
+import numpy as np
+from entity_vocab import EntityVocabulary, RaggedIds
+from lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+
+
+class EntityStatus(enum.IntEnum):
+    """
+    What a unique-entity cell holds: entities, or one of the outcomes the legacy columns spell as strings.
+    """
+    ENTITIES = 0
+    MISSING = 1
+    NO_OUTPUT_ENTITIES = 2
+    NO_GROUND_TRUTH_ENTITIES = 3
+    ALL_ATTESTED = 4
+    NO_UNIQUE = 5
+
+
+# Legacy sentinel strings of each unique-entity column, as returned by the get_unique_* methods
+UNIQUE_IN_OUTPUT_TEXT = {
+    EntityStatus.NO_OUTPUT_ENTITIES: "no_named_entities in Output",
+    EntityStatus.ALL_ATTESTED: "all_attested",
+    EntityStatus.NO_UNIQUE: "No_Unique_Entities in Output",
+}
+UNIQUE_IN_GROUND_TRUTH_TEXT = {
+    EntityStatus.NO_GROUND_TRUTH_ENTITIES: "no_named_entities in Ground_truth",
+    EntityStatus.ALL_ATTESTED: "all_attested",
+    EntityStatus.NO_UNIQUE: "No_Unique_entities in Ground_truth",
+}
+
+
+class RowResult:
+    """
+    The result of one row: entity tuples, unique-entity statuses, the factual check and the overlap.
+    """
+
+    __slots__ = ('ground_truth_entities', 'output_entities', 'all_unique_entities', 'unique_in_output',
+                 'unique_in_ground_truth', 'unique_in_output_status', 'unique_in_ground_truth_status', 'result',
+                 'overlap_pct')
+
+    def __init__(self, ground_truth_entities: Optional[tuple], output_entities: Optional[tuple],
+                 all_unique_entities: Optional[tuple], unique_in_output: tuple, unique_in_ground_truth: tuple,
+                 unique_in_output_status: EntityStatus, unique_in_ground_truth_status: EntityStatus, result: bool,
+                 overlap_pct: float):
+        self.ground_truth_entities = ground_truth_entities
+        self.output_entities = output_entities
+        self.all_unique_entities = all_unique_entities
+        self.unique_in_output = unique_in_output
+        self.unique_in_ground_truth = unique_in_ground_truth
+        self.unique_in_output_status = unique_in_output_status
+        self.unique_in_ground_truth_status = unique_in_ground_truth_status
+        self.result = result
+        self.overlap_pct = overlap_pct
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"RowResult({fields})"
+
+    def to_legacy(self) -> dict:
+        """
+        The row as the legacy result columns, with sets and sentinel strings.
+        """
+        return {
+            'Ground_Truth_Entities': _as_set(self.ground_truth_entities),
+            'Output_Entities': _as_set(self.output_entities),
+            'All_Unique_Entities': _as_set(self.all_unique_entities),
+            'Unique_In_Output': _legacy_value(self.unique_in_output_status, self.unique_in_output,
+                                              UNIQUE_IN_OUTPUT_TEXT),
+            'Unique_in_Ground_Truth': _legacy_value(self.unique_in_ground_truth_status, self.unique_in_ground_truth,
+                                                    UNIQUE_IN_GROUND_TRUTH_TEXT),
+            'Result': self.result,
+            'Overlap_PCT': self.overlap_pct
+        }
+
+
+def _as_set(entities: Optional[tuple]) -> Optional[set]:
+    return None if entities is None else set(entities)
+
+
+def _legacy_value(status: EntityStatus, entities: tuple, texts: dict):
+    if status == EntityStatus.ENTITIES:
+        return set(entities)
+    if status == EntityStatus.MISSING:
+        return None
+    return texts[status]
+
+
+class ResultTable:
+    """
+    Columnar results of a scoring run.
+
+    Entity columns are RaggedIds into the EntityVocabulary of the comparison they came from, the
+    unique-entity outcomes are int8 EntityStatus arrays, and Result and Overlap_PCT are bool and
+    float64 arrays. Filtering rows is a vectorised mask, e.g. ``table.select(table.unattested())``;
+    to_frame() rebuilds the legacy DataFrame of sets and sentinel strings.
+    """
+
+    def __init__(self, vocab: EntityVocabulary, ground_truth: RaggedIds, output: RaggedIds, all_unique: RaggedIds,
+                 unique_in_output: RaggedIds, unique_in_ground_truth: RaggedIds, ground_truth_present: np.ndarray,
+                 output_present: np.ndarray, unique_in_output_status: np.ndarray,
+                 unique_in_ground_truth_status: np.ndarray, result: np.ndarray, overlap_pct: np.ndarray, index=None):
+        self.vocab = vocab
+        self.ground_truth = ground_truth
+        self.output = output
+        self.all_unique = all_unique
+        self.unique_in_output = unique_in_output
+        self.unique_in_ground_truth = unique_in_ground_truth
+        self.ground_truth_present = ground_truth_present
+        self.output_present = output_present
+        self.unique_in_output_status = unique_in_output_status
+        self.unique_in_ground_truth_status = unique_in_ground_truth_status
+        self.result = result
+        self.overlap_pct = overlap_pct
+        self.index = index if index is not None else pd.RangeIndex(len(result))
+
+    @classmethod
+    def from_comparison(cls, comparison: dict, result, overlap_pct, index=None) -> 'ResultTable':
+        """
+        Build the table from TestFactualAccuracy.compare_entity_columns(decode=False) and the per-row scores.
+        The statuses follow the get_unique_* methods exactly, computed with boolean masks over all rows.
+        """
+        output_present = comparison['output_present']
+        ground_truth_present = comparison['ground_truth_present']
+        both_present = output_present & ground_truth_present
+        attested = both_present & comparison['equal']
+        differing = both_present & ~comparison['equal']
+
+        unique_in_output_status = np.full(len(output_present), EntityStatus.ENTITIES, dtype=np.int8)
+        unique_in_output_status[~output_present] = EntityStatus.NO_OUTPUT_ENTITIES
+        unique_in_output_status[attested] = EntityStatus.ALL_ATTESTED
+        unique_in_output_status[differing & (comparison['only_in_output'].lengths() == 0)] = EntityStatus.NO_UNIQUE
+
+        unique_in_ground_truth_status = np.full(len(output_present), EntityStatus.ENTITIES, dtype=np.int8)
+        unique_in_ground_truth_status[~output_present & ~ground_truth_present] = EntityStatus.MISSING
+        unique_in_ground_truth_status[output_present & ~ground_truth_present] = EntityStatus.NO_GROUND_TRUTH_ENTITIES
+        unique_in_ground_truth_status[attested] = EntityStatus.ALL_ATTESTED
+        unique_in_ground_truth_status[differing & (comparison['only_in_ground_truth'].lengths() == 0)] = \
+            EntityStatus.NO_UNIQUE
+
+        return cls(comparison['vocab'], comparison['ground_truth_ids'], comparison['output_ids'],
+                   comparison['all_unique'], comparison['only_in_output'], comparison['only_in_ground_truth'],
+                   ground_truth_present, output_present, unique_in_output_status, unique_in_ground_truth_status,
+                   np.asarray(result, dtype=bool), np.asarray(overlap_pct, dtype=np.float64), index)
+
+    def __len__(self) -> int:
+        return len(self.result)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory held by the table's arrays, excluding the vocabulary.
+        """
+        ragged = (self.ground_truth, self.output, self.all_unique, self.unique_in_output, self.unique_in_ground_truth)
+        arrays = (self.ground_truth_present, self.output_present, self.unique_in_output_status,
+                  self.unique_in_ground_truth_status, self.result, self.overlap_pct)
+        return sum(column.nbytes for column in ragged) + sum(column.nbytes for column in arrays)
+
+    def unattested(self) -> np.ndarray:
+        """
+        Mask of rows whose ground truth has entities missing from the output.
+        """
+        return self.unique_in_ground_truth_status == EntityStatus.ENTITIES
+
+    def select(self, rows) -> 'ResultTable':
+        """
+        A new table with the given rows, by boolean mask or positions.
+        """
+        rows = np.asarray(rows)
+        rows = np.flatnonzero(rows) if rows.dtype == bool else rows.astype(np.int64)
+        return ResultTable(self.vocab, self.ground_truth.take(rows), self.output.take(rows),
+                           self.all_unique.take(rows), self.unique_in_output.take(rows),
+                           self.unique_in_ground_truth.take(rows), self.ground_truth_present[rows],
+                           self.output_present[rows], self.unique_in_output_status[rows],
+                           self.unique_in_ground_truth_status[rows], self.result[rows], self.overlap_pct[rows],
+                           self.index[rows])
+
+    def row(self, position: int) -> RowResult:
+        """
+        The result of one row, by position.
+        """
+        strings = self.vocab.strings
+
+        def entities(ragged: RaggedIds, present: bool = True) -> Optional[tuple]:
+            return tuple(strings[entity_id] for entity_id in ragged.row(position).tolist()) if present else None
+
+        ground_truth_present = bool(self.ground_truth_present[position])
+        output_present = bool(self.output_present[position])
+        return RowResult(entities(self.ground_truth, ground_truth_present), entities(self.output, output_present),
+                         entities(self.all_unique, ground_truth_present or output_present),
+                         entities(self.unique_in_output), entities(self.unique_in_ground_truth),
+                         EntityStatus(self.unique_in_output_status[position]),
+                         EntityStatus(self.unique_in_ground_truth_status[position]), bool(self.result[position]),
+                         float(self.overlap_pct[position]))
+
+    def __iter__(self) -> Iterator[RowResult]:
+        return (self.row(position) for position in range(len(self)))
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        The legacy result DataFrame: entity sets, sentinel strings, Result and Overlap_PCT, as score_dataframe returns.
+        """
+        decode = self.vocab.decode
+
+        def with_missing(values: List[set], present: np.ndarray) -> list:
+            return [value if keep else None for value, keep in zip(values, present.tolist())]
+
+        def with_status(values: List[set], statuses: np.ndarray, texts: dict) -> list:
+            return [value if status == EntityStatus.ENTITIES else texts.get(EntityStatus(status))
+                    for value, status in zip(values, statuses.tolist())]
+
+        columns = {
+            'Ground_Truth_Entities': with_missing(decode(self.ground_truth), self.ground_truth_present),
+            'Output_Entities': with_missing(decode(self.output), self.output_present),
+            'All_Unique_Entities': with_missing(decode(self.all_unique), self.ground_truth_present | self.output_present),
+            'Unique_In_Output': with_status(decode(self.unique_in_output), self.unique_in_output_status,
+                                            UNIQUE_IN_OUTPUT_TEXT),
+            'Unique_in_Ground_Truth': with_status(decode(self.unique_in_ground_truth),
+                                                  self.unique_in_ground_truth_status, UNIQUE_IN_GROUND_TRUTH_TEXT),
+        }
+        # object dtype keeps None as None; pandas would otherwise infer strings and turn it into NaN
+        frame = pd.DataFrame(columns, index=self.index, dtype=object)
+        frame['Result'] = self.result
+        frame['Overlap_PCT'] = self.overlap_pct
+        return frame
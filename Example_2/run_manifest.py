@@ -0,0 +1,129 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import List, Optional
+
+# Bump when the stored result layout changes, so older manifests are not reused
+MANIFEST_FORMAT = 2
+
+
+def row_hash(ground_truth: str, output: str) -> str:
+    """
+    Hash the content of one Ground_Truth/Output row.
+    Returns:
+    - str: Hex SHA-256 digest of both texts.
+    """
+    return hashlib.sha256(f"{ground_truth}\0{output}".encode("utf-8")).hexdigest()
+
+
+def _encode_value(value):
+    # Entity sets are stored as tagged sorted lists so they come back as sets, not lists
+    if isinstance(value, (set, frozenset)):
+        return {'set': sorted(value)}
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        return set(value['set'])
+    return value
+
+
+class RunManifest:
+    """
+    Results of previous runs, keyed by the content hash of each Ground_Truth/Output row.
+
+    The manifest also records the versions of the models that produced the results (spaCy pipeline,
+    embedding model, similarity backend). A run whose versions differ starts the manifest afresh,
+    so results are only ever reused when they would be computed identically.
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters:
+        - path (str): SQLite file holding the manifest; created if missing.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS rows (hash TEXT PRIMARY KEY, result TEXT NOT NULL)")
+        self._connection.commit()
+
+    @property
+    def versions(self) -> Optional[dict]:
+        """
+        The model versions the stored results were computed with, or None for a new manifest.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM meta WHERE key = 'versions'").fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def is_compatible(self, versions: dict) -> bool:
+        """
+        Check whether stored results can be reused by a run with the given model versions.
+        """
+        return self.versions == {**versions, 'format': MANIFEST_FORMAT}
+
+    def reset(self, versions: dict):
+        """
+        Forget every stored result and record the model versions of the new run.
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM rows")
+            self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('versions', ?)",
+                                     (json.dumps({**versions, 'format': MANIFEST_FORMAT}, sort_keys=True),))
+            self._connection.commit()
+
+    def lookup(self, hashes: List[str]) -> List[Optional[dict]]:
+        """
+        Fetch stored results.
+        Returns:
+        - list: One result dict per hash, or None where the row has not been scored before.
+        """
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            # Stay below SQLite's limit on bound parameters
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(self._connection.execute(
+                    f"SELECT hash, result FROM rows WHERE hash IN ({placeholders})", chunk).fetchall())
+
+        results = []
+        for key in hashes:
+            payload = found.get(key)
+            results.append(None if payload is None else
+                           {column: _decode_value(value) for column, value in json.loads(payload).items()})
+        return results
+
+    def record(self, hashes: List[str], results: List[dict]):
+        """
+        Store the results of newly scored rows.
+        Parameters:
+        - hashes (list): Row hashes from row_hash.
+        - results (list): One dict of result column values per row.
+        """
+        rows = [(key, json.dumps({column: _encode_value(value) for column, value in result.items()}))
+                for key, result in zip(hashes, results)]
+        with self._lock:
+            self._connection.executemany("INSERT OR REPLACE INTO rows (hash, result) VALUES (?, ?)", rows)
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    def close(self):
+        """
+        Close the SQLite connection.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,350 @@
+import argparse
+import asyncio
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+
+class MicroBatcher:
+    """
+    Collect concurrent requests and process them together.
+
+    Items passed to submit() are queued; a background task gathers up to max_batch_size items,
+    waiting at most max_latency seconds after the first one, and runs batch_fn on them in an executor.
+    """
+
+    def __init__(self, batch_fn: Callable[[list], list], executor, max_batch_size: int = 64,
+                 max_latency: float = 0.01):
+        """
+        Parameters:
+        - batch_fn (callable): Takes a list of items and returns one result per item, in order.
+        - executor (Executor): Where batch_fn runs, keeping the event loop free while models compute.
+        - max_batch_size (int): Largest number of items processed together.
+        - max_latency (float): Longest time in seconds the first item of a batch waits for others.
+        """
+        self.batch_fn = batch_fn
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.batches = 0
+        self.items = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Requests taken off the queue and not yet answered, failed by stop() if it interrupts them
+        self._batch: list = []
+
+    def start(self):
+        """
+        Start the batching task on the running event loop.
+        """
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the batching task. Requests still queued or being processed fail with ConnectionError.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+            pending = [future for _, future in self._batch]
+            self._batch = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait()[1])
+            error = ConnectionError("Micro-batcher was stopped.")
+            for future in pending:
+                if not future.done():
+                    future.set_exception(error)
+
+    async def submit(self, item):
+        """
+        Queue one item and wait for its result.
+        """
+        if self._task is None:
+            raise ConnectionError("Micro-batcher is not running.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_latency
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            items = [item for item, _ in batch]
+            self.batches += 1
+            self.items += len(items)
+            try:
+                results = await loop.run_in_executor(self.executor, self.batch_fn, items)
+            except Exception as error:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            self._batch = []
+
+
+class ScoringService:
+    """
+    Long-running local service that keeps one scorer (spaCy pipeline and sentence-transformer) resident.
+
+    Named-entity and overlap requests arrive as newline-delimited JSON over a Unix socket or TCP.
+    Concurrent requests are coalesced into micro-batches, flushed when a batch is full or when the
+    oldest request has waited max_latency seconds, so many callers share one warm model.
+    Run it with ``python scoring_service.py --socket /tmp/factual_accuracy.sock``.
+    """
+
+    def __init__(self, scorer=None, max_batch_size: int = 64, max_latency: float = 0.01):
+        """
+        Parameters:
+        - scorer (TestFactualAccuracy): Scorer to serve; a default one is created when None.
+        - max_batch_size (int): Largest number of requests of one kind processed together.
+        - max_latency (float): Longest time in seconds a request waits for a batch to fill.
+        """
+        if scorer is None:
+            from factual_accuracy import TestFactualAccuracy
+            scorer = TestFactualAccuracy()
+        self.scorer = scorer
+        # One thread owns the models, so spaCy and torch are never called concurrently
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self.entity_batcher = MicroBatcher(self._entities_batch, self._executor, max_batch_size, max_latency)
+        self.overlap_batcher = MicroBatcher(self._overlap_batch, self._executor, max_batch_size, max_latency)
+        self._server = None
+
+    def _entities_batch(self, texts: List[str]) -> list:
+        return self.scorer.extract_named_entities_batch(texts, batch_size=len(texts))
+
+    def _overlap_batch(self, pairs: List[tuple]) -> list:
+        ground_truths = [ground_truth for ground_truth, _ in pairs]
+        outputs = [output for _, output in pairs]
+        return self.scorer.calculate_overlap_pct_batch(ground_truths, outputs, batch_size=len(pairs)).tolist()
+
+    async def extract_named_entities(self, text: str):
+        """
+        Named entities of one text, batched with other concurrent requests.
+        """
+        return await self.entity_batcher.submit(text)
+
+    async def calculate_overlap_pct(self, ground_truth: str, output: str) -> float:
+        """
+        Overlap percentage of one Ground_Truth/Output pair, batched with other concurrent requests.
+        """
+        return await self.overlap_batcher.submit((ground_truth, output))
+
+    async def start(self, socket_path: Optional[str] = None, host: str = '127.0.0.1', port: int = 8765):
+        """
+        Warm the models and start listening on a Unix socket, or on TCP when socket_path is None.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._warm_up)
+        self.entity_batcher.start()
+        self.overlap_batcher.start()
+        if socket_path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=socket_path)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host=host, port=port)
+        return self._server
+
+    async def stop(self):
+        """
+        Stop accepting connections and shut the batchers down.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.entity_batcher.stop()
+        await self.overlap_batcher.stop()
+        self._executor.shutdown(wait=False)
+
+    def _warm_up(self):
+        # Loads the spaCy pipeline, and the transformer only if the scorer's backend uses it
+        self.scorer.warm_up()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # Requests on one connection are answered as they finish, not in order; ids pair them up
+                task = asyncio.create_task(self._answer(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def _answer(self, line: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            if request['op'] == 'entities':
+                entities = await self.extract_named_entities(request['text'])
+                response = {'id': request_id, 'result': None if entities is None else sorted(entities)}
+            elif request['op'] == 'overlap':
+                overlap_pct = await self.calculate_overlap_pct(request['ground_truth'], request['output'])
+                response = {'id': request_id, 'result': overlap_pct}
+            else:
+                response = {'id': request_id, 'error': f"Unknown op: {request['op']}"}
+        except Exception as error:
+            response = {'id': request_id, 'error': f"{type(error).__name__}: {error}"}
+
+        async with write_lock:
+            writer.write(json.dumps(response).encode('utf-8') + b'\n')
+            await writer.drain()
+
+
+class ScoringClient:
+    """
+    Async client for ScoringService. Many requests can be in flight on one connection.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._pending = {}
+        self._read_task = asyncio.get_running_loop().create_task(self._read_responses())
+
+    @classmethod
+    async def connect(cls, socket_path: Optional[str] = None, host: str = '127.0.0.1', port: int = 8765):
+        """
+        Connect to a service on a Unix socket, or on TCP when socket_path is None.
+        """
+        if socket_path is not None:
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def extract_named_entities(self, text: str):
+        """
+        Fetch named entities from the provided text.
+        Returns:
+        - set: Set of named entities, or None if there are none, like TestFactualAccuracy.extract_named_entities.
+        """
+        entities = await self._request({'op': 'entities', 'text': text})
+        return None if entities is None else set(entities)
+
+    async def calculate_overlap_pct(self, ground_truth: str, output: str) -> float:
+        """
+        Calculate the overlap percentage between a ground truth and an output text.
+        """
+        return await self._request({'op': 'overlap', 'ground_truth': ground_truth, 'output': output})
+
+    async def close(self):
+        """
+        Close the connection. Requests still waiting for an answer fail with ConnectionError.
+        """
+        self._read_task.cancel()
+        try:
+            await self._read_task
+        except asyncio.CancelledError:
+            pass
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _request(self, request: dict):
+        if self._read_task.done():
+            raise ConnectionError("Scoring client is not connected.")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.write(json.dumps({'id': request_id, **request}).encode('utf-8') + b'\n')
+            await self._writer.drain()
+        except Exception:
+            self._pending.pop(request_id, None)
+            raise
+        return await future
+
+    async def _read_responses(self):
+        # Whatever ends the loop, every request still waiting must fail rather than hang its caller
+        error = ConnectionError("Scoring service closed the connection.")
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response['id'], None)
+                if future is None or future.done():
+                    continue
+                if 'error' in response:
+                    future.set_exception(RuntimeError(response['error']))
+                else:
+                    future.set_result(response['result'])
+        except asyncio.CancelledError:
+            error = ConnectionError("Scoring client was closed.")
+            raise
+        except Exception as read_error:
+            error = read_error
+        finally:
+            self._fail_pending(error)
+
+    def _fail_pending(self, error: BaseException):
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+
+async def serve(socket_path: Optional[str], host: str, port: int, max_batch_size: int, max_latency: float):
+    """
+    Run the service until cancelled.
+    """
+    service = ScoringService(max_batch_size=max_batch_size, max_latency=max_latency)
+    server = await service.start(socket_path, host, port)
+    print(f"Scoring service listening on {socket_path or f'{host}:{port}'}")
+    try:
+        await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve TestFactualAccuracy scoring over a local socket.")
+    parser.add_argument('--socket', help="Unix socket path; TCP is used when omitted.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-latency', type=float, default=0.01, help="Seconds a request may wait for a batch.")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.socket, args.host, args.port, args.max_batch_size, args.max_latency))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+    # Run as a script: the scorer imports the shared package from the repository root
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    main()
@@ -0,0 +1,364 @@
+from __future__ import annotations
+import hashlib
+import json
+from abc import ABC, abstractmethod
+import numpy as np
+from embedding_cache import EmbeddingCache
+from lazy_import import lazy_import
+from shared.model_registry import DEFAULT_MODEL_NAME, registry
+
+# scikit-learn is only needed by the lexical backend
+sklearn_text = lazy_import("sklearn.feature_extraction.text")
+sklearn_preprocessing = lazy_import("sklearn.preprocessing")
+
+
+def _rowwise_dot(left, right) -> np.ndarray:
+    """
+    Dot product of each row of left with the same row of right, for dense or sparse matrices.
+    """
+    if hasattr(left, 'multiply'):
+        return np.asarray(left.multiply(right).sum(axis=1), dtype=np.float64).ravel()
+    return np.einsum('ij,ij->i', left, right).astype(np.float64)
+
+
+class SimilarityBackend(ABC):
+    """
+    Turns texts into unit-length vectors so cosine similarity is a dot product.
+
+    Subclasses implement embed(); similarity_matrix() and score_pairs() are built on it.
+    """
+
+    @abstractmethod
+    def embed(self, texts: list):
+        """
+        Vectorise texts.
+        Parameters:
+        - texts (list): Texts to vectorise.
+        Returns:
+        - matrix: One L2-normalised row per text, as a dense ndarray or a scipy sparse matrix.
+        """
+
+    @property
+    def batch_independent(self) -> bool:
+        """
+        True when a pair's score does not depend on which other texts are scored in the same call, so
+        sharded, streamed and incremental runs give the same scores as scoring every row at once.
+        """
+        return True
+
+    def params(self) -> dict:
+        """
+        Settings that change the scores, used to tell stored results of differently configured backends apart.
+        Returns:
+        - dict: Setting names and values.
+        """
+        return {}
+
+    def config(self) -> dict:
+        """
+        Describe how this backend was built, so worker processes can build an equivalent one.
+        A backend may hold a loaded model or an open SQLite cache, so it is sent to workers as these settings
+        rather than pickled. Backends that do not override this cannot be sent to workers.
+        Returns:
+        - dict: Picklable settings accepted by from_config, with the class name under 'class'.
+        """
+        raise TypeError(f"{type(self).__name__} does not implement config(), so it cannot be sent to "
+                        "worker processes; score with score_dataframe instead of score_dataframe_parallel")
+
+    @classmethod
+    def from_config(cls, config: dict) -> SimilarityBackend:
+        """
+        Build a backend from the settings returned by config().
+        A cache backed by a file is reopened on the same file; an in-memory cache starts empty.
+        """
+        settings = dict(config)
+        name = settings.pop('class')
+        backends = {backend.__name__: backend for backend in (TransformerBackend, LexicalBackend, CascadeBackend)}
+        if name not in backends:
+            raise ValueError(f"Unknown similarity backend: {name}")
+        return backends[name]._from_settings(settings)
+
+    @classmethod
+    def _from_settings(cls, settings: dict) -> SimilarityBackend:
+        return cls(**settings)
+
+    def __repr__(self) -> str:
+        settings = ", ".join(f"{name}={value!r}" for name, value in self.params().items())
+        return f"{type(self).__name__}({settings})"
+
+    def similarity_matrix(self, left: list, right: list) -> np.ndarray:
+        """
+        Cosine similarity of every text in left with every text in right.
+        Returns:
+        - ndarray: Dense matrix of shape (len(left), len(right)).
+        """
+        scores = self.embed(left) @ self.embed(right).T
+        if hasattr(scores, 'toarray'):
+            scores = scores.toarray()
+        return np.asarray(scores, dtype=np.float64)
+
+    def score_pairs(self, ground_truths: list, outputs: list) -> np.ndarray:
+        """
+        Cosine similarity of each ground truth with the output on the same row.
+        Each distinct text is vectorised once, and all rows are scored in one vectorised operation.
+        Parameters:
+        - ground_truths (list): Ground truth texts, one per row.
+        - outputs (list): Output texts, aligned with ground_truths.
+        Returns:
+        - ndarray: Similarity per row.
+        """
+        unique_texts = list(dict.fromkeys(list(ground_truths) + list(outputs)))
+        if not unique_texts:
+            return np.empty(0, dtype=np.float64)
+        vectors = self.embed(unique_texts)
+        position = {text: i for i, text in enumerate(unique_texts)}
+        return _rowwise_dot(vectors[[position[text] for text in ground_truths]],
+                            vectors[[position[text] for text in outputs]])
+
+    def score_pairs_rescored(self, ground_truths: list, outputs: list) -> tuple:
+        """
+        Score pairs as score_pairs does and tell which scores came from a second, accurate backend.
+        Parameters:
+        - ground_truths (list): Ground truth texts, one per row.
+        - outputs (list): Output texts, aligned with ground_truths.
+        Returns:
+        - tuple: (similarity per row, boolean array marking the rescored rows); the mask is None for a
+        single-stage backend, whose scores all share one scale.
+        """
+        return self.score_pairs(ground_truths, outputs), None
+
+    def similarity_matrix_rescored(self, left: list, right: list) -> tuple:
+        """
+        Compute similarity_matrix and tell whether a second, accurate backend produced it.
+        Returns:
+        - tuple: (dense matrix of shape (len(left), len(right)), True if rescored, or None for a
+        single-stage backend).
+        """
+        return self.similarity_matrix(left, right), None
+
+
+class TransformerBackend(SimilarityBackend):
+    """
+    Sentence-transformer embeddings from the shared model registry (the default scoring path).
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, device: str | None = None, cache=None,
+                 batch_size: int = 64):
+        """
+        Parameters:
+        - model_name (str): Sentence-transformer model name.
+        - device (str): Device to run the model on; None lets sentence-transformers choose.
+        - cache (EmbeddingCache): Optional cache of previously computed embeddings.
+        - batch_size (int): Number of texts encoded per forward pass.
+        """
+        self.model_name = model_name
+        self.device = device
+        self.cache = cache
+        self.batch_size = batch_size
+
+    def params(self) -> dict:
+        return {'model_name': self.model_name}
+
+    def config(self) -> dict:
+        return {'class': 'TransformerBackend', 'model_name': self.model_name, 'device': self.device,
+                'cache': None if self.cache is None else self.cache.config(), 'batch_size': self.batch_size}
+
+    @classmethod
+    def _from_settings(cls, settings: dict) -> TransformerBackend:
+        cache = settings.pop('cache')
+        return cls(cache=None if cache is None else EmbeddingCache(**cache), **settings)
+
+    def embed(self, texts: list) -> np.ndarray:
+        return registry.encode(list(texts), self.model_name, self.device, batch_size=self.batch_size,
+                               normalize=True, cache=self.cache)
+
+
+class LexicalBackend(SimilarityBackend):
+    """
+    Sparse bag-of-words vectors from scikit-learn, a CPU-only alternative to transformer embeddings.
+
+    'hashing' uses a stateless HashingVectorizer, so every call is independent and nothing is fitted.
+    'tfidf' weights words by their IDF. Call fit() on a fixed corpus to learn the vocabulary and IDF
+    weights once; they are part of config(), so worker processes rebuild exactly the same backend.
+    An unfitted 'tfidf' backend fits on the texts of each call instead, so a row's score depends on the
+    rows scored with it and the scorer refuses it in sharded, streamed and incremental runs.
+    Scores measure word overlap rather than meaning, and are on a different scale from the transformer.
+    """
+
+    def __init__(self, kind: str = 'hashing', analyzer: str = 'word', ngram_range: tuple = (1, 1),
+                 n_features: int = 2 ** 20, lowercase: bool = True, vocabulary: dict | None = None,
+                 idf: list | None = None):
+        """
+        Parameters:
+        - kind (str): 'hashing' or 'tfidf'.
+        - analyzer (str): 'word', 'char' or 'char_wb', as in scikit-learn.
+        - ngram_range (tuple): Smallest and largest n-gram size.
+        - n_features (int): Number of hash buckets for the 'hashing' kind.
+        - lowercase (bool): Lowercase texts before tokenising.
+        - vocabulary (dict): Term -> column of a fitted 'tfidf' backend, as set by fit().
+        - idf (list): IDF weight of each column of a fitted 'tfidf' backend, as set by fit().
+        """
+        if kind not in ('hashing', 'tfidf'):
+            raise ValueError(f"Unknown lexical backend kind: {kind}")
+        if (vocabulary is None) != (idf is None) or (vocabulary is not None and kind != 'tfidf'):
+            raise ValueError("vocabulary and idf are given together, and only for the 'tfidf' kind")
+        self.kind = kind
+        self.analyzer = analyzer
+        self.ngram_range = ngram_range
+        self.n_features = n_features
+        self.lowercase = lowercase
+        self.vocabulary = vocabulary
+        self.idf = idf
+
+    def fit(self, texts) -> LexicalBackend:
+        """
+        Learn the 'tfidf' vocabulary and IDF weights from a fixed corpus, e.g. every text of the input file.
+        Parameters:
+        - texts (iterable): Corpus texts.
+        Returns:
+        - LexicalBackend: This backend, so calls can be chained.
+        """
+        if self.kind != 'tfidf':
+            raise ValueError("Only the 'tfidf' kind is fitted")
+        vectorizer = sklearn_text.TfidfVectorizer(analyzer=self.analyzer, ngram_range=self.ngram_range,
+                                                  lowercase=self.lowercase, norm='l2').fit(list(texts))
+        self.vocabulary = {term: int(column) for term, column in vectorizer.vocabulary_.items()}
+        self.idf = vectorizer.idf_.tolist()
+        return self
+
+    @property
+    def batch_independent(self) -> bool:
+        return self.kind == 'hashing' or self.vocabulary is not None
+
+    def params(self) -> dict:
+        params = {'kind': self.kind, 'analyzer': self.analyzer, 'ngram_range': tuple(self.ngram_range),
+                  'lowercase': self.lowercase}
+        if self.kind == 'hashing':
+            params['n_features'] = self.n_features
+        elif self.vocabulary is not None:
+            # A digest stands for the fitted corpus, which may hold many thousands of terms
+            fitted = json.dumps([sorted(self.vocabulary.items()), self.idf])
+            params['corpus'] = hashlib.sha256(fitted.encode("utf-8")).hexdigest()[:16]
+        return params
+
+    def config(self) -> dict:
+        return {'class': 'LexicalBackend', 'kind': self.kind, 'analyzer': self.analyzer,
+                'ngram_range': tuple(self.ngram_range), 'n_features': self.n_features, 'lowercase': self.lowercase,
+                'vocabulary': self.vocabulary, 'idf': self.idf}
+
+    def embed(self, texts: list):
+        texts = list(texts)
+        if self.kind == 'hashing':
+            vectorizer = sklearn_text.HashingVectorizer(analyzer=self.analyzer, ngram_range=self.ngram_range,
+                                                        n_features=self.n_features, lowercase=self.lowercase,
+                                                        alternate_sign=False, norm='l2')
+            return vectorizer.transform(texts)
+
+        if self.vocabulary is not None:
+            # Term counts weighted by the fitted IDF, as TfidfVectorizer.transform computes them
+            counts = sklearn_text.CountVectorizer(analyzer=self.analyzer, ngram_range=self.ngram_range,
+                                                  lowercase=self.lowercase, vocabulary=self.vocabulary).transform(texts)
+            weighted = counts.multiply(np.asarray(self.idf, dtype=np.float64)).tocsr()
+            return sklearn_preprocessing.normalize(weighted, norm='l2')
+
+        vectorizer = sklearn_text.TfidfVectorizer(analyzer=self.analyzer, ngram_range=self.ngram_range,
+                                                  lowercase=self.lowercase, norm='l2')
+        try:
+            return vectorizer.fit_transform(texts)
+        except ValueError:
+            # Every text is empty or a stop word: nothing to compare, so every vector is zero
+            from scipy.sparse import csr_matrix
+            return csr_matrix((len(texts), 1), dtype=np.float64)
+
+    def similarity_matrix(self, left: list, right: list) -> np.ndarray:
+        if self.batch_independent:
+            return super().similarity_matrix(left, right)
+        # Fit TF-IDF once over both sides so their vectors share one vocabulary
+        left, right = list(left), list(right)
+        vectors = self.embed(left + right)
+        scores = vectors[:len(left)] @ vectors[len(left):].T
+        return np.asarray(scores.toarray(), dtype=np.float64)
+
+
+class CascadeBackend(SimilarityBackend):
+    """
+    Score every row with a cheap backend and rescore only the borderline rows with an accurate one.
+
+    Rows whose fast score lies between low and high are sent to the accurate backend; the rest keep
+    the fast score. With a lexical first pass, most rows never touch the transformer.
+
+    The two backends score on different scales, so score_pairs_rescored marks the rows the accurate
+    backend rescored. The scorer writes that mask to an 'Overlap_Rescored' column next to Overlap_PCT
+    and counts the rows in its metrics ('cascade_rows_scored', 'cascade_rows_rescored'), which also
+    add up the rows scored by parallel workers. Choose low and high with the fast backend's scale in mind.
+    """
+
+    def __init__(self, accurate: SimilarityBackend, fast: SimilarityBackend | None = None,
+                 low: float = 0.2, high: float = 0.8):
+        """
+        Parameters:
+        - accurate (SimilarityBackend): Fallback backend. Pass TransformerBackend(scorer.model_name,
+        scorer.device, scorer.embedding_cache) to share the scorer's model and cache.
+        - fast (SimilarityBackend): First-pass backend; a hashing LexicalBackend when None.
+        - low (float): Fast scores below this are trusted as a clear mismatch.
+        - high (float): Fast scores above this are trusted as a clear match.
+        """
+        self.fast = fast if fast is not None else LexicalBackend()
+        self.accurate = accurate
+        self.low = low
+        self.high = high
+
+    def params(self) -> dict:
+        return {'fast': self.fast, 'accurate': self.accurate, 'low': self.low, 'high': self.high}
+
+    def config(self) -> dict:
+        return {'class': 'CascadeBackend', 'fast': self.fast.config(), 'accurate': self.accurate.config(),
+                'low': self.low, 'high': self.high}
+
+    @classmethod
+    def _from_settings(cls, settings: dict) -> CascadeBackend:
+        return cls(fast=SimilarityBackend.from_config(settings.pop('fast')),
+                   accurate=SimilarityBackend.from_config(settings.pop('accurate')), **settings)
+
+    @property
+    def batch_independent(self) -> bool:
+        return self.fast.batch_independent and self.accurate.batch_independent
+
+    def embed(self, texts: list):
+        return self.accurate.embed(texts)
+
+    def similarity_matrix(self, left: list, right: list) -> np.ndarray:
+        return self.similarity_matrix_rescored(left, right)[0]
+
+    def similarity_matrix_rescored(self, left: list, right: list) -> tuple:
+        # The matrix is rescored whole or not at all
+        scores = self.fast.similarity_matrix(left, right)
+        if self.low <= scores.mean() <= self.high:
+            return self.accurate.similarity_matrix(left, right), True
+        return scores, False
+
+    def score_pairs(self, ground_truths: list, outputs: list) -> np.ndarray:
+        return self.score_pairs_rescored(ground_truths, outputs)[0]
+
+    def score_pairs_rescored(self, ground_truths: list, outputs: list) -> tuple:
+        ground_truths, outputs = list(ground_truths), list(outputs)
+        scores = self.fast.score_pairs(ground_truths, outputs)
+        rescored = (scores >= self.low) & (scores <= self.high)
+        borderline = np.flatnonzero(rescored)
+        if len(borderline):
+            scores[borderline] = self.accurate.score_pairs([ground_truths[i] for i in borderline],
+                                                           [outputs[i] for i in borderline])
+        return scores, rescored
+
+
+def require_batch_independent(backend: SimilarityBackend | None, path: str):
+    """
+    Refuse a backend whose scores depend on which rows are scored together in a path that splits the rows.
+    Parameters:
+    - backend (SimilarityBackend): The scorer's similarity_backend; None (the transformer) is always accepted.
+    - path (str): What splits the rows, for the error message, e.g. 'evaluate_streaming'.
+    """
+    if backend is not None and not backend.batch_independent:
+        raise ValueError(f"{path} scores rows in separate batches, but {backend!r} fits its weights on each "
+                         "batch, so its scores would depend on the batching; fit it on a fixed corpus first, "
+                         "e.g. LexicalBackend('tfidf').fit(texts)")
@@ -0,0 +1,233 @@
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+# Stay below SQLite's limit on bound parameters
+SQLITE_BATCH = 500
+
+
+class SQLiteLRUCache(ABC):
+    """
+    Bounded in-memory LRU in front of an optional SQLite file, shared by the embedding and entity caches.
+
+    Values are stored under string keys built by the subclass. The SQLite table is bounded to
+    max_entries by evicting the least recently used rows. Hits served from memory are written back to
+    the rows' last_used time in batches, so frequently used values are not the first ones evicted.
+    The number of rows is tracked as values are added, and recounted only after another connection
+    (e.g. a worker process sharing the file) has committed changes.
+
+    Subclasses name the table and its value column and implement _serialise() and _deserialise() to
+    turn a value into a column value and back.
+    """
+
+    # SQLite table, value column and its SQL type, set by each subclass
+    table = None
+    value_column = 'value'
+    value_type = 'BLOB'
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1_000_000, memory_entries: int = 10_000):
+        """
+        Parameters:
+        - path (str): SQLite file to persist values in. None keeps the cache in memory only.
+        - max_entries (int): Maximum number of values kept on disk.
+        - memory_entries (int): Maximum number of values kept in the in-memory LRU.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        # Memory hits whose last_used time is not written to disk yet: key -> time of the hit
+        self._touched = {}
+        # Rows on disk, and the database version they were counted at (see _evict)
+        self._disk_entries = 0
+        self._data_version = None
+
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                f"(key TEXT PRIMARY KEY, {self.value_column} {self.value_type} NOT NULL, last_used REAL NOT NULL)")
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_last_used ON {self.table} (last_used)")
+            self._connection.commit()
+            self._disk_entries = self._count()
+            self._data_version = self._version()
+
+    def get_keys(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Look up several keys, in memory first and then on disk.
+        Returns:
+        - list: One value per key, or None where the key is not cached.
+        """
+        found = {}
+        with self._lock:
+            now = time.time()
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    if self._connection is not None:
+                        self._touched[key] = now
+            if len(self._touched) >= SQLITE_BATCH:
+                self._flush_touched()
+
+            missing = list({key for key in keys if key not in found})
+            if missing and self._connection is not None:
+                found.update(self._load(missing))
+
+            for key in keys:
+                if key in found:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        return [found.get(key) for key in keys]
+
+    def put_keys(self, keys: List[str], values: List[Any]):
+        """
+        Store one value per key, in memory and on disk.
+        """
+        with self._lock:
+            for key, value in zip(keys, values):
+                self._remember(key, value)
+
+            if self._connection is not None:
+                now = time.time()
+                rows = [(self._serialise(value), now, key) for key, value in zip(keys, values)]
+                # Replace the rows that exist, then insert the others, counting only the new ones
+                self._connection.executemany(
+                    f"UPDATE {self.table} SET {self.value_column} = ?, last_used = ? WHERE key = ?", rows)
+                self._disk_entries += self._connection.executemany(
+                    f"INSERT OR IGNORE INTO {self.table} ({self.value_column}, last_used, key) VALUES (?, ?, ?)",
+                    rows).rowcount
+                for key in keys:
+                    self._touched.pop(key, None)
+                self._evict()
+                self._connection.commit()
+
+    def config(self) -> dict:
+        """
+        Describe how this cache was built, so worker processes can open an equivalent one.
+        Returns:
+        - dict: Keyword arguments of the constructor. A cache with a path shares its file; one without starts empty.
+        """
+        return {'path': self.path, 'max_entries': self.max_entries, 'memory_entries': self.memory_entries}
+
+    def stats(self) -> dict:
+        """
+        Report cache effectiveness.
+        Returns:
+        - dict: Hit and miss counters, hit rate and number of values held in memory.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory)
+        }
+
+    def clear(self):
+        """
+        Remove every cached value, in memory and on disk, and reset the counters.
+        """
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self.hits = 0
+            self.misses = 0
+            if self._connection is not None:
+                self._connection.execute(f"DELETE FROM {self.table}")
+                self._connection.commit()
+                self._disk_entries = 0
+
+    def close(self):
+        """
+        Write pending last_used times and close the SQLite connection. The in-memory LRU stays usable.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._flush_touched()
+                self._connection.close()
+                self._connection = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._connection is None:
+                return len(self._memory)
+            return self._count()
+
+    @abstractmethod
+    def _serialise(self, value):
+        """
+        Turn a value into what is stored in the value column.
+        """
+
+    @abstractmethod
+    def _deserialise(self, stored):
+        """
+        Turn a stored column value back into the value.
+        """
+
+    def _remember(self, key: str, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, keys: List[str]) -> dict:
+        found = {}
+        for start in range(0, len(keys), SQLITE_BATCH):
+            chunk = keys[start:start + SQLITE_BATCH]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._connection.execute(
+                f"SELECT key, {self.value_column} FROM {self.table} WHERE key IN ({placeholders})",
+                chunk).fetchall()
+            for key, stored in rows:
+                value = self._deserialise(stored)
+                found[key] = value
+                self._remember(key, value)
+
+        if found:
+            now = time.time()
+            self._touched.update((key, now) for key in found)
+            self._flush_touched()
+        return found
+
+    def _flush_touched(self):
+        """
+        Write the last_used time of every pending memory hit in one transaction.
+        """
+        if self._touched and self._connection is not None:
+            self._connection.executemany(f"UPDATE {self.table} SET last_used = ? WHERE key = ?",
+                                         [(now, key) for key, now in self._touched.items()])
+            self._connection.commit()
+        self._touched.clear()
+
+    def _count(self) -> int:
+        return self._connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def _version(self) -> int:
+        # Changes whenever another connection commits to the file
+        return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def _evict(self):
+        version = self._version()
+        if version != self._data_version:
+            self._disk_entries = self._count()
+            self._data_version = version
+        if self._disk_entries > self.max_entries:
+            # Pending memory hits must count as uses before the oldest rows are chosen
+            self._flush_touched()
+            self._connection.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY last_used LIMIT ?)",
+                (self._disk_entries - self.max_entries,))
+            self._disk_entries = self.max_entries
@@ -0,0 +1,71 @@
+import json
+import pandas as pd
+import pytest
+from checkpoint import MANIFEST_NAME, Checkpoint
+
+
+def make_input(tmp_path, text: str = "Ground_Truth,Output\na,b\n"):
+    """
+    Write a small input file and return its path.
+    """
+    path = tmp_path / "input.csv"
+    path.write_text(text)
+    return path
+
+
+def shard(start: int, rows: int = 2) -> pd.DataFrame:
+    """
+    Build a result shard whose index starts at start, with an entity set column.
+    """
+    return pd.DataFrame({"Output_Entities": [{"Apple"}] * rows, "Overlap_PCT": [50.0] * rows},
+                        index=pd.RangeIndex(start, start + rows))
+
+
+class TestCheckpoint:
+    """
+    Test class for resumable evaluation checkpoints.
+    """
+
+    def test_resume_after_restart(self, tmp_path):
+        """
+        Test that saved shards survive a restart and load back unchanged, in order.
+        """
+        input_path = make_input(tmp_path)
+        checkpoint = Checkpoint(tmp_path / "run", input_path, 2, {'embedding': 'model'})
+        checkpoint.save_shard(0, shard(0))
+        checkpoint.save_shard(1, shard(2, rows=1))
+
+        resumed = Checkpoint(tmp_path / "run", input_path, 2, {'embedding': 'model'})
+        assert resumed.completed_shards == 2 and resumed.rows_done == 3
+        assert not resumed.complete
+        pd.testing.assert_frame_equal(pd.concat(resumed.iter_shards()), pd.concat([shard(0), shard(2, rows=1)]))
+
+        resumed.mark_complete()
+        manifest = json.loads((tmp_path / "run" / MANIFEST_NAME).read_text())
+        assert manifest['complete'] and [entry['rows'] for entry in manifest['shards']] == [2, 1]
+
+    def test_changed_run_starts_afresh(self, tmp_path):
+        """
+        Test that a different input, shard size, model version or shard layout discards the saved shards.
+        """
+        input_path = make_input(tmp_path)
+        Checkpoint(tmp_path / "run", input_path, 2, {'embedding': 'model'}).save_shard(0, shard(0))
+
+        assert Checkpoint(tmp_path / "run", input_path, 2, {'embedding': 'other'}).completed_shards == 0
+        Checkpoint(tmp_path / "run", input_path, 2, {'embedding': 'model'}).save_shard(0, shard(0))
+        assert Checkpoint(tmp_path / "run", input_path, 3, {'embedding': 'model'}).completed_shards == 0
+        Checkpoint(tmp_path / "run", input_path, 2, {'embedding': 'model'}).save_shard(0, shard(0))
+        with_input = Checkpoint(tmp_path / "run", input_path, 2, {'embedding': 'model'}, with_input=True)
+        assert with_input.completed_shards == 0
+        Checkpoint(tmp_path / "run", input_path, 2, {'embedding': 'model'}).save_shard(0, shard(0))
+        make_input(tmp_path, "Ground_Truth,Output\na,c\n")
+        assert Checkpoint(tmp_path / "run", input_path, 2, {'embedding': 'model'}).completed_shards == 0
+        assert not [path for path in (tmp_path / "run").iterdir() if path.name.startswith("shard-")]
+
+    def test_shards_saved_in_order(self, tmp_path):
+        """
+        Test that a shard cannot be saved ahead of the ones before it.
+        """
+        checkpoint = Checkpoint(tmp_path / "run", make_input(tmp_path), 2)
+        with pytest.raises(ValueError):
+            checkpoint.save_shard(1, shard(2))
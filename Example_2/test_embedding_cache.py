@@ -0,0 +1,116 @@
+import time
+import numpy as np
+from embedding_cache import EmbeddingCache
+
+
+def fake_encode(texts):
+    """
+    Deterministic stand-in for a sentence encoder: one 4-dimensional vector per text.
+    """
+    fake_encode.calls.append(list(texts))
+    return np.array([[len(text), text.count(" "), 1.0, 0.0] for text in texts], dtype=np.float32)
+
+
+fake_encode.calls = []
+
+
+class TestEmbeddingCache:
+    """
+    Test class for the embedding cache.
+
+    This class includes test cases for lookups, persistence and eviction of cached embeddings.
+    """
+
+    def test_encode_only_missing_texts(self):
+        """
+        Test that encode calls the encoder only for texts that are not cached yet.
+        """
+        cache = EmbeddingCache()
+        fake_encode.calls.clear()
+
+        first = cache.encode("model", ["Apple", "Banana", "Apple"], fake_encode)
+        assert first.shape == (3, 4)
+        assert fake_encode.calls == [["Apple", "Banana"]]
+
+        # Whitespace differences map to the same entry
+        second = cache.encode("model", ["  Apple ", "Cherry"], fake_encode)
+        assert fake_encode.calls[-1] == ["Cherry"]
+        assert np.array_equal(second[0], first[0])
+        assert cache.hits == 1
+        assert cache.misses == 4
+
+    def test_model_name_is_part_of_key(self):
+        """
+        Test that the same text embedded with different models is cached separately.
+        """
+        assert EmbeddingCache.make_key("model-a", "Apple") != EmbeddingCache.make_key("model-b", "Apple")
+        assert EmbeddingCache.make_key("model-a", "Apple  pie") == EmbeddingCache.make_key("model-a", "Apple pie")
+
+    def test_normalize(self):
+        """
+        Test that normalised embeddings have unit length.
+        """
+        cache = EmbeddingCache()
+        embeddings = cache.encode("model", ["Apple pie", "Banana"], fake_encode, normalize=True)
+        assert np.allclose(np.linalg.norm(embeddings, axis=1), 1.0)
+
+    def test_persistence_and_eviction(self, tmp_path):
+        """
+        Test that embeddings survive a new cache instance and that the disk store stays bounded.
+        """
+        path = str(tmp_path / "embeddings.sqlite")
+        cache = EmbeddingCache(path, max_entries=2, memory_entries=1)
+        cache.put_many("model", ["Apple"], fake_encode(["Apple"]))
+        cache.put_many("model", ["Banana", "Cherry"], fake_encode(["Banana", "Cherry"]))
+        assert len(cache) == 2
+        assert len(cache._memory) == 1
+        cache.close()
+
+        reopened = EmbeddingCache(path)
+        vectors = reopened.get_many("model", ["Apple", "Banana", "Cherry"])
+        assert vectors[0] is None
+        assert np.array_equal(vectors[1], fake_encode(["Banana"])[0])
+        assert vectors[2] is not None
+        reopened.close()
+
+    def test_memory_hits_count_as_uses(self, tmp_path):
+        """
+        Test that an entry read from memory is not the first one evicted from disk.
+        """
+        path = str(tmp_path / "embeddings.sqlite")
+        cache = EmbeddingCache(path, max_entries=2)
+        cache.put_many("model", ["Apple"], fake_encode(["Apple"]))
+        time.sleep(0.01)
+        cache.put_many("model", ["Banana"], fake_encode(["Banana"]))
+        time.sleep(0.01)
+        # Apple is served from memory, so only the in-memory LRU sees this use unless it is written back
+        assert cache.get_many("model", ["Apple"])[0] is not None
+        time.sleep(0.01)
+        cache.put_many("model", ["Cherry"], fake_encode(["Cherry"]))
+        assert len(cache) == 2
+        cache.close()
+
+        reopened = EmbeddingCache(path)
+        vectors = reopened.get_many("model", ["Apple", "Banana", "Cherry"])
+        assert vectors[0] is not None and vectors[1] is None and vectors[2] is not None
+        reopened.close()
+
+    def test_row_count_tracks_replacements_and_other_writers(self, tmp_path):
+        """
+        Test that replacing a stored entry does not count as a new row, and that rows added through
+        another connection are counted before evicting.
+        """
+        path = str(tmp_path / "embeddings.sqlite")
+        cache = EmbeddingCache(path, max_entries=3)
+        cache.put_many("model", ["Apple", "Banana"], fake_encode(["Apple", "Banana"]))
+        cache.put_many("model", ["Apple"], fake_encode(["Apple"]))
+        assert cache._disk_entries == 2
+
+        other = EmbeddingCache(path, max_entries=3)
+        other.put_many("model", ["Cherry", "Date"], fake_encode(["Cherry", "Date"]))
+        other.close()
+        assert len(cache) == 3
+
+        cache.put_many("model", ["Elderberry"], fake_encode(["Elderberry"]))
+        assert len(cache) == 3 and cache._disk_entries == 3
+        cache.close()
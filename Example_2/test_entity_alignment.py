@@ -0,0 +1,47 @@
+import numpy as np
+from entity_alignment import align_columns, optimal_match
+
+# Hand-made unit vectors: "U.S." is close to "United States", everything else is orthogonal
+VECTORS = {
+    "United States": [1.0, 0.0, 0.0],
+    "U.S.": [0.96, 0.28, 0.0],
+    "Apple": [0.0, 0.0, 1.0],
+    "Cupertino": [0.0, 1.0, 0.0],
+}
+
+
+def embed(entities):
+    return np.array([VECTORS[entity] for entity in entities])
+
+
+class TestEntityAlignment:
+    """
+    Test class for embedding-based entity alignment.
+    """
+
+    def test_optimal_match_is_one_to_one(self):
+        """
+        Test that each entity is matched at most once, most similar first, and weak pairs are dropped.
+        """
+        similarity = np.array([[0.9, 0.85], [0.88, 0.2]])
+        assert optimal_match(similarity, 0.5) == [(1, 0, 0.88), (0, 1, 0.85)]
+        assert optimal_match(similarity, 0.89) == [(0, 0, 0.9)]
+        assert optimal_match(similarity, 0.95) == []
+        assert optimal_match(np.empty((0, 3)), 0.5) == []
+
+    def test_optimal_match_maximises_total_similarity(self):
+        """
+        Test that the strongest pair is given up when that lets two entities match instead of one.
+        """
+        assert optimal_match(np.array([[0.9, 0.8], [0.85, 0.0]]), 0.5) == [(1, 0, 0.85), (0, 1, 0.8)]
+
+    def test_align_columns(self):
+        """
+        Test soft matches, recall and precision per row, including rows without entities.
+        """
+        alignments = align_columns([{"U.S.", "Apple"}, {"Cupertino"}, None],
+                                   [{"United States"}, {"Apple"}, {"Apple"}], embed, threshold=0.9)
+        assert alignments[0].matches == [("United States", "U.S.", 0.96)]
+        assert (alignments[0].recall, alignments[0].precision) == (0.96, 0.48)
+        assert alignments[1].matches == [] and alignments[1].recall == 0.0
+        assert alignments[2].recall == 0.0 and np.isnan(alignments[2].precision)
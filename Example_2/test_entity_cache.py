@@ -0,0 +1,72 @@
+import pytest
+from entity_cache import EntityCache
+from sqlite_lru import SQLiteLRUCache
+
+
+class TestEntityCache:
+    """
+    Test class for the named-entity cache.
+
+    This class includes test cases for lookups, counters and persistence of cached NER results.
+    """
+
+    def test_extract_only_missing_texts(self):
+        """
+        Test that extract runs NER once per distinct uncached text and counts hits and misses.
+        """
+        calls = []
+
+        def fake_ner(texts):
+            calls.append(list(texts))
+            return [[word for word in text.split() if word.istitle()] for text in texts]
+
+        cache = EntityCache()
+        texts = ["Apple hired Steve Jobs", "the fox", "Apple hired Steve Jobs"]
+        result = cache.extract("en_core_web_sm-3.7.1", texts, fake_ner)
+        assert result == [["Apple", "Steve", "Jobs"], [], ["Apple", "Steve", "Jobs"]]
+        assert calls == [["Apple hired Steve Jobs", "the fox"]]
+
+        cache.extract("en_core_web_sm-3.7.1", ["the fox"], fake_ner)
+        assert len(calls) == 1
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 3
+
+        # A different model version must not reuse the results
+        cache.extract("en_core_web_sm-3.8.0", ["the fox"], fake_ner)
+        assert len(calls) == 2
+
+    def test_persistence(self, tmp_path):
+        """
+        Test that cached results are available to a new cache instance backed by the same file.
+        """
+        path = str(tmp_path / "entities.sqlite")
+        cache = EntityCache(path)
+        cache.put_many("model", ["Apple is in Cupertino"], [["Apple", "Cupertino"]])
+        cache.close()
+
+        reopened = EntityCache(path)
+        assert reopened.get_many("model", ["Apple is in Cupertino", "other"]) == [["Apple", "Cupertino"], None]
+        assert reopened.stats()['hit_rate'] == 0.5
+        reopened.close()
+
+    def test_disk_store_is_bounded(self, tmp_path):
+        """
+        Test that the SQLite file keeps at most max_entries results, dropping the least recently used.
+        """
+        cache = EntityCache(str(tmp_path / "entities.sqlite"), max_entries=2, memory_entries=1)
+        cache.put_many("model", ["Apple"], [["Apple"]])
+        cache.put_many("model", ["Omnicom", "Cupertino"], [["Omnicom"], ["Cupertino"]])
+        assert len(cache) == 2
+        cache.clear()
+        assert len(cache) == 0 and cache.stats()['hits'] == 0
+        cache.close()
+
+    def test_serialisation_is_abstract(self):
+        """
+        Test that a cache that does not say how to store its values cannot be created.
+        """
+        class NoSerialisationCache(SQLiteLRUCache):
+            table = 'values'
+
+        with pytest.raises(TypeError):
+            NoSerialisationCache()
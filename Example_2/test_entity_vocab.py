@@ -0,0 +1,36 @@
+from entity_vocab import EntityVocabulary
+
+
+class TestEntityVocab:
+    """
+    Test class for the interned entity vocabulary and its ragged ID arrays.
+    """
+
+    def test_intern_and_decode(self):
+        """
+        Test that each string gets one ID and that encoded rows decode back to the same sets.
+        """
+        vocab = EntityVocabulary()
+        column = [{"Apple", "Cupertino"}, None, {"Apple"}, set()]
+        ragged = vocab.encode(column)
+        assert len(vocab) == 2
+        assert vocab.intern("Apple") == vocab.intern("Apple")
+        assert ragged.lengths().tolist() == [2, 0, 1, 0]
+        assert vocab.decode(ragged) == [{"Apple", "Cupertino"}, set(), {"Apple"}, set()]
+        assert vocab.decode(ragged, rows=[2]) == [None, None, {"Apple"}, None]
+
+    def test_row_wise_set_operations(self):
+        """
+        Test that union, difference and intersection over all rows match per-row Python set arithmetic.
+        """
+        vocab = EntityVocabulary()
+        left_column = [{"a", "b"}, None, {"c"}, {"a", "d"}, {"b"}]
+        right_column = [{"b", "e"}, {"x"}, None, {"a", "d"}, {"c"}]
+        left, right = vocab.encode(left_column), vocab.encode(right_column)
+        left_sets = [entities or set() for entities in left_column]
+        right_sets = [entities or set() for entities in right_column]
+
+        assert vocab.decode(left.union(right)) == [a | b for a, b in zip(left_sets, right_sets)]
+        assert vocab.decode(left.difference(right)) == [a - b for a, b in zip(left_sets, right_sets)]
+        assert vocab.decode(right.difference(left)) == [b - a for a, b in zip(left_sets, right_sets)]
+        assert vocab.decode(left.intersection(right)) == [a & b for a, b in zip(left_sets, right_sets)]
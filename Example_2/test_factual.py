@@ -1,5 +1,15 @@
+import os
+import pickle
+import subprocess
+import sys
+import numpy as np
 import pandas as pd
+import pytest
+from entity_cache import EntityCache
 from factual_accuracy import TestFactualAccuracy
+from shared.model_registry import registry
+from run_manifest import RunManifest
+from similarity_backends import CascadeBackend, LexicalBackend
 """
 These are the import statements
 """
@@ -13,6 +23,22 @@ class TestFactualAccuracy:
 
     test_factual_accuracy = TestFactualAccuracy()
 
+    def test_import_is_lazy(self):
+        """
+        Test that importing the module and building the scorer does not load the heavy dependencies.
+
+        This function imports factual_accuracy in a fresh interpreter, creates a TestFactualAccuracy
+        object and checks that spaCy, pandas and the sentence-transformers stack were not imported.
+        """
+        code = ("import sys, factual_accuracy; factual_accuracy.TestFactualAccuracy(); "
+                "print(sorted(m for m in ('spacy', 'pandas', 'torch', 'sentence_transformers') if m in sys.modules))")
+        here = os.path.dirname(os.path.abspath(__file__))
+        # The shared package is imported from the repository root, as pytest.ini does for the tests
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(here))
+        output = subprocess.run([sys.executable, "-c", code], cwd=here, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        assert output.strip() == "[]"
+
     def test_extract_named_entities(self):
         """
         Test if named entities are correctly extracted from the text.
@@ -30,6 +56,45 @@ class TestFactualAccuracy:
         assert isinstance(result_multiple_entities, set)
         assert result_multiple_entities == {'Steve Jobs', 'Apple'}
 
+    def test_extract_named_entities_batch(self):
+        """
+        Test that batch extraction returns the same entities as extracting one text at a time.
+
+        This function tests the extract_named_entities_batch method of the TestFactualAccuracy class,
+        checking that results stay aligned with the input rows, including rows without entities.
+        """
+        texts = ["Apple is a tech company. Steve Jobs co-founded Apple.",
+                 "The quick brown fox jumps over the lazy dog.",
+                 "Apple is a tech company. Steve Jobs co-founded Apple."]
+        result = self.test_factual_accuracy.extract_named_entities_batch(texts, batch_size=2)
+        assert len(result) == len(texts)
+        assert result == [self.test_factual_accuracy.extract_named_entities(text) for text in texts]
+        assert result[1] is None
+
+        # Test with missing values, which are treated as empty text
+        result_missing = self.test_factual_accuracy.extract_named_entities_batch(pd.Series([None, float("nan")]))
+        assert result_missing == [None, None]
+
+    def test_rule_based_entities_are_kept(self):
+        """
+        Test that pipelines whose entities come from rules still find them.
+
+        This function gives a scorer a pipeline with an entity_ruler and no statistical NER, and checks
+        that the ruler stays enabled while components that do not set entities are skipped.
+        """
+        import spacy
+
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        nlp.add_pipe("entity_ruler").add_patterns([{"label": "ORG", "pattern": "Apple"}])
+        span_ruler = nlp.add_pipe("span_ruler", config={"annotate_ents": True, "overwrite": False})
+        span_ruler.add_patterns([{"label": "GPE", "pattern": "Cupertino"}])
+        scorer = type(self.test_factual_accuracy)()
+        scorer._nlp = nlp
+        assert scorer._ner_disabled_components() == ["sentencizer"]
+        assert scorer.extract_named_entities_batch(["Apple is in Cupertino.", "Nothing here."]) == [
+            {"Apple", "Cupertino"}, None]
+
     def test_check_factual_accuracy(self):
         """
         Test if the check_factual_accuracy method correctly identifies facts in output entities.
@@ -66,6 +131,20 @@ class TestFactualAccuracy:
                                                                                    ground_truth_entities)
         assert result_true_diff_order is True
 
+    def test_check_factual_accuracy_batch(self):
+        """
+        Test that the column-wide check gives the same answer as checking each row.
+
+        This function tests the check_factual_accuracy_batch method of the TestFactualAccuracy class,
+        including rows where either side has no entities.
+        """
+        output_column = [["Apple", "American", "Cupertino"], ["Banana"], None, ["Apple"]]
+        ground_truth_column = [["Apple", "Cupertino"], ["Apple"], ["Apple"], None]
+        result = self.test_factual_accuracy.check_factual_accuracy_batch(output_column, ground_truth_column)
+        expected = [self.test_factual_accuracy.check_factual_accuracy(output_entities, ground_truth_entities)
+                    for output_entities, ground_truth_entities in zip(output_column, ground_truth_column)]
+        assert result.tolist() == expected == [True, False, False, False]
+
     def test_get_unique_entities(self):
         """
         Test the get_unique_entities method with various scenarios.
@@ -169,6 +248,25 @@ class TestFactualAccuracy:
         result_ground_truth_none = self.test_factual_accuracy.get_unique_entities_in_ground_truth(ground_truth_entities_none, output_entities)
         assert result_ground_truth_none == "no_named_entities in Ground_truth"
 
+    def test_compare_entity_columns(self):
+        """
+        Test that the column-wide integer-ID comparison matches the get_unique_* methods row by row.
+
+        This function tests the compare_entity_columns method of the TestFactualAccuracy class,
+        covering identical rows, rows without unique entities and rows where either side is None.
+        """
+        output_column = [{"Apple", "Cupertino"}, {"Apple", "Banana"}, {"Apple"}, None, {"Apple"}, None]
+        ground_truth_column = [{"Apple", "Cupertino"}, {"Apple", "Cherry"}, {"Apple", "Cherry"}, {"Apple"}, None, None]
+        result = self.test_factual_accuracy.compare_entity_columns(output_column, ground_truth_column)
+        rows = list(zip(output_column, ground_truth_column))
+        assert result['All_Unique_Entities'] == [self.test_factual_accuracy.get_unique_entities(output_entities,
+                                                                                                ground_truth_entities)
+                                                 for output_entities, ground_truth_entities in rows]
+        assert result['Unique_In_Output'] == [self.test_factual_accuracy.get_unique_entities_in_output(
+            output_entities, ground_truth_entities) for output_entities, ground_truth_entities in rows]
+        assert result['Unique_in_Ground_Truth'] == [self.test_factual_accuracy.get_unique_entities_in_ground_truth(
+            ground_truth_entities, output_entities) for output_entities, ground_truth_entities in rows]
+
     def test_calculate_overlap_pct(self):
         """
         Test if cosine similarity is correctly calculated between two sets of entities.
@@ -187,6 +285,82 @@ class TestFactualAccuracy:
         result_diff = self.test_factual_accuracy.calculate_overlap_pct(output_entities_diff, ground_truth_entities_diff)
         assert isinstance(result_diff, float)
 
+    def test_calculate_overlap_pct_batch(self):
+        """
+        Test that bulk overlap scoring matches scoring each row on its own.
+
+        This function tests the calculate_overlap_pct_batch method of the TestFactualAccuracy class,
+        checking that one batched encode pass gives the same per-row percentages as calculate_overlap_pct.
+        """
+        ground_truths = ["Apple is a tech company.", "Omni L&D hosts the sessions.", "Apple is a tech company."]
+        outputs = ["Steve Jobs co-founded Apple.", "Omni L&D hosts the sessions.", "Bananas are yellow."]
+        result = self.test_factual_accuracy.calculate_overlap_pct_batch(ground_truths, outputs)
+        assert len(result) == len(outputs)
+
+        expected = [self.test_factual_accuracy.calculate_overlap_pct(ground_truth, output)
+                    for ground_truth, output in zip(ground_truths, outputs)]
+        assert all(abs(got - want) <= 0.02 for got, want in zip(result, expected))
+        assert result[1] == max(result)
+
+    def test_score_multi_reference(self):
+        """
+        Test scoring each output against several reference answers.
+
+        This function tests the score_multi_reference method of the TestFactualAccuracy class,
+        checking the best-matching reference, the max/mean ordering and rows without references.
+        """
+        references = [["Bananas are yellow.", "Apple is a tech company based in Cupertino."], [], "Omni L&D",
+                      float("nan")]
+        outputs = ["Apple is a tech company based in Cupertino.", "Anything", "Omni L&D", "Anything"]
+        result = self.test_factual_accuracy.score_multi_reference(references, outputs)
+        assert result['Reference_Count'].tolist() == [2, 0, 1, 0]
+        assert result['Best_Reference'].tolist() == [1, -1, 0, -1]
+        assert result.loc[0, 'Max_Overlap_PCT'] >= result.loc[0, 'Mean_Overlap_PCT']
+        assert pd.isna(result.loc[1, 'Max_Overlap_PCT'])
+        assert result.loc[1, 'Result'] == False
+
+    def test_nearest_references(self, tmp_path):
+        """
+        Test corpus-wide nearest-reference lookup through a prebuilt index.
+
+        This function builds a reference index with the build_reference_index method and checks that
+        nearest_references finds each output's matching reference among all of them.
+        """
+        references = ["Bananas are yellow.", "Apple is a tech company based in Cupertino.", "Omni L&D"]
+        index = self.test_factual_accuracy.build_reference_index(references, tmp_path / "index")
+        result = self.test_factual_accuracy.nearest_references(["Omni L&D", "Bananas are yellow."], index, k=2)
+        assert [ids[0] for ids in result['Reference_Ids']] == [2, 0]
+        assert result['Nearest_Reference'].tolist() == ["Omni L&D", "Bananas are yellow."]
+        assert (result['Nearest_Similarity'] > 99).all()
+
+    def test_model_registry_shared(self):
+        """
+        Test that the embedding model is loaded once and shared between scorer instances.
+
+        This function checks that two TestFactualAccuracy objects with the same model name and device
+        get the same model object from the registry, and that release_model drops it.
+        """
+        other_scorer = type(self.test_factual_accuracy)()
+        assert self.test_factual_accuracy.model is other_scorer.model
+        assert registry.is_loaded(other_scorer.model_name, other_scorer.device)
+
+        assert other_scorer.release_model() is True
+        assert not registry.is_loaded(other_scorer.model_name, other_scorer.device)
+        assert other_scorer.release_model() is False
+
+    def test_warm_up_skips_unused_transformer(self):
+        """
+        Test that warming up a scorer with another similarity backend does not load the transformer.
+
+        This function checks that warm_up loads the spaCy pipeline but leaves the embedding model
+        unloaded when a LexicalBackend scores overlap, as worker processes rely on.
+        """
+        registry.release_all()
+        scorer = type(self.test_factual_accuracy)(similarity_backend=LexicalBackend())
+        scorer.warm_up()
+        assert scorer._nlp is not None
+        assert not registry.is_loaded(scorer.model_name, scorer.device)
+
     def test_extract_data_from_file(self):
         """
         Test if data is correctly extracted from a CSV file and factual accuracy is checked.
@@ -221,6 +395,305 @@ class TestFactualAccuracy:
         df = pd.DataFrame(data)
         return df
 
+    def test_score_dataframe_parallel(self):
+        """
+        Test that scoring on worker processes gives the same result as the serial path.
+
+        This function tests the score_dataframe_parallel method of the TestFactualAccuracy class with
+        the transformer and every kind of similarity backend, checking that shards are reassembled in the
+        original row order and that a backend fitting its weights on each shard is refused.
+        """
+        df = pd.concat([self.fake_data()] * 3, ignore_index=True)
+        tfidf = LexicalBackend('tfidf').fit(df['Ground_Truth'].tolist() + df['Output'].tolist())
+        backends = (None, LexicalBackend(), tfidf,
+                    CascadeBackend(fast=LexicalBackend(), accurate=tfidf, low=0.2, high=0.8))
+        for backend in backends:
+            scorer = type(self.test_factual_accuracy)(similarity_backend=backend)
+            serial_df = scorer.score_dataframe(df)
+            parallel_df = scorer.score_dataframe_parallel(df, n_workers=2, shard_size=2)
+            assert list(parallel_df.index) == list(df.index)
+            pd.testing.assert_frame_equal(parallel_df, serial_df)
+
+        scorer = type(self.test_factual_accuracy)(similarity_backend=LexicalBackend('tfidf'))
+        with pytest.raises(ValueError, match="score_dataframe_parallel"):
+            scorer.score_dataframe_parallel(df, n_workers=2, shard_size=2)
+
+    def test_cascade_counters_parallel(self):
+        """
+        Test that the rows a cascade backend scores and rescores are counted across worker processes.
+
+        This function scores the same rows serially and on two workers with a cascade of two lexical
+        backends, and checks that both runs report the same counters and the same rescored rows.
+        """
+        backend = CascadeBackend(fast=LexicalBackend(),
+                                 accurate=LexicalBackend(analyzer='char_wb', ngram_range=(2, 3)), low=0.2, high=0.8)
+        df = pd.concat([self.fake_data()] * 3, ignore_index=True)
+        serial = type(self.test_factual_accuracy)(similarity_backend=backend)
+        parallel = type(self.test_factual_accuracy)(similarity_backend=backend)
+        serial_df = serial.score_dataframe(df)
+        parallel_df = parallel.score_dataframe_parallel(df, n_workers=2, shard_size=2)
+        pd.testing.assert_frame_equal(parallel_df, serial_df)
+        assert serial_df['Overlap_Rescored'].dtype == bool
+
+        for scorer in (serial, parallel):
+            assert scorer.metrics.counters['cascade_rows_scored'] == len(df)
+            assert scorer.metrics.counters['cascade_rows_rescored'] == serial_df['Overlap_Rescored'].sum()
+
+    def test_config_sends_backend_settings(self):
+        """
+        Test that the settings sent to worker processes describe the similarity backend instead of holding it.
+
+        This function checks that config() of a scorer with a lexical backend pickles without the backend
+        object and that from_config builds a scorer giving the same scores.
+        """
+        scorer = type(self.test_factual_accuracy)(similarity_backend=LexicalBackend('tfidf'))
+        config = pickle.loads(pickle.dumps(scorer.config()))
+        assert config['similarity_backend']['class'] == 'LexicalBackend'
+        rebuilt = type(self.test_factual_accuracy).from_config(config)
+        assert rebuilt.similarity_backend is not scorer.similarity_backend
+        pd.testing.assert_frame_equal(rebuilt.score_dataframe(self.fake_data()),
+                                      scorer.score_dataframe(self.fake_data()))
+
+    def test_score_dataframe_keeps_none(self):
+        """
+        Test that missing entities stay None rather than becoming NaN.
+
+        This function scores rows whose result columns mix None with sentinel strings, which pandas
+        would otherwise read as a string column with NaN for the missing values.
+        """
+        df = pd.DataFrame({'Ground_Truth': ['x', None], 'Output': ['y', 'Apple']})
+        result = self.test_factual_accuracy.score_dataframe(df)
+        assert result['Unique_in_Ground_Truth'].tolist() == [None, 'no_named_entities in Ground_truth']
+        assert result['Ground_Truth_Entities'].tolist() == [None, None]
+
+    def test_score_table(self):
+        """
+        Test that the columnar result table holds the same results as score_dataframe.
+
+        This function tests the score_table method of the TestFactualAccuracy class, checking that
+        to_frame rebuilds the legacy frame and that the unattested filter picks the rows whose ground
+        truth has entities the output lacks.
+        """
+        df = pd.concat([self.fake_data(), pd.DataFrame({'Ground_Truth': ["Apple is based in Cupertino.", None],
+                                                        'Output': ["Apple makes phones.", "Apple"]})],
+                       ignore_index=True)
+        table = self.test_factual_accuracy.score_table(df)
+        expected = self.test_factual_accuracy.score_dataframe(df)
+        pd.testing.assert_frame_equal(table.to_frame(), expected)
+        unattested = [isinstance(value, set) for value in expected['Unique_in_Ground_Truth']]
+        assert table.select(table.unattested()).index.tolist() == df.index[unattested].tolist()
+
+    def test_align_entities(self):
+        """
+        Test aligning entities by embedding similarity, alone and as extra score_dataframe columns.
+
+        This function tests the align_entities method and the align_threshold option of score_dataframe,
+        checking soft recall and precision when the output has an entity the ground truth lacks.
+        """
+        alignment = self.test_factual_accuracy.align_entities({"Apple", "Cupertino"}, {"Apple"}, threshold=0.8)
+        assert [(ground_truth, output) for ground_truth, output, _ in alignment.matches] == [("Apple", "Apple")]
+        assert (alignment.recall, alignment.precision) == (1.0, 0.5)
+
+        df = pd.DataFrame({'Ground_Truth': ["Apple is based in Cupertino."],
+                           'Output': ["Apple is based in Cupertino."]})
+        result = self.test_factual_accuracy.score_dataframe(df, align_threshold=0.8)
+        assert result[['Soft_Recall', 'Soft_Precision']].values.tolist() == [[1.0, 1.0]]
+
+    def test_long_document_ner(self):
+        """
+        Test that documents longer than long_document_chars are chunked for NER without losing entities.
+
+        This function gives a scorer a small long_document_chars, so the document below is split into
+        chunks, and checks its entities and their offsets against the full text.
+        """
+        text = "\n\n".join(["Apple is based in Cupertino."] * 20)
+        scorer = type(self.test_factual_accuracy)(long_document_chars=100)
+        assert scorer.extract_named_entities(text) == {"Apple", "Cupertino"}
+        assert scorer.extract_named_entities_batch([text, "Nothing here."]) == [{"Apple", "Cupertino"}, None]
+        spans = scorer.extract_entity_spans(text, max_chunk_chars=100)
+        assert len(spans) == 40
+        assert all(text[entity.start:entity.end] == entity.text for entity in spans)
+
+    def test_entity_cache_keyed_on_long_document_chars(self):
+        """
+        Test that scorers with different long_document_chars do not reuse each other's cached entities.
+
+        This function shares one EntityCache between two scorers that parse the same text whole and in
+        chunks, and checks that the second scorer runs NER instead of reading the first one's entities.
+        """
+        text = "\n\n".join(["Apple is based in Cupertino."] * 20)
+        cache = EntityCache()
+        whole = type(self.test_factual_accuracy)(entity_cache=cache)
+        chunked = type(self.test_factual_accuracy)(entity_cache=cache, long_document_chars=100)
+        whole.extract_named_entities_batch([text])
+        assert chunked.extract_named_entities_batch([text]) == [{"Apple", "Cupertino"}]
+        assert chunked.metrics.counters['texts_parsed'] == 1
+        assert chunked.extract_named_entities_batch([text]) == [{"Apple", "Cupertino"}]
+        assert chunked.metrics.counters['texts_parsed'] == 1
+
+    def test_long_text_embeddings(self):
+        """
+        Test that long_text_embeddings compares texts beyond the model's window instead of truncating them.
+
+        This function scores two texts that share a long opening and differ only after it: truncated
+        embeddings see identical texts, pooled chunk embeddings do not.
+        """
+        opening = "Apple is a tech company based in Cupertino. " * 100
+        output = opening + "Omni L&D hosts the recorded sessions and presentation decks. " * 30
+        ground_truth = opening + "Bananas are yellow and grow in tropical countries. " * 30
+        assert self.test_factual_accuracy.calculate_overlap_pct(output, ground_truth) == 100.0
+        scorer = type(self.test_factual_accuracy)(long_text_embeddings=True)
+        assert scorer.calculate_overlap_pct(output, output) == 100.0
+        assert scorer.calculate_overlap_pct(output, ground_truth) < 100.0
+
+    def test_score_dataframe_incremental(self, tmp_path):
+        """
+        Test that rescoring an edited frame against a run manifest only scores the changed row.
+
+        This function scores a frame with the score_dataframe_incremental method, edits one row and
+        rescores it, checking that the result equals a full score_dataframe of the edited frame, and
+        that a scorer with another similarity backend or long-document threshold reuses nothing.
+        """
+        df = pd.concat([self.fake_data()] * 2 + [pd.DataFrame({'Ground_Truth': [None], 'Output': ['Apple']})],
+                       ignore_index=True)
+        df.index = df.index * 10
+        scorer = type(self.test_factual_accuracy)()
+        manifest = RunManifest(str(tmp_path / "manifest.sqlite"))
+        first = scorer.score_dataframe_incremental(df, manifest)
+        pd.testing.assert_frame_equal(first, scorer.score_dataframe(df))
+
+        edited = df.copy()
+        edited.loc[10, 'Output'] = "Apple is a tech company based in Cupertino."
+        scorer.metrics.reset()
+        rescored = scorer.score_dataframe_incremental(edited, manifest)
+        assert scorer.metrics.counters['rows_scored'] == 1
+        assert scorer.metrics.counters['rows_reused'] == 4
+        pd.testing.assert_frame_equal(rescored, scorer.score_dataframe(edited))
+
+        for other in (type(scorer)(similarity_backend=LexicalBackend()), type(scorer)(long_document_chars=100)):
+            other.score_dataframe_incremental(edited, manifest)
+            assert other.metrics.counters['rows_reused'] == 0
+        manifest.close()
+
+    def test_score_dataframe_incremental_cascade(self, tmp_path):
+        """
+        Test that results reused from a run manifest keep every column score_dataframe produces.
+
+        This function scores a frame with a cascade backend through a manifest, then rescores it
+        with one row edited, checking that both runs keep the 'Overlap_Rescored' column.
+        """
+        backend = CascadeBackend(fast=LexicalBackend(),
+                                 accurate=LexicalBackend(analyzer='char_wb', ngram_range=(2, 3)), low=0.2, high=0.8)
+        scorer = type(self.test_factual_accuracy)(similarity_backend=backend)
+        df = pd.concat([self.fake_data()] * 2, ignore_index=True)
+        manifest = RunManifest(str(tmp_path / "manifest.sqlite"))
+        pd.testing.assert_frame_equal(scorer.score_dataframe_incremental(df, manifest), scorer.score_dataframe(df))
+
+        edited = df.copy()
+        edited.loc[1, 'Output'] = "Omni L&D is the learning platform."
+        scorer.metrics.reset()
+        rescored = scorer.score_dataframe_incremental(edited, manifest)
+        assert scorer.metrics.counters['rows_reused'] == 3
+        pd.testing.assert_frame_equal(rescored, scorer.score_dataframe(edited))
+        assert 'Overlap_Rescored' in rescored.columns
+        manifest.close()
+
+    def test_batch_dependent_backend_rejected(self, tmp_path):
+        """
+        Test that the paths scoring rows in separate batches refuse an unfitted TF-IDF backend and accept a fitted one.
+        """
+        df = self.fake_data()
+        df.to_csv(tmp_path / "input.csv", index=False)
+        scorer = type(self.test_factual_accuracy)(similarity_backend=LexicalBackend('tfidf'))
+        with pytest.raises(ValueError, match="fit it on a fixed corpus"):
+            scorer.evaluate_streaming(tmp_path / "input.csv", tmp_path / "output.csv")
+        with pytest.raises(ValueError, match="fit it on a fixed corpus"):
+            scorer.score_dataframe_incremental(df, RunManifest(str(tmp_path / "manifest.sqlite")))
+
+        scorer.similarity_backend.fit(df['Ground_Truth'].tolist() + df['Output'].tolist())
+        assert scorer.evaluate_streaming(tmp_path / "input.csv", tmp_path / "output.csv", chunk_size=2) == len(df)
+        pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "output.csv")[['Overlap_PCT']],
+                                      scorer.score_dataframe(df)[['Overlap_PCT']])
+
+    def test_evaluate_streaming(self, tmp_path, capsys):
+        """
+        Test that scoring a file chunk by chunk writes the same results as scoring it whole.
+
+        This function streams a CSV into Parquet and a Parquet file into CSV with evaluate_streaming,
+        using chunk sizes that do and do not divide the row count, and compares the output with
+        score_dataframe on the whole file.
+        """
+        df = pd.concat([self.fake_data()] * 3 + [pd.DataFrame({'Ground_Truth': [None], 'Output': ['Apple']})],
+                       ignore_index=True)
+        expected = self.test_factual_accuracy.score_dataframe(df)
+        df.to_csv(tmp_path / "input.csv", index=False)
+        df.to_parquet(tmp_path / "input.parquet", index=False)
+
+        for input_name, output_name, chunk_size in (("input.csv", "output.parquet", 3),
+                                                     ("input.parquet", "output.csv", 7),
+                                                     ("input.csv", "single.csv", 100)):
+            rows = self.test_factual_accuracy.evaluate_streaming(tmp_path / input_name, tmp_path / output_name,
+                                                                 chunk_size=chunk_size)
+            output_path = tmp_path / output_name
+            streamed = pd.read_parquet(output_path) if output_name.endswith(".parquet") else pd.read_csv(output_path)
+            assert rows == len(df) == len(streamed)
+            assert "Per-stage timings:" in capsys.readouterr().out
+            assert list(streamed.index) == list(range(len(df)))
+            assert streamed['Output'].tolist() == df['Output'].tolist()
+            assert streamed['Result'].tolist() == expected['Result'].tolist()
+            assert np.allclose(streamed['Overlap_PCT'], expected['Overlap_PCT'])
+            if output_name.endswith(".parquet"):
+                assert [None if entities is None else set(entities) for entities in streamed['Output_Entities']] \
+                    == expected['Output_Entities'].tolist()
+
+    def test_checkpoint_resume(self, tmp_path, monkeypatch):
+        """
+        Test that a checkpointed run interrupted part way resumes to the same output as an uninterrupted run.
+
+        This function crashes extract_data_from_file and evaluate_streaming on their third shard, reruns
+        them from the checkpoint and compares the results, and checks that a checkpoint written by one
+        method is not resumed by the other, whose shards have a different layout.
+        """
+        df = pd.concat([self.fake_data()] * 4, ignore_index=True)
+        df.loc[5, 'Output'] = "Apple is based in Cupertino."
+        input_path = tmp_path / "input.xlsx"
+        df.to_excel(input_path, index=False)
+        scorer = type(self.test_factual_accuracy)()
+        expected = scorer.extract_data_from_file(input_path)
+        expected_stream = pd.concat([df, scorer.score_dataframe(df)], axis=1)
+
+        score_chunk = scorer._score_chunk
+        calls = []
+
+        def crash_on_third_shard(chunk, *args, **kwargs):
+            calls.append(list(chunk.index))
+            if len(calls) == 3:
+                raise RuntimeError("interrupted")
+            return score_chunk(chunk, *args, **kwargs)
+
+        monkeypatch.setattr(scorer, '_score_chunk', crash_on_third_shard)
+        for run in (lambda: scorer.extract_data_from_file(input_path, checkpoint_dir=tmp_path / "file", shard_size=3),
+                    lambda: scorer.evaluate_streaming(input_path, tmp_path / "out.csv", chunk_size=3,
+                                                      checkpoint_dir=tmp_path / "stream")):
+            calls.clear()
+            with pytest.raises(RuntimeError):
+                run()
+            calls.clear()
+            run()
+            assert calls == [[6, 7]]
+        monkeypatch.undo()
+
+        pd.testing.assert_frame_equal(
+            scorer.extract_data_from_file(input_path, checkpoint_dir=tmp_path / "file", shard_size=3), expected)
+        streamed = pd.read_csv(tmp_path / "out.csv")
+        assert streamed[['Ground_Truth', 'Output', 'Result']].equals(
+            expected_stream[['Ground_Truth', 'Output', 'Result']])
+        assert np.allclose(streamed['Overlap_PCT'], expected_stream['Overlap_PCT'])
+
+        # Shards saved without the input columns must not be resumed by a streaming run
+        scorer.evaluate_streaming(input_path, tmp_path / "mixed.csv", chunk_size=3, checkpoint_dir=tmp_path / "file")
+        assert list(pd.read_csv(tmp_path / "mixed.csv").columns[:2]) == ['Ground_Truth', 'Output']
+
     def test_factual_accuracy_with_fake_data(self):
         """
         Test factual accuracy using fake data when the file is not found.
@@ -0,0 +1,74 @@
+import json
+import time
+from instrumentation import Metrics, profile
+
+
+class TestInstrumentation:
+    """
+    Test class for the per-stage timers and counters.
+    """
+
+    def test_stage_timing_and_counters(self):
+        """
+        Test that stages accumulate calls and time and that counters add up.
+        """
+        metrics = Metrics()
+        for _ in range(3):
+            with metrics.stage('ner'):
+                time.sleep(0.001)
+        metrics.count('texts_parsed', 5)
+        metrics.count('texts_parsed')
+
+        summary = metrics.summary()
+        assert summary['stages']['ner']['calls'] == 3
+        assert summary['stages']['ner']['total_s'] >= 0.003
+        assert summary['counters'] == {'texts_parsed': 6}
+        assert 'ner' in metrics.report()
+
+    def test_merge_snapshot(self):
+        """
+        Test that a snapshot from another Metrics object, e.g. a worker process, is merged in.
+        """
+        worker = Metrics()
+        with worker.stage('embedding'):
+            pass
+        worker.count('texts_encoded', 4)
+
+        metrics = Metrics()
+        with metrics.stage('embedding'):
+            pass
+        metrics.merge(worker.snapshot())
+        assert metrics.summary()['stages']['embedding']['calls'] == 2
+        assert metrics.counters['texts_encoded'] == 4
+
+    def test_dump_json_and_profile(self, tmp_path):
+        """
+        Test that the summary is written as JSON and that the cProfile hook saves its stats.
+        """
+        metrics = Metrics()
+        profile_path = tmp_path / "run.prof"
+        with profile('cprofile', str(profile_path)):
+            with metrics.stage('read'):
+                sum(range(1000))
+
+        metrics_path = tmp_path / "metrics.json"
+        metrics.dump_json(metrics_path)
+        assert json.loads(metrics_path.read_text())['stages']['read']['calls'] == 1
+        assert profile_path.stat().st_size > 0
+
+    def test_nested_stages_self_time(self):
+        """
+        Test that a nested stage counts towards its parent's total time but not its self time.
+        """
+        metrics = Metrics()
+        with metrics.stage('alignment'):
+            with metrics.stage('embedding'):
+                time.sleep(0.02)
+        worker = Metrics()
+        worker.merge(metrics.snapshot())
+
+        stages = worker.summary()['stages']
+        assert stages['alignment']['total_s'] >= stages['embedding']['total_s'] >= 0.02
+        assert stages['alignment']['self_s'] < 0.01
+        assert stages['embedding']['self_s'] == stages['embedding']['total_s']
+        assert worker.report().splitlines()[1].startswith('embedding')
@@ -0,0 +1,37 @@
+import spacy
+from long_document import Entity, extract_entities_chunked, iter_chunk_spans
+
+
+def make_nlp():
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "ORG", "pattern": "Apple"}, {"label": "GPE", "pattern": "Cupertino"}])
+    return nlp
+
+
+class TestLongDocument:
+    """
+    Test class for chunked NER over long documents.
+    """
+
+    def test_chunks_prefer_paragraph_and_sentence_boundaries(self):
+        """
+        Test that chunks stay within the size limit, end on boundaries where possible and cover the text.
+        """
+        text = "First paragraph. Apple.\n\nSecond one is here. Cupertino!\n\n" + "word " * 40
+        spans = list(iter_chunk_spans(text, max_chars=30, overlap=8))
+        assert all(end - start <= 30 for start, end, _ in spans)
+        assert text[spans[0][0]:spans[0][1]] == "First paragraph. Apple.\n\n"
+        assert spans[0][0] == 0 and spans[-1][1] == len(text)
+        assert all(owned_end == next_start for (_, _, owned_end), (next_start, _, _) in zip(spans, spans[1:]))
+
+    def test_entities_keep_document_offsets(self):
+        """
+        Test that entities from every chunk are found once, with offsets into the whole document.
+        """
+        text = " ".join(["Apple opened in Cupertino"] * 500)
+        entities = extract_entities_chunked(make_nlp(), text, max_chars=200, overlap=40)
+        assert len(entities) == 1000
+        assert entities[0] == Entity("Apple", 0, 5, "ORG")
+        assert all(text[entity.start:entity.end] == entity.text for entity in entities)
+        assert len({(entity.start, entity.end) for entity in entities}) == len(entities)
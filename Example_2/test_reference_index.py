@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from reference_index import ReferenceIndex, blocked_top_k
+
+
+def embed(texts):
+    """
+    Deterministic unit-length embeddings seeded by each text.
+    """
+    vectors = np.array([np.random.default_rng(sum(map(ord, text))).standard_normal(8) for text in texts])
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestReferenceIndex:
+    """
+    Test class for the memory-mapped reference embedding index.
+    """
+
+    def test_blocked_top_k_matches_full_sort(self):
+        """
+        Test that the blocked search returns the same neighbours as sorting every score.
+        """
+        rng = np.random.default_rng(0)
+        matrix = rng.standard_normal((1000, 16)).astype(np.float32)
+        queries = rng.standard_normal((7, 16)).astype(np.float32)
+        scores, ids = blocked_top_k(matrix, queries, k=5, block_rows=64)
+        expected = np.argsort(-(queries @ matrix.T), axis=1)[:, :5]
+        assert np.array_equal(ids, expected)
+        assert np.allclose(scores, np.take_along_axis(queries @ matrix.T, expected, axis=1))
+        assert blocked_top_k(matrix[:3], queries, k=5)[1].shape == (7, 3)
+
+    def test_build_and_search(self, tmp_path):
+        """
+        Test that an index is written once, reopened memory-mapped and finds each reference itself.
+        """
+        references = [f"Reference answer {i}\\nwith \"quotes\"" for i in range(50)]
+        ReferenceIndex.build(tmp_path / "index", references, embed, model="test-model", batch_size=16)
+
+        index = ReferenceIndex(tmp_path / "index")
+        assert isinstance(index.embeddings, np.memmap)
+        assert len(index) == 50 and index.dim == 8 and index.model == "test-model"
+        scores, ids = index.search(embed(references[10:13]), k=3, block_rows=7)
+        assert ids[:, 0].tolist() == [10, 11, 12]
+        assert np.allclose(scores[:, 0], 1.0, atol=1e-5)
+        assert index.texts([12, 0]) == [references[12], references[0]]
+
+    def test_empty_index(self, tmp_path):
+        """
+        Test that an index without references returns no neighbours instead of failing.
+        """
+        index = ReferenceIndex.build(tmp_path / "index", [], embed, model="test-model")
+        scores, ids = index.search(np.ones((2, 8)), k=3)
+        assert scores.shape == (2, 0) and ids.shape == (2, 0)
+
+    def test_unknown_ann(self, tmp_path):
+        """
+        Test that an unsupported ANN structure is rejected.
+        """
+        with pytest.raises(ValueError):
+            ReferenceIndex.build(tmp_path / "index", ["a"], embed, model="test-model", ann="ivf")
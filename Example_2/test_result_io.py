@@ -0,0 +1,92 @@
+import pandas as pd
+from result_io import iter_chunks, open_chunk_writer, to_columnar, write_results
+
+
+def sample_frame(rows: int = 5) -> pd.DataFrame:
+    """
+    Build a small frame with the input columns and an entity column of sets.
+    """
+    return pd.DataFrame({
+        "Ground_Truth": [f"Ground truth {i}" for i in range(rows)],
+        "Output": [f"Output {i}" for i in range(rows)],
+        "Output_Entities": [{"Apple"} if i % 2 else None for i in range(rows)],
+    })
+
+
+class TestResultIO:
+    """
+    Test class for chunked reading and incremental writing of evaluation files.
+    """
+
+    def test_iter_chunks_csv(self, tmp_path):
+        """
+        Test that a CSV file is read in chunks with a running index.
+        """
+        path = tmp_path / "input.csv"
+        sample_frame()[["Ground_Truth", "Output"]].to_csv(path, index=False)
+        chunks = list(iter_chunks(path, chunk_size=2))
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert list(pd.concat(chunks).index) == [0, 1, 2, 3, 4]
+
+    def test_iter_chunks_excel(self, tmp_path):
+        """
+        Test that an Excel file is streamed in read-only mode and split into chunks.
+        """
+        path = tmp_path / "input.xlsx"
+        sample_frame()[["Ground_Truth", "Output"]].to_excel(path, index=False)
+        chunks = list(iter_chunks(path, chunk_size=3))
+        assert [len(chunk) for chunk in chunks] == [3, 2]
+        assert list(chunks[1].index) == [3, 4]
+        assert chunks[1]["Output"].tolist() == ["Output 3", "Output 4"]
+
+    def test_chunk_writers_append(self, tmp_path):
+        """
+        Test that every writer appends chunks into one complete file.
+        """
+        df = sample_frame(4)
+        readers = (("out.csv", pd.read_csv), ("out.parquet", pd.read_parquet),
+                   ("out.arrow", pd.read_feather), ("out.xlsx", pd.read_excel))
+        for name, read in readers:
+            path = tmp_path / name
+            with open_chunk_writer(path) as writer:
+                writer.write(df.iloc[:2])
+                writer.write(df.iloc[2:])
+            assert writer.rows_written == 4
+            written = read(path)
+            assert written["Ground_Truth"].tolist() == df["Ground_Truth"].tolist()
+
+    def test_entity_columns_are_native_lists(self, tmp_path):
+        """
+        Test that entity sets are stored as list columns and sentinel strings as a status column.
+        """
+        df = pd.DataFrame({
+            "Output_Entities": [{"Banana", "Apple"}, None],
+            "Unique_In_Output": [{"Banana"}, "no_named_entities in Output"],
+        })
+        path = tmp_path / "out.parquet"
+        write_results(df, path)
+        written = pd.read_parquet(path)
+        assert list(written["Output_Entities"][0]) == ["Apple", "Banana"]
+        assert written["Output_Entities"][1] is None
+        assert list(written["Unique_In_Output"][0]) == ["Banana"]
+        assert written["Unique_In_Output_Status"].tolist()[1] == "no_named_entities in Output"
+
+        columnar = to_columnar(df)
+        assert columnar["Unique_In_Output"].tolist() == [["Banana"], None]
+
+    def test_sentinel_and_missing_rows(self, tmp_path):
+        """
+        Test that entity columns holding only sentinel strings and missing values are written to every format.
+        """
+        df = pd.DataFrame({
+            "Ground_Truth_Entities": [None, None],
+            "Unique_in_Ground_Truth": [float("nan"), "no_named_entities in Ground_truth"],
+            "Unique_In_Output": pd.array([None, "all_attested"], dtype="string"),
+        })
+        # pandas may infer a string column here and hold the missing value as NaN or pd.NA
+        assert to_columnar(df)["Unique_in_Ground_Truth"].tolist() == [None, None]
+        assert to_columnar(df)["Unique_In_Output"].tolist() == [None, None]
+        for name in ("out.parquet", "out.csv", "out.xlsx"):
+            assert write_results(df, tmp_path / name) == 2
+        assert pd.read_parquet(tmp_path / "out.parquet")["Unique_in_Ground_Truth_Status"].tolist()[1] == \
+            "no_named_entities in Ground_truth"
@@ -0,0 +1,61 @@
+import numpy as np
+import factual_accuracy
+from result_schema import EntityStatus, ResultTable
+
+
+class TestResultSchema:
+    """
+    Test class for the columnar result table and its typed row records.
+    """
+
+    scorer = factual_accuracy.TestFactualAccuracy()
+    output_column = [{"Apple", "Cupertino"}, {"Apple", "Banana"}, {"Apple"}, None, {"Apple"}, None]
+    ground_truth_column = [{"Apple", "Cupertino"}, {"Apple", "Cherry"}, {"Apple", "Cherry"}, {"Apple"}, None, None]
+
+    def make_table(self) -> ResultTable:
+        comparison = self.scorer.compare_entity_columns(self.output_column, self.ground_truth_column, decode=False)
+        result = self.scorer.check_factual_accuracy_batch(self.output_column, self.ground_truth_column)
+        return ResultTable.from_comparison(comparison, result, np.arange(6.0))
+
+    def test_legacy_frame_matches_row_methods(self):
+        """
+        Test that to_frame gives exactly the sets and sentinel strings of the get_unique_* methods.
+        """
+        frame = self.make_table().to_frame()
+        rows = list(zip(self.output_column, self.ground_truth_column))
+        assert frame['Unique_In_Output'].tolist() == [
+            self.scorer.get_unique_entities_in_output(output, ground_truth) for output, ground_truth in rows]
+        assert frame['Unique_in_Ground_Truth'].tolist() == [
+            self.scorer.get_unique_entities_in_ground_truth(ground_truth, output) for output, ground_truth in rows]
+        assert frame['All_Unique_Entities'].tolist() == [
+            self.scorer.get_unique_entities(output, ground_truth) for output, ground_truth in rows]
+        assert frame['Output_Entities'].tolist() == self.output_column
+        # Sentinel strings and None alone must not be read as a string column with NaN
+        assert self.make_table().select([0, 5]).to_frame()['Unique_in_Ground_Truth'].tolist() == ['all_attested', None]
+
+    def test_statuses_and_filtering(self):
+        """
+        Test the status codes, the vectorised unattested filter and the per-row records.
+        """
+        table = self.make_table()
+        assert table.unique_in_output_status.tolist() == [
+            EntityStatus.ALL_ATTESTED, EntityStatus.ENTITIES, EntityStatus.NO_UNIQUE,
+            EntityStatus.NO_OUTPUT_ENTITIES, EntityStatus.ENTITIES, EntityStatus.NO_OUTPUT_ENTITIES]
+
+        unattested = table.select(table.unattested())
+        assert unattested.index.tolist() == [1, 2, 3]
+        assert unattested.row(0).unique_in_ground_truth == ("Cherry",)
+        assert unattested.row(2).output_entities is None
+        assert table.row(5).to_legacy()['Unique_in_Ground_Truth'] is None
+
+    def test_vocabulary_scoped_to_comparison(self):
+        """
+        Test that each comparison interns into its own vocabulary, so repeated runs do not grow a shared one.
+        """
+        first = self.make_table()
+        for _ in range(3):
+            self.scorer.compare_entity_columns([{"Omnicom"}], [{"Audience Explorer"}], decode=False)
+        second = self.make_table()
+        assert first.vocab is not second.vocab
+        assert sorted(second.vocab.strings) == ["Apple", "Banana", "Cherry", "Cupertino"]
+        assert first.to_frame()['Output_Entities'].tolist() == self.output_column
@@ -0,0 +1,42 @@
+from run_manifest import RunManifest, row_hash
+
+
+class TestRunManifest:
+    """
+    Test class for the run manifest used by incremental re-evaluation.
+    """
+
+    versions = {'spacy': 'en_core_web_sm-3.7.1', 'embedding': 'paraphrase-MiniLM-L6-v2',
+                'similarity_backend': 'transformer'}
+
+    def test_round_trip_results(self, tmp_path):
+        """
+        Test that stored results come back with sets, sentinel strings, None and numbers intact.
+        """
+        manifest = RunManifest(str(tmp_path / "manifest.sqlite"))
+        manifest.reset(self.versions)
+        key = row_hash("Apple is in Cupertino", "Apple")
+        result = {'Ground_Truth_Entities': {'Apple', 'Cupertino'}, 'Output_Entities': {'Apple'},
+                  'Unique_In_Output': "No_Unique_Entities in Output", 'Unique_in_Ground_Truth': {'Cupertino'},
+                  'All_Unique_Entities': None, 'Result': False, 'Overlap_PCT': 71.5}
+        manifest.record([key], [result])
+        manifest.close()
+
+        reopened = RunManifest(str(tmp_path / "manifest.sqlite"))
+        assert reopened.is_compatible(self.versions)
+        assert reopened.lookup([key, row_hash("new", "row")]) == [result, None]
+        assert len(reopened) == 1
+
+    def test_model_change_invalidates(self, tmp_path):
+        """
+        Test that a manifest built with other models is reported incompatible and cleared on reset.
+        """
+        manifest = RunManifest(str(tmp_path / "manifest.sqlite"))
+        manifest.reset(self.versions)
+        manifest.record([row_hash("a", "b")], [{'Result': True}])
+
+        new_versions = {**self.versions, 'spacy': 'en_core_web_sm-3.8.0'}
+        assert not manifest.is_compatible(new_versions)
+        manifest.reset(new_versions)
+        assert manifest.is_compatible(new_versions)
+        assert len(manifest) == 0
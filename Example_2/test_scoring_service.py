@@ -0,0 +1,160 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from scoring_service import MicroBatcher, ScoringClient, ScoringService
+
+
+class FakeScorer:
+    """
+    Stand-in for TestFactualAccuracy that records the batches it receives and needs no models.
+    """
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def warm_up(self):
+        pass
+
+    def extract_named_entities_batch(self, texts, batch_size=256):
+        self.batch_sizes.append(len(texts))
+        return [set(text.split()) or None for text in texts]
+
+    def calculate_overlap_pct_batch(self, ground_truths, outputs, batch_size=64):
+        self.batch_sizes.append(len(ground_truths))
+        return np.array([100.0 if truth == output else 0.0 for truth, output in zip(ground_truths, outputs)])
+
+
+class TestScoringService:
+    """
+    Test class for the local scoring service and its client.
+    """
+
+    def test_concurrent_requests_are_batched(self, tmp_path):
+        """
+        Test that concurrent client requests are coalesced into micro-batches and answered correctly.
+        """
+        scorer = FakeScorer()
+        socket_path = str(tmp_path / "scorer.sock")
+
+        async def run():
+            service = ScoringService(scorer, max_batch_size=8, max_latency=0.05)
+            await service.start(socket_path)
+            client = await ScoringClient.connect(socket_path)
+            try:
+                entities = await asyncio.gather(*(client.extract_named_entities(f"Paris {i}") for i in range(20)))
+                empty = await client.extract_named_entities("")
+                overlaps = await asyncio.gather(client.calculate_overlap_pct("a", "a"),
+                                                client.calculate_overlap_pct("a", "b"))
+            finally:
+                await client.close()
+                await service.stop()
+            return entities, empty, overlaps
+
+        entities, empty, overlaps = asyncio.run(run())
+        assert entities[3] == {"Paris", "3"}
+        assert empty is None
+        assert overlaps == [100.0, 0.0]
+        assert max(scorer.batch_sizes) == 8
+        assert len(scorer.batch_sizes) < 20
+
+    def test_errors_are_returned_to_the_caller(self, tmp_path):
+        """
+        Test that a failing batch raises on the client instead of hanging it.
+        """
+        scorer = FakeScorer()
+        scorer.extract_named_entities_batch = lambda texts, batch_size=256: 1 / 0
+        socket_path = str(tmp_path / "scorer.sock")
+
+        async def run():
+            service = ScoringService(scorer)
+            await service.start(socket_path)
+            client = await ScoringClient.connect(socket_path)
+            try:
+                return await client.extract_named_entities("Paris")
+            except RuntimeError as error:
+                return str(error)
+            finally:
+                await client.close()
+                await service.stop()
+
+        assert "ZeroDivisionError" in asyncio.run(run())
+
+    def test_pending_requests_fail_on_close(self, tmp_path):
+        """
+        Test that requests still in flight fail with ConnectionError when the client is closed.
+        """
+        socket_path = str(tmp_path / "silent.sock")
+
+        async def never_answer(reader, writer):
+            await reader.read()
+
+        async def run():
+            server = await asyncio.start_unix_server(never_answer, path=socket_path)
+            client = await ScoringClient.connect(socket_path)
+            request = asyncio.ensure_future(client.extract_named_entities("Paris"))
+            await asyncio.sleep(0.05)
+            await client.close()
+            server.close()
+            try:
+                await asyncio.wait_for(request, timeout=1)
+            except ConnectionError as error:
+                return error
+
+        assert isinstance(asyncio.run(run()), ConnectionError)
+
+    def test_pending_requests_fail_when_reading_fails(self, tmp_path):
+        """
+        Test that a broken response fails every request in flight instead of leaving it waiting.
+        """
+        socket_path = str(tmp_path / "broken.sock")
+
+        async def answer_garbage(reader, writer):
+            await reader.readline()
+            writer.write(b"not json\n")
+            await writer.drain()
+            await reader.read()
+
+        async def run():
+            server = await asyncio.start_unix_server(answer_garbage, path=socket_path)
+            client = await ScoringClient.connect(socket_path)
+            try:
+                results = await asyncio.wait_for(asyncio.gather(
+                    client.extract_named_entities("Paris"), client.calculate_overlap_pct("a", "b"),
+                    return_exceptions=True), timeout=1)
+            finally:
+                await client.close()
+                server.close()
+            return results
+
+        results = asyncio.run(run())
+        assert all(isinstance(result, ValueError) for result in results)
+
+    def test_stopping_the_batcher_fails_pending_requests(self):
+        """
+        Test that stopping a micro-batcher fails requests being processed and requests still queued.
+        """
+        release = threading.Event()
+
+        def blocking_batch(items):
+            release.wait(timeout=5)
+            return items
+
+        async def run():
+            executor = ThreadPoolExecutor(max_workers=1)
+            batcher = MicroBatcher(blocking_batch, executor, max_batch_size=1, max_latency=0)
+            batcher.start()
+            requests = [asyncio.ensure_future(batcher.submit(item)) for item in ("in flight", "queued")]
+            await asyncio.sleep(0.05)
+            await batcher.stop()
+            results = await asyncio.wait_for(asyncio.gather(*requests, return_exceptions=True), timeout=1)
+            release.set()
+            executor.shutdown()
+            try:
+                await batcher.submit("late")
+            except ConnectionError as error:
+                results.append(error)
+            return results
+
+        results = asyncio.run(run())
+        assert len(results) == 3 and all(isinstance(result, ConnectionError) for result in results)
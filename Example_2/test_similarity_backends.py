@@ -0,0 +1,143 @@
+import pickle
+import numpy as np
+import pytest
+from embedding_cache import EmbeddingCache
+from similarity_backends import CascadeBackend, LexicalBackend, SimilarityBackend, TransformerBackend
+
+
+class ConstantBackend(SimilarityBackend):
+    """
+    Backend that scores every pair the same and records how many pairs it was asked to score.
+    """
+
+    def __init__(self, score):
+        self.score = score
+        self.pairs = 0
+
+    def embed(self, texts):
+        return np.ones((len(texts), 1))
+
+    def score_pairs(self, ground_truths, outputs):
+        self.pairs += len(ground_truths)
+        return np.full(len(ground_truths), self.score)
+
+
+class TestSimilarityBackends:
+    """
+    Test class for the pluggable similarity backends.
+    """
+
+    def test_lexical_score_pairs(self):
+        """
+        Test that identical texts score 1, unrelated texts score 0 and partial overlap lies in between.
+        """
+        for backend in (LexicalBackend('hashing'), LexicalBackend('tfidf')):
+            scores = backend.score_pairs(["Apple is in Cupertino", "Omnicom", "Steve Jobs"],
+                                         ["Apple is in Cupertino", "Audience Explorer", "Steve Wozniak"])
+            assert np.allclose(scores[:2], [1.0, 0.0])
+            assert 0.0 < scores[2] < 1.0
+
+    def test_lexical_similarity_matrix(self):
+        """
+        Test that the similarity matrix compares every left text with every right text.
+        """
+        scores = LexicalBackend('tfidf').similarity_matrix(["Apple", "Omnicom"], ["Apple", "Cupertino", "Omnicom"])
+        assert scores.shape == (2, 3)
+        assert np.allclose(scores, [[1, 0, 0], [0, 0, 1]])
+
+    def test_fitted_tfidf_is_batch_independent(self):
+        """
+        Test that a fitted TF-IDF backend scores rows the same whether they are scored together or in shards,
+        unlike an unfitted one, and that its config rebuilds the same weights.
+        """
+        ground_truths = ["Apple is in Cupertino", "Omnicom owns Omnicom Media", "Steve Jobs and Apple", "Apple pie"]
+        outputs = ["Apple is based in Cupertino", "Omnicom Media Group", "Steve Wozniak", "Cupertino Apple pie"]
+        unfitted = LexicalBackend('tfidf')
+        assert not unfitted.batch_independent
+        assert not np.allclose(unfitted.score_pairs(ground_truths, outputs)[:2],
+                               unfitted.score_pairs(ground_truths[:2], outputs[:2]))
+
+        fitted = LexicalBackend('tfidf').fit(ground_truths + outputs)
+        assert fitted.batch_independent
+        serial = fitted.score_pairs(ground_truths, outputs)
+        sharded = np.concatenate([fitted.score_pairs(ground_truths[start:start + 2], outputs[start:start + 2])
+                                  for start in (0, 2)])
+        assert np.allclose(serial, sharded)
+        assert np.allclose(fitted.similarity_matrix(ground_truths[:1], outputs),
+                           fitted.similarity_matrix(ground_truths, outputs)[:1])
+
+        rebuilt = SimilarityBackend.from_config(pickle.loads(pickle.dumps(fitted.config())))
+        assert repr(rebuilt) == repr(fitted) != repr(LexicalBackend('tfidf').fit(ground_truths))
+        assert np.array_equal(rebuilt.score_pairs(ground_truths, outputs), serial)
+
+        with pytest.raises(ValueError):
+            LexicalBackend('hashing').fit(ground_truths)
+        assert CascadeBackend(fitted, LexicalBackend()).batch_independent
+        assert not CascadeBackend(fitted, unfitted).batch_independent
+
+    def test_cascade_rescores_only_borderline_rows(self):
+        """
+        Test that the cascade keeps confident lexical scores and sends borderline rows to the accurate backend.
+        """
+        accurate = ConstantBackend(0.5)
+        cascade = CascadeBackend(fast=LexicalBackend(), accurate=accurate, low=0.2, high=0.8)
+        scores = cascade.score_pairs(["Apple Cupertino", "Omnicom", "Steve Jobs"],
+                                     ["Apple Cupertino", "Audience Explorer", "Steve Wozniak"])
+        assert np.allclose(scores, [1.0, 0.0, 0.5])
+        assert accurate.pairs == 1
+
+        # The rescored rows are reported, because their scores are on the accurate backend's scale
+        _, rescored = cascade.score_pairs_rescored(["Apple Cupertino", "Omnicom", "Steve Jobs"],
+                                                   ["Apple Cupertino", "Audience Explorer", "Steve Wozniak"])
+        assert rescored.tolist() == [False, False, True]
+        assert LexicalBackend().score_pairs_rescored(["Apple"], ["Apple"])[1] is None
+
+        # A similarity matrix is rescored whole
+        assert cascade.similarity_matrix_rescored(["Apple Cupertino", "Omnicom"], ["Apple", "Omnicom"])[1] is True
+
+        # The accurate backend is never guessed, so it cannot silently ignore the scorer's model and cache
+        with pytest.raises(TypeError):
+            CascadeBackend()
+
+    def test_repr_identifies_settings(self):
+        """
+        Test that backends differing in any scoring setting are described differently, as run manifests rely on.
+        """
+        descriptions = {repr(LexicalBackend('hashing')), repr(LexicalBackend('tfidf')),
+                        repr(LexicalBackend('hashing', ngram_range=(1, 2))),
+                        repr(CascadeBackend(ConstantBackend(0.5), LexicalBackend(), low=0.2)),
+                        repr(CascadeBackend(ConstantBackend(0.5), LexicalBackend(), low=0.3))}
+        assert len(descriptions) == 5
+        assert repr(LexicalBackend('tfidf')) == repr(LexicalBackend('tfidf'))
+
+    def test_config_round_trip(self, tmp_path):
+        """
+        Test that backends are described by picklable settings that rebuild an equivalent backend,
+        with a file-backed cache reopened on the same file, and that backends without config() are rejected.
+        """
+        cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite"), max_entries=10)
+        cascade = CascadeBackend(fast=LexicalBackend('tfidf', ngram_range=(1, 2)),
+                                 accurate=TransformerBackend("some-model", device="cpu", cache=cache, batch_size=8),
+                                 low=0.3, high=0.7)
+        config = pickle.loads(pickle.dumps(cascade.config()))
+        rebuilt = SimilarityBackend.from_config(config)
+        assert repr(rebuilt) == repr(cascade)
+        assert (rebuilt.accurate.device, rebuilt.accurate.batch_size) == ("cpu", 8)
+        assert (rebuilt.accurate.cache.path, rebuilt.accurate.cache.max_entries) == (cache.path, 10)
+        cache.close()
+        rebuilt.accurate.cache.close()
+
+        with pytest.raises(TypeError, match="ConstantBackend does not implement config"):
+            ConstantBackend(0.5).config()
+        with pytest.raises(ValueError):
+            SimilarityBackend.from_config({'class': 'ConstantBackend'})
+
+    def test_embed_is_abstract(self):
+        """
+        Test that a backend without embed() cannot be created.
+        """
+        class NoEmbedBackend(SimilarityBackend):
+            pass
+
+        with pytest.raises(TypeError):
+            NoEmbedBackend()
@@ -1,22 +1,173 @@
 # abc_1.py
 
-def add_numbers(a, b):
+import math
+from itertools import chain, islice
+
+import numpy as np
+
+# Number of streamed values converted to one array at a time by Calculator.add_many
+STREAM_CHUNK_SIZE = 65536
+
+# Returned by next() on an exhausted iterator; unlike None it cannot be one of the values
+_EMPTY = object()
+
+
+def _two_sum(a, b):
+    """
+    Add two floats exactly.
+
+    :param a: The first float.
+    :param b: The second float.
+    :return: The rounded sum and the rounding error, whose sum is exactly a + b.
+    """
+    total = a + b
+    b_part = total - a
+    error = (a - (total - b_part)) + (b - b_part)
+    return total, error
+
+
+def _cascade_sum(values):
+    """
+    Sum an array pairwise, keeping the rounding error of every addition.
+
+    Each pass adds the two halves of the array element-wise and collects the exact errors of those
+    additions, so the whole reduction stays vectorised.
+
+    :param values: A one-dimensional float64 array.
+    :return: The pairwise total and the sum of the rounding errors.
+    """
+    errors = 0.0
+    # Infinities make the errors nan; the caller then ignores them
+    with np.errstate(invalid='ignore'):
+        while len(values) > 1:
+            half = len(values) // 2
+            left, right = values[:half], values[half:2 * half]
+            total = left + right
+            right_part = total - left
+            errors += np.sum((left - (total - right_part)) + (right - right_part))
+            values = np.concatenate((total, values[2 * half:]))
+    return (float(values[0]) if len(values) else 0.0), float(errors)
+
+
+def _exact_int_sum(values):
+    """
+    Sum an integer or boolean array exactly.
+
+    The sum is computed in int64 when it cannot overflow, and in Python integers otherwise.
+
+    :param values: A one-dimensional integer or boolean array.
+    :return: The total as a Python int.
     """
-    Add two numbers.
+    if not len(values):
+        return 0
+    largest = max(abs(int(values.min())), abs(int(values.max())))
+    if largest * len(values) < 2 ** 63:
+        return int(np.sum(values, dtype=np.int64))
+    return sum(values.tolist())
+
+
+def _is_float(value):
+    """
+    Check whether a value is a Python or NumPy float.
+
+    :param value: The value to check.
+    :return: True if the value is a float.
+    """
+    return isinstance(value, (float, np.floating))
+
+
+def _is_real(value):
+    """
+    Check whether a value is a Python or NumPy integer or float.
+
+    :param value: The value to check.
+    :return: True if the value can be converted to a float for compensated addition.
+    """
+    return isinstance(value, (int, float, np.integer, np.floating))
+
 
-    :param a: The first number.
+def add_numbers(a, b=None):
+    """
+    Add two numbers, or sum all the numbers in a.
+
+    With two arguments, returns a + b, so NumPy arrays are added element-wise.
+    With one argument, a is an array or any iterable of numbers (a generator is consumed in chunks
+    and never held in memory). Floats are accumulated with pairwise and compensated summation; other
+    numbers (integers, Decimal, Fraction, complex) are summed exactly.
+
+    :param a: The first number, or an array or iterable of numbers to sum.
     :param b: The second number.
-    :return: The sum of the two numbers.
+    :return: The sum of the two numbers, or the total of a: an int if every value is an integer,
+        a float if any value is a float, and 0.0 when a is empty, as math.fsum.
     """
-    return a + b
+    if b is not None:
+        return a + b
+    if not isinstance(a, np.ndarray):
+        iterator = iter(a)
+        first = next(iterator, _EMPTY)
+        if first is _EMPTY:
+            return 0.0
+        a = chain([first], iterator)
+    return Calculator().add_many(a).get_result()
+
 
 class Calculator:
     """
     A simple calculator class.
+
+    The running result is kept together with the rounding error of every floating-point addition
+    (Neumaier summation), so long streams of values do not lose precision. Other numbers are added
+    exactly, so integers, Decimal, Fraction and complex values keep their type.
     """
 
     def __init__(self):
         self.result = 0
+        self._compensation = 0.0
+
+    def _accumulate(self, x):
+        """
+        Add one number to the result, carrying the rounding error of float additions.
+
+        Only additions involving a float are compensated; any other numbers (integers, Decimal,
+        Fraction, complex, arrays) are added exactly with +, as before.
+
+        :param x: The number to add.
+        """
+        if not (_is_float(x) and _is_real(self.result) or _is_float(self.result) and _is_real(x)):
+            if self._compensation:
+                self.result, self._compensation = self.result + self._compensation, 0.0
+            self.result += x
+            return
+
+        total, error = _two_sum(float(self.result), float(x))
+        if not math.isfinite(total):
+            self.result, self._compensation = total, 0.0
+            return
+        self.result, self._compensation = _two_sum(total, self._compensation + error)
+
+    def _add_array(self, values):
+        """
+        Add every number in an array to the result.
+
+        :param values: A NumPy array of any shape.
+        """
+        values = np.ravel(values)
+        if values.dtype == object:
+            # Python ints too large for int64, Decimals, Fractions...
+            for value in values.tolist():
+                self._accumulate(value)
+            return
+        if values.dtype.kind in 'iub':
+            self._accumulate(_exact_int_sum(values))
+            return
+        if values.dtype.kind != 'f':
+            self._accumulate(values.sum().item() if len(values) else 0.0)
+            return
+
+        total, errors = _cascade_sum(values.astype(np.float64, copy=False))
+        self._accumulate(total)
+        if errors and math.isfinite(errors):
+            self._accumulate(errors)
 
     def add(self, x):
         """
@@ -24,7 +175,55 @@ class Calculator:
 
         :param x: The number to add.
         """
-        self.result += x
+        self._accumulate(x)
+
+    def add_many(self, values, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Add many numbers to the result.
+
+        Integer arrays are summed exactly. Float arrays are summed in vectorised pairwise passes
+        that keep each addition's rounding error. Other iterables are consumed chunk_size values at
+        a time, or one array at a time if they yield arrays, so a generator is never materialised.
+        Every partial total is added with compensation. An empty iterable leaves the result unchanged.
+
+        :param values: A NumPy array, an iterable of numbers, or an iterable of arrays.
+        :param chunk_size: Number of streamed numbers summed per vectorised pass.
+        :return: The calculator, so calls can be chained.
+        """
+        if isinstance(values, np.ndarray):
+            self._add_array(values)
+            return self
+
+        iterator = iter(values)
+        first = next(iterator, _EMPTY)
+        if first is _EMPTY:
+            return self
+        iterator = chain([first], iterator)
+
+        if np.ndim(first) > 0:
+            for chunk in iterator:
+                self._add_array(np.asarray(chunk))
+            return self
+
+        while True:
+            # A bounded list lets NumPy keep integers as integers and floats as float64
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return self
+            self._add_array(np.asarray(chunk))
+
+    def merge(self, *others):
+        """
+        Add the results of other calculators, e.g. partial sums from parallel workers.
+
+        :param others: Calculators to merge into this one.
+        :return: The calculator, so calls can be chained.
+        """
+        for other in others:
+            self._accumulate(other.result)
+            if other._compensation:
+                self._accumulate(other._compensation)
+        return self
 
     def get_result(self):
         """
@@ -21,6 +21,9 @@ extensions = [
     # ...
 ]
 
+# abc_1 imports numpy at module level
+autodoc_mock_imports = ['numpy']
+
 templates_path = ['_templates']
 exclude_patterns = []
 
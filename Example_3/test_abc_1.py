@@ -0,0 +1,137 @@
+import importlib.util
+import math
+import os
+from decimal import Decimal
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+# abc._1.py is not an importable module name, so it is loaded from its path
+_spec = importlib.util.spec_from_file_location("abc_1", os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                     "abc._1.py"))
+abc_1 = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(abc_1)
+
+
+class TestCalculator:
+    """
+    Test class for add_numbers and the Calculator's batch summation.
+    """
+
+    def test_scalar_api_unchanged(self):
+        """
+        Test that the two-argument add_numbers and Calculator.add behave as before.
+        """
+        assert abc_1.add_numbers(2, 3) == 5
+        assert np.array_equal(abc_1.add_numbers(np.ones(3), np.ones(3)), [2.0, 2.0, 2.0])
+        calculator = abc_1.Calculator()
+        calculator.add(2)
+        calculator.add(3)
+        assert calculator.get_result() == 5 and isinstance(calculator.get_result(), int)
+
+    @pytest.mark.parametrize("first, second, expected, result_type", [
+        (np.int64(2), np.int64(2), 4, np.int64),
+        (Decimal("0.1"), Decimal("0.2"), Decimal("0.3"), Decimal),
+        (Fraction(1, 3), Fraction(1, 3), Fraction(2, 3), Fraction),
+        (1 + 2j, 3j, 1 + 5j, complex),
+        (np.float32(0.5), np.float64(0.25), 0.75, float),
+    ])
+    def test_scalar_types_kept(self, first, second, expected, result_type):
+        """
+        Test that Calculator.add keeps the exact sum and type of non-float numbers, as + does.
+        """
+        calculator = abc_1.Calculator()
+        calculator.add(first)
+        calculator.add(second)
+        assert calculator.get_result() == expected
+        assert isinstance(calculator.get_result(), result_type)
+
+    def test_add_array_operand(self):
+        """
+        Test that adding an array gives an element-wise result, as + does.
+        """
+        calculator = abc_1.Calculator()
+        calculator.add(np.ones(3))
+        calculator.add(np.arange(3))
+        assert np.array_equal(calculator.get_result(), [1.0, 2.0, 3.0])
+
+    def test_sum_non_float_iterables(self):
+        """
+        Test that summing Decimals, Fractions and complex numbers is exact and keeps their type.
+        """
+        assert abc_1.add_numbers([Decimal("0.1")] * 10) == Decimal("1.0")
+        assert abc_1.add_numbers(Fraction(1, 3) for _ in range(3)) == 1
+        assert isinstance(abc_1.add_numbers([Fraction(1, 3)] * 3), Fraction)
+        assert abc_1.add_numbers(np.array([1 + 1j, 2 - 3j])) == 3 - 2j
+
+    @pytest.mark.parametrize("values", [
+        [0.1] * 100_000,
+        [1e16, 1.0, -1e16],
+        np.random.default_rng(0).standard_normal(100_001) * 1e6,
+        [1e100, 1.0, -1e100, 1e-3] * 1000,
+    ])
+    def test_floats_match_fsum(self, values):
+        """
+        Test that lists, arrays, generators and chunked streams all give the correctly rounded sum.
+        """
+        expected = math.fsum(values)
+        assert abc_1.add_numbers(values) == expected
+        assert abc_1.add_numbers(np.asarray(values)) == expected
+        assert abc_1.add_numbers(value for value in values) == expected
+        assert abc_1.Calculator().add_many(iter(values), chunk_size=1000).get_result() == expected
+        chunks = (np.asarray(values[start:start + 777]) for start in range(0, len(values), 777))
+        assert abc_1.add_numbers(chunks) == expected
+
+    def test_integers_are_exact(self):
+        """
+        Test that integer inputs are summed exactly, including totals beyond float and int64 precision.
+        """
+        assert abc_1.add_numbers(np.array([2 ** 62, 1])) == 2 ** 62 + 1
+        assert abc_1.add_numbers([2 ** 62, 1]) == 2 ** 62 + 1
+        assert abc_1.add_numbers(np.array([2 ** 62] * 4 + [1])) == 2 ** 64 + 1
+        assert abc_1.add_numbers([2 ** 70, 3]) == 2 ** 70 + 3
+        assert abc_1.add_numbers(np.array([np.iinfo(np.uint64).max, 1], dtype=np.uint64)) == 2 ** 64
+        assert isinstance(abc_1.add_numbers(range(10)), int)
+
+    def test_empty_inputs(self):
+        """
+        Test that an empty input gives a zero of the same type as a non-empty one of its kind.
+        """
+        assert abc_1.add_numbers([]) == 0.0 and isinstance(abc_1.add_numbers([]), float)
+        assert isinstance(abc_1.add_numbers(iter([])), float)
+        assert isinstance(abc_1.add_numbers(np.array([])), float)
+        assert isinstance(abc_1.add_numbers(np.array([], dtype=np.int64)), int)
+
+    def test_add_many_empty_keeps_result(self):
+        """
+        Test that adding an empty iterable leaves the result and its type unchanged.
+        """
+        calculator = abc_1.Calculator()
+        calculator.add(5)
+        for empty in ([], iter([]), ()):
+            assert calculator.add_many(empty).get_result() == 5
+            assert isinstance(calculator.get_result(), int)
+
+    def test_add_many_leading_none(self):
+        """
+        Test that a leading None is rejected as a value, not mistaken for an empty iterable.
+        """
+        with pytest.raises(TypeError):
+            abc_1.Calculator().add_many([None, 1])
+        with pytest.raises(TypeError):
+            abc_1.add_numbers(iter([None, 1.0]))
+
+    def test_merge_partial_results(self):
+        """
+        Test that merging the calculators of disjoint parts gives the sum of the whole.
+        """
+        values = np.random.default_rng(1).standard_normal(40_000) * 1e8
+        parts = [abc_1.Calculator().add_many(values[start::4]) for start in range(4)]
+        assert abc_1.Calculator().merge(*parts).get_result() == math.fsum(values)
+
+    def test_infinity(self):
+        """
+        Test that infinities propagate instead of turning into nan.
+        """
+        assert abc_1.add_numbers([float("inf"), 1.0]) == float("inf")
@@ -0,0 +1,87 @@
+"""
+Build the Sphinx documentation of all example projects at once.
+
+Each project is built in its own sphinx-build process, all running concurrently, with parallel
+reading enabled (-j). Builds are incremental: the doctree and environment caches in each build
+directory are reused, so only changed documents are re-read. No build needs the runtime stack:
+torch, spaCy, scikit-learn and sentence-transformers are loaded lazily, on first use, and every
+module-level import of a third-party package is listed in the project's autodoc_mock_imports:
+
+- Example_1 mocks numpy, which the shared package imports.
+- Example_2 mocks numpy, which most of its modules import, and pandas and pytest, which its
+  autodoc'd test_factual module imports.
+- Example_3 mocks numpy, which abc._1.py imports.
+
+Usage::
+
+    python build_docs.py                 # incremental HTML build of every project
+    python build_docs.py Example_2       # only the named project(s)
+    python build_docs.py --fresh         # ignore the cached environment and re-read everything
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Project name -> (source directory, build directory), matching each project's Makefile
+PROJECTS = {
+    'Example_1': (os.path.join('Example_1', 'docs'), os.path.join('Example_1', 'docs', '_build')),
+    'Example_2': (os.path.join('Example_2', 'docs'), os.path.join('Example_2', 'docs', '_build')),
+    'Example_3': (os.path.join('Example_3', 'source'), os.path.join('Example_3', 'build')),
+}
+
+
+def build(name: str, builder: str, jobs: str, fresh: bool, sphinx_build: str) -> tuple:
+    """
+    Run sphinx-build for one project.
+    Returns:
+    - tuple: (project name, exit code, seconds taken, combined output).
+    """
+    source, build_dir = PROJECTS[name]
+    command = [sphinx_build, '-M', builder, os.path.join(ROOT, source), os.path.join(ROOT, build_dir),
+               '-j', jobs, '-q']
+    if fresh:
+        command.append('-E')
+
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    return name, completed.returncode, time.perf_counter() - start, completed.stdout + completed.stderr
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('projects', nargs='*', metavar='PROJECT',
+                        help=f"Projects to build ({', '.join(PROJECTS)}); all of them when omitted.")
+    parser.add_argument('-b', '--builder', default='html', help="Sphinx builder, e.g. html or dirhtml.")
+    parser.add_argument('-j', '--jobs', default='auto', help="Parallel reading jobs per project.")
+    parser.add_argument('--fresh', action='store_true', help="Do not reuse the saved environment (-E).")
+    parser.add_argument('--sphinx-build', default=shutil.which('sphinx-build') or 'sphinx-build',
+                        help="sphinx-build executable to run.")
+    args = parser.parse_args(argv)
+
+    unknown = sorted(set(args.projects) - set(PROJECTS))
+    if unknown:
+        parser.error(f"unknown project(s): {', '.join(unknown)}")
+
+    names = args.projects or list(PROJECTS)
+    failed = False
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        futures = [executor.submit(build, name, args.builder, args.jobs, args.fresh, args.sphinx_build)
+                   for name in names]
+        for future in futures:
+            name, returncode, seconds, output = future.result()
+            status = 'ok' if returncode == 0 else f'FAILED ({returncode})'
+            print(f"{name:<10} {status:<12} {seconds:6.1f}s")
+            if output.strip():
+                print(output.rstrip())
+            failed = failed or returncode != 0
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
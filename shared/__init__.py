@@ -0,0 +1,8 @@
+"""
+Modules used by both Example_1 and Example_2: the process-wide model registry, the fact matcher and
+the long-text embedding helpers.
+
+They are imported as the shared package, so the repository root must be on sys.path: pytest.ini adds
+it for the tests, and the Sphinx configurations, the benchmark and the scoring service script add it
+themselves. A process that imports both examples loads these modules, and holds one registry, once.
+"""
@@ -0,0 +1,166 @@
+from collections import deque
+from typing import Iterable, List, Optional, Set
+
+# Below this many fact/entity pairs the plain `fact in entity` loop (C-level substring search)
+# is faster than building an automaton in Python
+AUTOMATON_MIN_PAIRS = 256
+
+
+class FactMatcher:
+    """
+    Aho-Corasick automaton over a set of facts (the patterns).
+
+    Scanning a text reports every fact that occurs in it as a substring, in a single pass over the
+    text no matter how many facts there are.
+    """
+
+    def __init__(self, facts: Iterable[str]):
+        """
+        Parameters:
+        - facts (iterable): Strings to search for. Duplicates are ignored.
+        """
+        self.facts: List[str] = list(dict.fromkeys(facts))
+        self._goto = [{}]
+        self._fail = [0]
+        self._output: List[List[int]] = [[]]
+        # The empty string is a substring of every text, so it is handled outside the automaton
+        self._empty_fact: Optional[int] = None
+
+        for index, fact in enumerate(self.facts):
+            if not fact:
+                self._empty_fact = index
+                continue
+            node = 0
+            for char in fact:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].append(index)
+
+        # Breadth-first pass to set failure links; each node also inherits the matches of its failure node
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, texts: Iterable[str], stop_when_complete: bool = True) -> Set[int]:
+        """
+        Find which facts occur in at least one of the texts.
+        Parameters:
+        - texts (iterable): Texts to scan, e.g. the output entities.
+        - stop_when_complete (bool): Stop scanning once every fact has been found.
+        Returns:
+        - set: Indices into self.facts of the facts that were found.
+        """
+        found: Set[int] = set()
+        goto, fail, output = self._goto, self._fail, self._output
+        for text in texts:
+            if self._empty_fact is not None:
+                found.add(self._empty_fact)
+            node = 0
+            for char in text:
+                while node and char not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(char, 0)
+                if output[node]:
+                    found.update(output[node])
+            if stop_when_complete and len(found) == len(self.facts):
+                break
+        return found
+
+    def contains_all(self, texts: Iterable[str]) -> bool:
+        """
+        Check that every fact occurs in at least one of the texts.
+        """
+        return len(self.find(texts)) == len(self.facts)
+
+
+def contains_all_facts(output_entities: Iterable[str], facts: Iterable[str]) -> bool:
+    """
+    Check that every fact is a substring of at least one output entity.
+    Gives the same answer as `all(any(fact in entity for entity in output_entities) for fact in facts)`,
+    using an Aho-Corasick automaton when there are enough facts and entities for it to pay off.
+    Parameters:
+    - output_entities (iterable): Named entities from the output.
+    - facts (iterable): Ground truth entities to look for.
+    Returns:
+    - bool: True if all facts are present, otherwise False.
+    """
+    output_entities = list(output_entities)
+    facts = list(facts)
+    if len(facts) * len(output_entities) < AUTOMATON_MIN_PAIRS:
+        return all(any(fact in entity for entity in output_entities) for fact in facts)
+    return FactMatcher(facts).contains_all(output_entities)
+
+
+def contains_all_facts_batch(output_column: List[Optional[Iterable[str]]],
+                             fact_column: List[Optional[Iterable[str]]]) -> List[bool]:
+    """
+    Run contains_all_facts for every row of two aligned columns.
+    One automaton is built over the distinct facts of all rows, and each distinct output entity is
+    scanned once for the whole column, however many rows it appears in.
+    Parameters:
+    - output_column (list): Output entities per row; None means no entities.
+    - fact_column (list): Ground truth entities per row; None means no entities.
+    Returns:
+    - list: One bool per row, as contains_all_facts would return for it. Rows without facts are True.
+    """
+    matcher = FactMatcher(fact for facts in fact_column if facts for fact in facts)
+    fact_ids = {fact: index for index, fact in enumerate(matcher.facts)}
+
+    # Which facts each distinct entity contains, computed once per entity
+    entities = dict.fromkeys(entity for outputs in output_column if outputs for entity in outputs)
+    for entity in entities:
+        entities[entity] = matcher.find([entity], stop_when_complete=False)
+
+    results = []
+    for outputs, facts in zip(output_column, fact_column):
+        if not facts:
+            results.append(True)
+            continue
+        present = set()
+        for entity in outputs or ():
+            present |= entities[entity]
+        results.append(all(fact_ids[fact] in present for fact in facts))
+    return results
+
+
+def fact_coverage_batch(output_column: List[Optional[Iterable[str]]],
+                        fact_column: List[Optional[Iterable[str]]]) -> List[float]:
+    """
+    For every row, the fraction of its facts that are a substring of at least one of its output entities.
+    Like contains_all_facts_batch, one automaton covers all rows and each distinct entity is scanned once.
+    Parameters:
+    - output_column (list): Output entities per row; None means no entities.
+    - fact_column (list): Ground truth entities per row; None means no entities.
+    Returns:
+    - list: Coverage between 0 and 1 per row; nan for rows without facts.
+    """
+    matcher = FactMatcher(fact for facts in fact_column if facts for fact in facts)
+    fact_ids = {fact: index for index, fact in enumerate(matcher.facts)}
+    entities = dict.fromkeys(entity for outputs in output_column if outputs for entity in outputs)
+    for entity in entities:
+        entities[entity] = matcher.find([entity], stop_when_complete=False)
+
+    coverage = []
+    for outputs, facts in zip(output_column, fact_column):
+        if not facts:
+            coverage.append(float('nan'))
+            continue
+        present = set()
+        for entity in outputs or ():
+            present |= entities[entity]
+        facts = set(facts)
+        coverage.append(sum(fact_ids[fact] in present for fact in facts) / len(facts))
+    return coverage
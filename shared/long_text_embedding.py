@@ -0,0 +1,98 @@
+from typing import List, Sequence, Tuple
+import numpy as np
+
+
+def window_spans(offsets: Sequence[Tuple[int, int]], window: int, overlap: int = 0) -> List[Tuple[int, int, int]]:
+    """
+    Split a tokenised text into windows of at most window tokens.
+    Parameters:
+    - offsets (list): (start, end) character offsets of each token, as returned by a fast tokenizer.
+    - window (int): Largest number of tokens per chunk, excluding special tokens.
+    - overlap (int): Tokens shared by consecutive chunks.
+    Returns:
+    - list: (start_char, end_char, n_tokens) per chunk; a text without tokens gives no chunks.
+    """
+    if window < 1:
+        raise ValueError("window must be at least one token")
+    step = max(window - overlap, 1)
+    spans = []
+    first = 0
+    while first < len(offsets):
+        last = min(first + window, len(offsets))
+        spans.append((offsets[first][0], offsets[last - 1][1], last - first))
+        if last == len(offsets):
+            break
+        first += step
+    return spans
+
+
+def pool_chunks(embeddings: np.ndarray, owners: np.ndarray, weights: np.ndarray, n_texts: int,
+                normalize: bool = False) -> np.ndarray:
+    """
+    Average chunk embeddings back into one vector per text, weighting each chunk by its token count.
+    Parameters:
+    - embeddings (ndarray): One row per chunk.
+    - owners (ndarray): Index of the text each chunk came from.
+    - weights (ndarray): Token count of each chunk.
+    - n_texts (int): Number of texts.
+    - normalize (bool): Return unit-length vectors.
+    Returns:
+    - ndarray: float32 array with one row per text.
+    """
+    pooled = np.zeros((n_texts, embeddings.shape[1]), dtype=np.float64)
+    np.add.at(pooled, owners, embeddings * weights[:, None])
+    totals = np.bincount(owners, weights=weights, minlength=n_texts)
+    pooled /= np.maximum(totals, 1e-12)[:, None]
+    if normalize:
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        pooled /= np.maximum(norms, 1e-12)
+    return pooled.astype(np.float32)
+
+
+def encode_long_texts(model, texts: List[str], batch_size: int = 64, normalize: bool = False,
+                      overlap: int = 0) -> np.ndarray:
+    """
+    Embed texts of any length with a sentence-transformer instead of truncating them at its sequence limit.
+    Every text is split into windows of the model's max_seq_length tokens, the chunks of all texts are
+    encoded together, shortest first so each batch pads to similar lengths, and the chunk embeddings
+    are pooled back per text with a token-weighted mean. Texts that fit in one window are embedded as usual.
+    Parameters:
+    - model (SentenceTransformer): The embedding model; its tokenizer must be a fast tokenizer.
+    - texts (list): Texts to embed.
+    - batch_size (int): Number of chunks encoded per forward pass.
+    - normalize (bool): Return unit-length vectors.
+    - overlap (int): Tokens shared by consecutive chunks of one text.
+    Returns:
+    - ndarray: float32 array with one row per text.
+    """
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+    tokenizer = model.tokenizer
+    window = model.max_seq_length - tokenizer.num_special_tokens_to_add(pair=False)
+    offsets = tokenizer(texts, add_special_tokens=False, return_offsets_mapping=True, truncation=False,
+                        verbose=False)['offset_mapping']
+
+    chunks, owners, weights = [], [], []
+    for owner, (text, text_offsets) in enumerate(zip(texts, offsets)):
+        spans = window_spans(text_offsets, window, overlap)
+        if len(spans) <= 1:
+            # Fits in one window (or has no tokens): embed the text unchanged
+            chunks.append(text)
+            owners.append(owner)
+            weights.append(max(len(text_offsets), 1))
+            continue
+        for start, end, n_tokens in spans:
+            chunks.append(text[start:end])
+            owners.append(owner)
+            weights.append(n_tokens)
+
+    # Shortest chunks first, so each batch holds chunks of similar length and little padding
+    order = np.argsort(weights, kind='stable')
+    encoded = model.encode([chunks[i] for i in order], batch_size=batch_size, convert_to_numpy=True)
+    embeddings = np.empty_like(encoded)
+    embeddings[order] = encoded
+
+    return pool_chunks(embeddings.astype(np.float64), np.asarray(owners, dtype=np.int64),
+                       np.asarray(weights, dtype=np.float64), len(texts), normalize)
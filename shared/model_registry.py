@@ -0,0 +1,155 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from shared.long_text_embedding import encode_long_texts
+
+DEFAULT_MODEL_NAME = 'paraphrase-MiniLM-L6-v2'
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of SentenceTransformer models.
+
+    Models are loaded lazily on first use and kept resident, keyed by
+    (model_name, device), so every scorer in the process shares one copy.
+    """
+
+    def __init__(self):
+        self._models: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str = DEFAULT_MODEL_NAME, device: Optional[str] = None):
+        """
+        Return the model for the given name and device, loading it on first use.
+        Parameters:
+        - model_name (str): SentenceTransformer model name or path.
+        - device (str): Torch device such as 'cpu' or 'cuda'. None lets the library pick.
+        Returns:
+        - SentenceTransformer: The shared model instance.
+        """
+        key = (model_name, device)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            # Another thread may have loaded it while we were waiting
+            model = self._models.get(key)
+            if model is None:
+                from sentence_transformers import SentenceTransformer
+                model = SentenceTransformer(model_name, device=device)
+                self._models[key] = model
+        return model
+
+    def warm_up(self, model_name: str = DEFAULT_MODEL_NAME, device: Optional[str] = None):
+        """
+        Load the model and run one dummy encode so the first real call is not slowed down.
+        Parameters:
+        - model_name (str): SentenceTransformer model name or path.
+        - device (str): Torch device.
+        Returns:
+        - SentenceTransformer: The warmed-up model instance.
+        """
+        model = self.get(model_name, device)
+        model.encode(["warm up"])
+        return model
+
+    def encode(self, texts: List[str], model_name: str = DEFAULT_MODEL_NAME, device: Optional[str] = None,
+               batch_size: int = 64, normalize: bool = False, cache=None, long_texts: bool = False) -> np.ndarray:
+        """
+        Encode texts with the registered model, consulting an embedding cache first when one is given.
+        The model is only loaded if at least one text is missing from the cache.
+        Parameters:
+        - texts (list): Texts to embed.
+        - model_name (str): SentenceTransformer model name or path.
+        - device (str): Torch device.
+        - batch_size (int): Number of texts encoded per forward pass.
+        - normalize (bool): Return unit-length vectors.
+        - cache (EmbeddingCache): Optional cache of previously computed embeddings.
+        - long_texts (bool): Embed texts longer than the model's sequence window chunk by chunk and pool the chunks, instead of truncating them.
+        Returns:
+        - ndarray: float32 array with one row per text.
+        """
+        def encode_fn(batch, normalize_embeddings=False):
+            model = self.get(model_name, device)
+            if long_texts:
+                return encode_long_texts(model, batch, batch_size=batch_size, normalize=normalize_embeddings)
+            return model.encode(batch, batch_size=batch_size, convert_to_numpy=True,
+                                normalize_embeddings=normalize_embeddings)
+
+        if cache is None:
+            return encode_fn(texts, normalize).astype(np.float32, copy=False)
+        # Pooled embeddings of long texts differ from truncated ones, so they are cached under their own name
+        return cache.encode(long_text_model_key(model_name) if long_texts else model_name, texts, encode_fn,
+                            normalize=normalize)
+
+    def is_loaded(self, model_name: str = DEFAULT_MODEL_NAME, device: Optional[str] = None) -> bool:
+        """
+        Check whether the model is currently resident.
+        Returns:
+        - bool: True if the model has been loaded and not released.
+        """
+        return (model_name, device) in self._models
+
+    def release(self, model_name: str = DEFAULT_MODEL_NAME, device: Optional[str] = None) -> bool:
+        """
+        Drop the model from the registry so its memory can be reclaimed.
+        Returns:
+        - bool: True if a model was released, otherwise False.
+        """
+        with self._lock:
+            model = self._models.pop((model_name, device), None)
+        if model is None:
+            return False
+
+        _empty_device_cache(device)
+        return True
+
+    def release_all(self):
+        """
+        Drop every model held by the registry.
+        """
+        with self._lock:
+            devices = {device for _, device in self._models}
+            self._models.clear()
+        for device in devices:
+            _empty_device_cache(device)
+
+
+def spacy_model_key(nlp) -> str:
+    """
+    Identify a spaCy pipeline by language, name and version, e.g. 'en_core_web_sm-3.7.1'.
+    Parameters:
+    - nlp (Language): The loaded spaCy pipeline.
+    Returns:
+    - str: Model identifier used to namespace cached entities.
+    """
+    meta = nlp.meta
+    return f"{meta.get('lang', '')}_{meta.get('name', '')}-{meta.get('version', '')}"
+
+
+def long_text_model_key(model_name: str) -> str:
+    """
+    Name under which chunk-pooled embeddings of a model are cached and recorded.
+    """
+    return f"{model_name}+chunked"
+
+
+def _empty_device_cache(device: Optional[str]):
+    # Give GPU memory back to the driver; nothing to do on CPU
+    if device is None or device.startswith('cuda'):
+        import sys
+        torch = sys.modules.get('torch')
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+
+# Shared by every TestFactualAccuracy instance in the process
+registry = ModelRegistry()
+
+
+def get_model(model_name: str = DEFAULT_MODEL_NAME, device: Optional[str] = None):
+    """
+    Shortcut for registry.get().
+    """
+    return registry.get(model_name, device)
@@ -0,0 +1,75 @@
+import random
+from shared.entity_matcher import (AUTOMATON_MIN_PAIRS, FactMatcher, contains_all_facts, contains_all_facts_batch,
+                                   fact_coverage_batch)
+
+
+def naive_contains_all(output_entities, facts):
+    """
+    The substring semantics check_factual_accuracy has always used.
+    """
+    return all(any(fact in entity for entity in output_entities) for fact in facts)
+
+
+def random_entities(rng, count):
+    """
+    Short random strings over a small alphabet, so substrings overlap often.
+    """
+    return [''.join(rng.choice("abc ") for _ in range(rng.randint(0, 6))) for _ in range(count)]
+
+
+class TestEntityMatcher:
+    """
+    Test class for the Aho-Corasick fact matcher.
+
+    This class checks that indexed matching gives the same results as nested substring scans.
+    """
+
+    def test_find(self):
+        """
+        Test that the automaton reports overlapping and nested facts.
+        """
+        matcher = FactMatcher(["he", "she", "his", "hers", "Apple"])
+        found = matcher.find(["ushers"], stop_when_complete=False)
+        assert {matcher.facts[index] for index in found} == {"he", "she", "hers"}
+        assert matcher.contains_all(["ushers", "his Apple"])
+        assert not matcher.contains_all(["ushers"])
+
+    def test_matches_substring_semantics(self):
+        """
+        Test random fact and entity lists against the naive loop, below and above the automaton threshold.
+        """
+        rng = random.Random(7)
+        for _ in range(300):
+            facts = random_entities(rng, rng.randint(0, 30))
+            output_entities = random_entities(rng, rng.randint(0, 30))
+            expected = naive_contains_all(output_entities, facts)
+            assert contains_all_facts(output_entities, facts) == expected
+            assert FactMatcher(facts).contains_all(output_entities) == expected
+
+        # Make sure the automaton path itself was exercised
+        facts = ["United States", "Apple", "Cupertino"] * 10
+        output_entities = ["Apple Inc.", "Cupertino, California", "the United States"] * 10
+        assert len(facts) * len(output_entities) >= AUTOMATON_MIN_PAIRS
+        assert contains_all_facts(output_entities, facts) is True
+        assert contains_all_facts(output_entities, facts + ["Grapes"]) is False
+
+    def test_batch(self):
+        """
+        Test the column-wide variant row by row against the naive loop.
+        """
+        rng = random.Random(11)
+        fact_column = [random_entities(rng, rng.randint(1, 8)) for _ in range(200)]
+        output_column = [random_entities(rng, rng.randint(0, 8)) for _ in range(200)]
+        output_column[0] = None
+        result = contains_all_facts_batch(output_column, fact_column)
+        assert result == [naive_contains_all(outputs or [], facts)
+                          for outputs, facts in zip(output_column, fact_column)]
+
+    def test_fact_coverage_batch(self):
+        """
+        Test the fraction of facts found per row, with nan for rows without facts.
+        """
+        coverage = fact_coverage_batch([["Apple Inc.", "Cupertino"], None, ["Apple"]],
+                                       [["Apple", "Cupertino", "United States", "Grapes"], ["Apple"], None])
+        assert coverage[:2] == [0.5, 0.0]
+        assert coverage[2] != coverage[2]
@@ -0,0 +1,71 @@
+import re
+import numpy as np
+from shared.long_text_embedding import encode_long_texts, pool_chunks, window_spans
+
+
+class WordTokenizer:
+    """
+    Splits on whitespace and reports character offsets, like a fast tokenizer.
+    """
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 2
+
+    def __call__(self, texts, **kwargs):
+        return {'offset_mapping': [[match.span() for match in re.finditer(r"\S+", text)] for text in texts]}
+
+
+class CountingModel:
+    """
+    Embeds a text as counts of the letters a, b and c, and records what it was asked to encode.
+    """
+
+    max_seq_length = 6
+
+    def __init__(self):
+        self.tokenizer = WordTokenizer()
+        self.encoded = []
+
+    def get_sentence_embedding_dimension(self):
+        return 3
+
+    def encode(self, texts, batch_size=64, convert_to_numpy=True):
+        self.encoded.append(list(texts))
+        return np.array([[text.count(letter) for letter in "abc"] for text in texts], dtype=np.float32)
+
+
+class TestLongTextEmbedding:
+    """
+    Test class for chunk-and-pool embeddings of long texts.
+    """
+
+    def test_window_spans(self):
+        """
+        Test that windows cover every token, hold at most window tokens and share the requested overlap.
+        """
+        offsets = [(i * 2, i * 2 + 1) for i in range(10)]
+        assert window_spans(offsets, 4) == [(0, 7, 4), (8, 15, 4), (16, 19, 2)]
+        assert window_spans(offsets, 4, overlap=2)[:2] == [(0, 7, 4), (4, 11, 4)]
+        assert window_spans([], 4) == []
+
+    def test_pool_chunks(self):
+        """
+        Test that chunk embeddings are averaged per text, weighted by token count, and normalised.
+        """
+        embeddings = np.array([[1.0, 0.0], [0.0, 1.0], [3.0, 4.0]])
+        pooled = pool_chunks(embeddings, np.array([0, 0, 1]), np.array([3.0, 1.0, 2.0]), 2)
+        assert np.allclose(pooled, [[0.75, 0.25], [3.0, 4.0]])
+        assert np.allclose(pool_chunks(embeddings, np.array([0, 0, 1]), np.array([3.0, 1.0, 2.0]), 2,
+                                       normalize=True)[1], [0.6, 0.8])
+
+    def test_encode_long_texts(self):
+        """
+        Test that long texts are chunked to the sequence window, encoded shortest first in one call and pooled.
+        """
+        model = CountingModel()
+        long_text = " ".join(["a"] * 8 + ["b"] * 2)
+        embeddings = encode_long_texts(model, ["c c", long_text])
+        assert len(model.encoded) == 1
+        assert model.encoded[0] == ["c c", "b b", "a a a a", "a a a a"]
+        assert np.allclose(embeddings, [[0, 0, 2], [3.2, 0.4, 0]])
+        assert encode_long_texts(model, []).shape == (0, 3)